@@ -126,7 +126,7 @@ class AttendanceExportView(LoginRequiredMixin, View):
 
         # Base queryset filtered by student's institution
         attendance_qs = Attendance.objects.select_related(
-            'student', 'student__current_class', 'student__section'
+            'student', 'student__current_class', 'student__section__class_name'
         ).filter(student__institution=request.user.profile.institution)
 
         # Apply filters
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['institution', 'date'], name='attendance__institu_d4fd32_idx'),
+        ),
+    ]
@@ -27,6 +27,9 @@ class Attendance(models.Model):
     class Meta:
         db_table = 'attendance_attendance'
         unique_together = ['institution', 'student', 'date']
+        indexes = [
+            models.Index(fields=['institution', 'date']),
+        ]
         permissions = [
             ("can_backdate", "Can mark/edit backdated attendance"),
         ]
@@ -26,6 +26,7 @@ from apps.academics.models import Class
 from django.utils import timezone
 from django.contrib import messages
 from apps.core.utils import get_user_institution 
+from apps.core.pagination import KeysetPaginationMixin
 # Import export views
 from .export import AttendanceExportView,AttendanceExportDetailView,load_students,load_sections
 # Re-export for URL patterns
@@ -139,10 +140,12 @@ class RoleBasedAttendanceMixin(LoginRequiredMixin):
 # Student Attendance Update/Delete
 # -------------------------------
 
-class AttendanceListView(RoleBasedAttendanceMixin,ListView):
+class AttendanceListView(KeysetPaginationMixin, RoleBasedAttendanceMixin,ListView):
     model = Attendance
     template_name = 'attendance/attendance_list.html'
     context_object_name = 'attendance_list'
+    paginate_by = 50
+    keyset_ordering = ('-date',)
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -170,11 +173,13 @@ class AttendanceListView(RoleBasedAttendanceMixin,ListView):
         queryset = self.get_queryset()  # filtered data
         institution = get_user_institution(self.request.user)
 
-        # Stats counts
-        total_records = queryset.count()
-        present_count = queryset.filter(status="present").count()
-        absent_count = queryset.filter(status="absent").count()
-        leave_count = queryset.filter(status="leave").count()
+        # Stats counts, one pass over the filtered rows
+        stats = queryset.order_by().aggregate(
+            total_records=models.Count('id'),
+            present_count=models.Count('id', filter=models.Q(status="present")),
+            absent_count=models.Count('id', filter=models.Q(status="absent")),
+            leave_count=models.Count('id', filter=models.Q(status="leave")),
+        )
 
         # Classes for dropdown
         if institution:
@@ -188,10 +193,7 @@ class AttendanceListView(RoleBasedAttendanceMixin,ListView):
         context.update({
             'classes': classes,
             'today': timezone.now().date(),
-            'total_records': total_records,
-            'present_count': present_count,
-            'absent_count': absent_count,
-            'leave_count': leave_count,
+            **stats,
         })
         return context
 
@@ -1,5 +1,7 @@
 # views.py
 import csv
+import hashlib
+import json
 from io import BytesIO
 from django.http import HttpResponse
 from django.urls import reverse_lazy,reverse
@@ -11,12 +13,16 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 from datetime import datetime,timedelta
 from io import StringIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response,qr_generate
 from apps.core.utils import get_user_institution
 from apps.core.mixins import StaffRequiredMixin 
+from apps.core import cache as tenant_cache
+from apps.core.exports import Column, QuerysetExport
+from apps.core.pagination import KeysetPaginationMixin
+from apps.reports.jobs import export_response
 
 
 from .models import Notice, Broadcast, NotificationTemplate, SMSLog, EmailLog, NoticeAudience
@@ -24,6 +30,8 @@ from .forms import NoticeForm, BroadcastForm, NotificationTemplateForm
 
 
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ---------------------- SMS Log Views ---------------------- #
 class SMSLogListView( StaffRequiredMixin, ListView):
     model = SMSLog
@@ -75,174 +83,71 @@ class SMSLogDeleteView( StaffRequiredMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class SMSLogExportView( StaffRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
-        format_type = request.GET.get('format', 'csv').lower()
-        institution = get_user_institution(request.user)
-        
-        # Apply filters
-        queryset = SMSLog.objects.filter(institution=institution)
-        
-        status = request.GET.get('status')
+def _truncate(text, length):
+    text = str(text) if text else ''
+    return text[:length] + '...' if len(text) > length else text
+
+
+class SMSLogExport(QuerysetExport):
+    sheet_name = 'SMS Logs'
+    total_label = 'Total SMS:'
+    count_by = 'Status'
+    columns = [
+        Column('Recipient Number', 'recipient_number', width=20),
+        Column('Message', lambda sms: _truncate(sms.message, 100), width=50),
+        Column('Status', 'get_status_display'),
+        Column('Template', 'template.name', width=25, default='No Template'),
+        Column('Cost', 'cost', width=12, total=True, default=0),
+        Column('Message ID', lambda sms: sms.message_id or 'N/A', width=30),
+        Column('Scheduled For', 'scheduled_for', width=20, default='Immediate', date_format='%Y-%m-%d %H:%M:%S'),
+        Column('Sent At', 'sent_at', width=20, default='Not Sent', date_format='%Y-%m-%d %H:%M:%S'),
+        Column('Provider Response', lambda sms: _truncate(sms.provider_response, 50) or 'No Response', width=30),
+        Column('Created At', 'created_at', width=20, date_format='%Y-%m-%d %H:%M:%S'),
+    ]
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        queryset = SMSLog.objects.filter(institution=organization)
+
+        status = filters.get('status')
         if status:
             queryset = queryset.filter(status=status)
-        
-        date_from = request.GET.get('date_from')
-        date_to = request.GET.get('date_to')
+
+        date_from = filters.get('date_from')
+        date_to = filters.get('date_to')
         if date_from:
             queryset = queryset.filter(created_at__date__gte=date_from)
         if date_to:
             queryset = queryset.filter(created_at__date__lte=date_to)
-        
-        search = request.GET.get('search')
+
+        search = filters.get('search')
         if search:
             queryset = queryset.filter(
                 Q(recipient_number__icontains=search) |
                 Q(message__icontains=search)
             )
+
+        return queryset.select_related('template').order_by('-created_at')
+
+
+class SMSLogExportView( StaffRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        format_type = request.GET.get('format', 'csv').lower()
+        institution = get_user_institution(request.user)
         
-        queryset = queryset.select_related('template').order_by('-created_at')
+        # Apply filters
+        queryset = SMSLogExport.filter_queryset(request.GET, institution)
         
         filename = f"sms_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        if format_type == 'csv':
-            return self.export_csv(queryset, filename, institution)
-        elif format_type == 'excel':
-            return self.export_excel(queryset, filename, institution)
+        # CSV / Excel stream from the queryset (large exports run in the background)
+        if format_type in ('csv', 'excel'):
+            return export_response(request, SMSLogExport(queryset, filename, institution), format_type, 'SMS logs export')
         elif format_type == 'pdf':
             return self.export_pdf(queryset, filename, institution)
         else:
             return HttpResponse("Invalid format specified", status=400)
     
-    def export_csv(self, queryset, filename, institution):
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        
-        # Write header
-        writer.writerow([
-            'Recipient Number', 'Message', 'Status', 'Template', 
-            'Cost', 'Message ID', 'Scheduled For', 'Sent At', 
-            'Provider Response', 'Created At'
-        ])
-        
-        # Write data rows
-        for sms in queryset:
-            writer.writerow([
-                sms.recipient_number,
-                sms.message[:100] + '...' if len(sms.message) > 100 else sms.message,
-                sms.get_status_display(),
-                sms.template.name if sms.template else 'No Template',
-                f"${sms.cost:.4f}" if sms.cost else 'N/A',
-                sms.message_id or 'N/A',
-                sms.scheduled_for.strftime('%Y-%m-%d %H:%M:%S') if sms.scheduled_for else 'Immediate',
-                sms.sent_at.strftime('%Y-%m-%d %H:%M:%S') if sms.sent_at else 'Not Sent',
-                str(sms.provider_response)[:50] + '...' if sms.provider_response else 'No Response',
-                sms.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        # Add summary
-        total_count = queryset.count()
-        status_counts = queryset.values('status').annotate(count=Count('id'))
-        total_cost = queryset.aggregate(total_cost=Sum('cost'))['total_cost'] or 0
-        
-        writer.writerow([])
-        writer.writerow(['Summary Statistics'])
-        writer.writerow(['Total SMS:', total_count])
-        for status_count in status_counts:
-            writer.writerow([f"{status_count['status'].title()} SMS:", status_count['count']])
-        writer.writerow(['Total Cost:', f"${total_cost:.4f}"])
-        writer.writerow(['Organization:', institution.name if institution else 'N/A'])
-        writer.writerow(['Export Date:', timezone.now().strftime("%Y-%m-%d %H:%M")])
-        
-        response = HttpResponse(buffer.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
-        return response
-    
-    def export_excel(self, queryset, filename, institution):
-        buffer = BytesIO()
-        
-        with xlsxwriter.Workbook(buffer) as workbook:
-            worksheet = workbook.add_worksheet('SMS Logs')
-            
-            # Formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#3b5998',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center'
-            })
-            
-            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
-            currency_format = workbook.add_format({'num_format': '$#,##0.0000'})
-            
-            # Headers
-            headers = [
-                'Recipient Number', 'Message', 'Status', 'Template', 
-                'Cost', 'Message ID', 'Scheduled For', 'Sent At', 'Created At'
-            ]
-            
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-            
-            # Data
-            for row_idx, sms in enumerate(queryset, start=1):
-                worksheet.write(row_idx, 0, sms.recipient_number)
-                worksheet.write(row_idx, 1, sms.message)
-                worksheet.write(row_idx, 2, sms.get_status_display())
-                worksheet.write(row_idx, 3, sms.template.name if sms.template else 'No Template')
-                worksheet.write(row_idx, 4, float(sms.cost) if sms.cost else 0, currency_format)
-                worksheet.write(row_idx, 5, sms.message_id or 'N/A')
-                worksheet.write(row_idx, 6, sms.scheduled_for, date_format if sms.scheduled_for else None)
-                worksheet.write(row_idx, 7, sms.sent_at, date_format if sms.sent_at else None)
-                worksheet.write(row_idx, 8, sms.created_at, date_format)
-            
-            # Adjust columns
-            worksheet.set_column('A:A', 20)  # Recipient Number
-            worksheet.set_column('B:B', 50)  # Message
-            worksheet.set_column('C:C', 15)  # Status
-            worksheet.set_column('D:D', 25)  # Template
-            worksheet.set_column('E:E', 12)  # Cost
-            worksheet.set_column('F:F', 30)  # Message ID
-            worksheet.set_column('G:G', 20)  # Scheduled For
-            worksheet.set_column('H:H', 20)  # Sent At
-            worksheet.set_column('I:I', 20)  # Created At
-            
-            # Summary
-            total_count = queryset.count()
-            status_counts = queryset.values('status').annotate(count=Count('id'))
-            total_cost = queryset.aggregate(total_cost=Sum('cost'))['total_cost'] or 0
-            
-            summary_row = len(queryset) + 3
-            worksheet.write(summary_row, 0, 'Summary Statistics', header_format)
-            worksheet.merge_range(summary_row, 0, summary_row, 1, 'Summary Statistics', header_format)
-            
-            worksheet.write(summary_row + 1, 0, 'Total SMS:')
-            worksheet.write(summary_row + 1, 1, total_count)
-            
-            row_offset = summary_row + 2
-            for status_count in status_counts:
-                worksheet.write(row_offset, 0, f"{status_count['status'].title()} SMS:")
-                worksheet.write(row_offset, 1, status_count['count'])
-                row_offset += 1
-            
-            worksheet.write(row_offset, 0, 'Total Cost:')
-            worksheet.write(row_offset, 1, float(total_cost), currency_format)
-            
-            worksheet.write(row_offset + 1, 0, 'Organization:')
-            worksheet.write(row_offset + 1, 1, institution.name if institution else 'N/A')
-            
-            worksheet.write(row_offset + 2, 0, 'Export Date:')
-            worksheet.write(row_offset + 2, 1, timezone.now().strftime("%Y-%m-%d %H:%M"))
-        
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
-        return response
-    
     def export_pdf(self, queryset, filename, institution):
         rows = [
             {
@@ -281,7 +186,31 @@ class SMSLogExportView( StaffRequiredMixin, View):
 
 
 # ---------------------- Email Log Views ---------------------- #
-class EmailLogListView( StaffRequiredMixin, ListView):
+EMAIL_LOG_STATS_NAMESPACE = 'email-log-stats'
+# Email logs are written on every send, so the stats are not invalidated on
+# change (that would bump the namespace constantly); they are a few minutes old
+# at most.
+EMAIL_LOG_STATS_TIMEOUT = 60 * 5
+EMAIL_LOG_FILTERS = ('status', 'date_from', 'date_to', 'search')
+
+
+def build_email_log_stats(queryset):
+    """Status and engagement counts of `queryset`, from one aggregate query."""
+    counts = queryset.order_by().aggregate(
+        total=Count('id'),
+        opened=Count('id', filter=Q(opened_at__isnull=False)),
+        clicked=Count('id', filter=Q(clicked_at__isnull=False)),
+        **{f'status_{status}': Count('id', filter=Q(status=status)) for status, _ in EmailLog.STATUS_CHOICES},
+    )
+    return {
+        'total': counts['total'],
+        'opened': counts['opened'],
+        'clicked': counts['clicked'],
+        'statuses': {status: counts[f'status_{status}'] for status, _ in EmailLog.STATUS_CHOICES},
+    }
+
+
+class EmailLogListView(KeysetPaginationMixin, StaffRequiredMixin, ListView):
     model = EmailLog
     template_name = 'communications/email_log/email_log_list.html'
     context_object_name = 'email_logs'
@@ -318,23 +247,30 @@ class EmailLogListView( StaffRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         institution = get_user_institution(self.request.user)
-        
-        # Get statistics
-        queryset = self.get_queryset()
-        total_count = queryset.count()
-        status_counts = queryset.values('status').annotate(count=Count('id'))
-        
-        # Engagement metrics
-        opened_count = queryset.filter(opened_at__isnull=False).count()
-        clicked_count = queryset.filter(clicked_at__isnull=False).count()
-        
+
+        # The total is the paginator's (estimated on large tables); the status
+        # and engagement counts scan the filtered logs, so they are cached per
+        # filter combination instead of recomputed on every page
+        filters = [self.request.GET.get(name, '') for name in EMAIL_LOG_FILTERS]
+        signature = hashlib.sha1(json.dumps(filters).encode()).hexdigest()
+        stats = tenant_cache.get_or_set(
+            institution,
+            EMAIL_LOG_STATS_NAMESPACE,
+            ('stats', signature),
+            lambda: build_email_log_stats(self.object_list),
+            timeout=EMAIL_LOG_STATS_TIMEOUT,
+        )
+        page = context['page_obj']
+        total = stats['total']
+
         context.update({
-            'total_count': total_count,
-            'status_counts': {item['status']: item['count'] for item in status_counts},
-            'opened_count': opened_count,
-            'clicked_count': clicked_count,
-            'open_rate': (opened_count / total_count * 100) if total_count > 0 else 0,
-            'click_rate': (clicked_count / total_count * 100) if total_count > 0 else 0,
+            'total_count': page.count,
+            'total_count_kind': page.count_kind,
+            'status_counts': stats['statuses'],
+            'opened_count': stats['opened'],
+            'clicked_count': stats['clicked'],
+            'open_rate': (stats['opened'] / total * 100) if total > 0 else 0,
+            'click_rate': (stats['clicked'] / total * 100) if total > 0 else 0,
         })
         return context
 
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['institution', 'created_at'], name='communicati_institu_58db0c_idx'),
+        ),
+    ]
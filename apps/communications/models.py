@@ -345,6 +345,7 @@ class EmailLog(models.Model):
         indexes = [
             models.Index(fields=['institution', 'status']),
             models.Index(fields=['recipient_email', 'created_at']),
+            models.Index(fields=['institution', 'created_at']),
         ]
     
     def __str__(self):
@@ -13,7 +13,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 from datetime import datetime,timedelta
 from io import StringIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response,qr_generate
@@ -27,6 +27,8 @@ from .forms import NoticeForm, BroadcastForm, NotificationTemplateForm,PushNotif
 
 
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # Push Notification Views
 
 class PushNotificationListView( StaffRequiredMixin, ListView):
@@ -0,0 +1,71 @@
+# communications/summary.py
+"""
+Per-institution push notification summary used by the header bell.
+
+The summary is computed with a single aggregate query plus the latest-5 list
+and stored in the tenant cache under NOTIFICATION_SUMMARY_NAMESPACE. Saving or
+deleting a PushNotification bumps the namespace (see core/signals.py), so the
+header reads one precomputed entry on every other page view.
+"""
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.core import cache as tenant_cache
+from apps.communications.models import PushNotification
+
+NOTIFICATION_SUMMARY_NAMESPACE = "notification-summary"
+NOTIFICATION_SUMMARY_TIMEOUT = 60 * 10
+LATEST_NOTIFICATIONS_LIMIT = 5
+
+
+def build_notification_summary(institution, today=None):
+    """Compute the header notification summary for an institution."""
+    today = today or timezone.now().date()
+    notifications = PushNotification.objects.filter(institution=institution)
+
+    totals = notifications.aggregate(
+        total=Count('id'),
+        draft=Count('id', filter=Q(status='draft')),
+        scheduled=Count('id', filter=Q(status='scheduled')),
+        sent=Count('id', filter=Q(status='sent')),
+        failed=Count('id', filter=Q(status='failed')),
+        today=Count('id', filter=Q(created_at__date=today)),
+        sent_recipients=Sum('total_recipients', filter=Q(status='sent')),
+        sent_successful=Sum('successful', filter=Q(status='sent')),
+    )
+
+    success_rate = 0
+    if totals['sent_recipients']:
+        success_rate = (totals['sent_successful'] or 0) / totals['sent_recipients'] * 100
+
+    latest = list(
+        notifications.select_related('created_by').order_by('-created_at')[:LATEST_NOTIFICATIONS_LIMIT]
+    )
+    pending = totals['draft'] + totals['scheduled']
+
+    return {
+        'pending_count': pending,
+        'latest': latest,
+        'stats': {
+            'total': totals['total'],
+            'draft': totals['draft'],
+            'scheduled': totals['scheduled'],
+            'sent': totals['sent'],
+            'failed': totals['failed'],
+            'today': totals['today'],
+            'success_rate': round(success_rate, 1),
+            'pending': pending,
+        },
+    }
+
+
+def get_notification_summary(institution):
+    """Return the cached summary, rebuilding it after any notification change."""
+    today = timezone.now().date()
+    return tenant_cache.get_or_set(
+        institution,
+        NOTIFICATION_SUMMARY_NAMESPACE,
+        ('summary', today.isoformat()),
+        lambda: build_notification_summary(institution, today),
+        timeout=NOTIFICATION_SUMMARY_TIMEOUT,
+    )
@@ -11,17 +11,22 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
 from datetime import datetime,timedelta
 from io import StringIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response,qr_generate
 from apps.core.utils import get_user_institution
 from apps.core.mixins import StaffRequiredMixin 
+from apps.core.exports import Column, QuerysetExport
+from apps.core import search as search_index
+from apps.reports.jobs import export_response
 
 
 from .models import Notice, Broadcast, NotificationTemplate, SMSLog, EmailLog, NoticeAudience
 from .forms import NoticeForm, BroadcastForm, NotificationTemplateForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class CommunicationsDashboardView( StaffRequiredMixin, TemplateView):
     template_name = 'communications/dashboard.html'
     
@@ -251,12 +256,12 @@ class NoticeListView( StaffRequiredMixin, ListView):
 
     def get_queryset(self):
         institution = get_user_institution(self.request.user)
-        queryset = Notice.objects.filter(institution=institution)
+        queryset = Notice.objects.filter(institution=institution).select_related('created_by')
 
         # Search
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(Q(title__icontains=search) | Q(content__icontains=search))
+            queryset = search_index.filter_queryset(queryset, search, institution)
 
         # Filters
         audience = self.request.GET.get('audience')
@@ -492,40 +497,88 @@ class NotificationTemplateDeleteView( StaffRequiredMixin, DeleteView):
         # Only allow deleting templates from user's institution
         return NotificationTemplate.objects.filter(institution=get_user_institution(self.request.user))
 
-class NoticeExportView( StaffRequiredMixin, ListView):
-    model = Notice
-    context_object_name = 'notices'
-    
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        institution = get_user_institution(self.request.user)
-        
-        if institution:
-            queryset = queryset.filter(institution=institution)
-        
-        # Apply filters from request
-        search = self.request.GET.get('search')
+def _truncate(text, length=100):
+    text = text or ''
+    return text[:length] + '...' if len(text) > length else text
+
+
+def _read_percentage(notice):
+    if not notice.total_audience:
+        return "0%"
+    return f"{(notice.read_count / notice.total_audience * 100):.1f}%"
+
+
+class NoticeExport(QuerysetExport):
+    sheet_name = 'Notices'
+    total_label = 'Total Notices:'
+    columns = [
+        Column('Title', 'title', width=30),
+        Column('Content Preview', lambda notice: _truncate(notice.content), width=40),
+        Column('Priority', 'get_priority_display'),
+        Column('Audience', 'get_audience_display'),
+        Column('Status', lambda notice: "Yes" if notice.is_published else "No", width=10),
+        Column('Publish Date', 'publish_date', width=18, default='Not Published'),
+        Column('Expiry Date', 'expiry_date', width=18, default='No Expiry'),
+        Column('Attachment', lambda notice: notice.attachment.name if notice.attachment else 'No Attachment', width=25),
+        Column('Created By', 'created_by.get_full_name', width=20),
+        Column('Total Audience', 'total_audience'),
+        Column('Read Count', 'read_count'),
+        Column('Read Percentage', _read_percentage),
+        Column('Created At', 'created_at', width=18),
+    ]
+    count_by = 'Status'
+
+    def footer_rows(self):
+        rows = super().footer_rows()
+        # Replace the generic "Yes/No Count" lines with the published/draft split
+        rows = [row for row in rows if not (row and str(row[0]).endswith(' Count:'))]
+        rows[2:2] = [
+            ['Published:', self.counts.get('Yes', 0)],
+            ['Drafts:', self.counts.get('No', 0)],
+        ]
+        return rows
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        queryset = Notice.objects.all()
+        if organization:
+            queryset = queryset.filter(institution=organization)
+
+        search = filters.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | 
-                Q(content__icontains=search)
-            )
-        
-        audience = self.request.GET.get('audience')
+            queryset = search_index.filter_queryset(queryset, search, organization)
+
+        audience = filters.get('audience')
         if audience:
             queryset = queryset.filter(audience=audience)
-        
-        priority = self.request.GET.get('priority')
+
+        priority = filters.get('priority')
         if priority:
             queryset = queryset.filter(priority=priority)
-        
-        status = self.request.GET.get('status')
+
+        status = filters.get('status')
         if status == 'published':
             queryset = queryset.filter(is_published=True)
         elif status == 'draft':
             queryset = queryset.filter(is_published=False)
-        
-        return queryset.order_by('-publish_date', '-created_at')
+
+        return (
+            queryset.select_related('created_by')
+            .annotate(
+                total_audience=Count('audience_details'),
+                read_count=Count('audience_details', filter=Q(audience_details__read=True)),
+            )
+            .order_by('-publish_date', '-created_at')
+        )
+
+
+class NoticeExportView( StaffRequiredMixin, ListView):
+    model = Notice
+    context_object_name = 'notices'
+    
+    def get_queryset(self):
+        # Filters applied from request
+        return NoticeExport.filter_queryset(self.request.GET, get_user_institution(self.request.user))
     
     def get(self, request, *args, **kwargs):
         format_type = request.GET.get('format', 'csv').lower()
@@ -533,15 +586,19 @@ class NoticeExportView( StaffRequiredMixin, ListView):
         
         # Build filename
         filename = f"notices_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        # Get organization info
+        organization = get_user_institution(request.user)
+
+        # CSV / Excel stream from the queryset (large exports run in the background)
+        if format_type in ('csv', 'excel'):
+            return export_response(request, NoticeExport(queryset, filename, organization), format_type, 'Notices export')
+        if format_type != 'pdf':
+            return HttpResponse("Invalid format specified", status=400)
         
         # Build data rows
         rows = []
         for notice in queryset:
-            # Get audience statistics
-            audience_details = NoticeAudience.objects.filter(notice=notice)
-            total_audience = audience_details.count()
-            read_count = audience_details.filter(read=True).count()
-            
             rows.append({
                 "title": notice.title,
                 "content": notice.content,
@@ -554,156 +611,14 @@ class NoticeExportView( StaffRequiredMixin, ListView):
                 "created_by": notice.created_by.get_full_name(),
                 "created_at": notice.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                 "updated_at": notice.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-                "total_audience": total_audience,
-                "read_count": read_count,
-                "read_percentage": f"{(read_count/total_audience*100):.1f}%" if total_audience > 0 else "0%",
+                "total_audience": notice.total_audience,
+                "read_count": notice.read_count,
+                "read_percentage": _read_percentage(notice),
                 "audience_type": notice.audience,
                 "priority_level": notice.priority,
             })
 
-        # Get organization info
-        organization = get_user_institution(request.user)
-        
-        if format_type == 'csv':
-            return self.export_csv(rows, filename, organization)
-        elif format_type == 'excel':
-            return self.export_excel(rows, filename, organization)
-        elif format_type == 'pdf':
-            return self.export_pdf(rows, filename, organization, queryset.count())
-        else:
-            return HttpResponse("Invalid format specified", status=400)
-    
-    def export_csv(self, rows, filename, organization):
-        """Export notices to CSV format"""
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        
-        # Write header
-        writer.writerow([
-            'Title', 'Content Preview', 'Priority', 'Audience', 'Status', 
-            'Publish Date', 'Expiry Date', 'Attachment', 'Created By', 
-            'Total Audience', 'Read Count', 'Read Percentage', 'Created At'
-        ])
-        
-        # Write data rows
-        for row in rows:
-            writer.writerow([
-                row['title'],
-                row['content'][:100] + '...' if len(row['content']) > 100 else row['content'],
-                row['priority'],
-                row['audience'],
-                row['is_published'],
-                row['publish_date'],
-                row['expiry_date'],
-                row['attachment'],
-                row['created_by'],
-                row['total_audience'],
-                row['read_count'],
-                row['read_percentage'],
-                row['created_at']
-            ])
-        
-        # Add summary row
-        writer.writerow([])
-        writer.writerow(['Total Notices:', len(rows)])
-        writer.writerow(['Published:', len([r for r in rows if r['is_published'] == 'Yes'])])
-        writer.writerow(['Drafts:', len([r for r in rows if r['is_published'] == 'No'])])
-        writer.writerow(['Organization:', organization.name if organization else 'N/A'])
-        writer.writerow(['Export Date:', timezone.now().strftime("%Y-%m-%d %H:%M")])
-        
-        response = HttpResponse(buffer.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
-        return response
-    
-    def export_excel(self, rows, filename, organization):
-        """Export notices to Excel format"""
-        buffer = BytesIO()
-        
-        with xlsxwriter.Workbook(buffer) as workbook:
-            worksheet = workbook.add_worksheet('Notices List')
-            
-            # Add formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#3b5998',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center',
-                'valign': 'vcenter'
-            })
-            
-            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
-            center_format = workbook.add_format({'align': 'center'})
-            wrap_format = workbook.add_format({'text_wrap': True})
-            
-            # Write headers
-            headers = [
-                'Title', 'Content Preview', 'Priority', 'Audience', 'Status', 
-                'Publish Date', 'Expiry Date', 'Attachment', 'Created By', 
-                'Total Audience', 'Read Count', 'Read Percentage', 'Created At'
-            ]
-            
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-            
-            # Write data
-            for row_idx, row_data in enumerate(rows, start=1):
-                worksheet.write(row_idx, 0, row_data['title'])
-                worksheet.write(row_idx, 1, row_data['content'][:500])  # Limit content length
-                worksheet.write(row_idx, 2, row_data['priority'])
-                worksheet.write(row_idx, 3, row_data['audience'])
-                worksheet.write(row_idx, 4, row_data['is_published'], center_format)
-                worksheet.write(row_idx, 5, row_data['publish_date'])
-                worksheet.write(row_idx, 6, row_data['expiry_date'])
-                worksheet.write(row_idx, 7, row_data['attachment'])
-                worksheet.write(row_idx, 8, row_data['created_by'])
-                worksheet.write(row_idx, 9, row_data['total_audience'], center_format)
-                worksheet.write(row_idx, 10, row_data['read_count'], center_format)
-                worksheet.write(row_idx, 11, row_data['read_percentage'], center_format)
-                worksheet.write(row_idx, 12, row_data['created_at'], date_format)
-            
-            # Adjust column widths
-            worksheet.set_column('A:A', 30)  # Title
-            worksheet.set_column('B:B', 50)  # Content Preview
-            worksheet.set_column('C:C', 15)  # Priority
-            worksheet.set_column('D:D', 15)  # Audience
-            worksheet.set_column('E:E', 12)  # Status
-            worksheet.set_column('F:F', 20)  # Publish Date
-            worksheet.set_column('G:G', 20)  # Expiry Date
-            worksheet.set_column('H:H', 25)  # Attachment
-            worksheet.set_column('I:I', 25)  # Created By
-            worksheet.set_column('J:J', 15)  # Total Audience
-            worksheet.set_column('K:K', 12)  # Read Count
-            worksheet.set_column('L:L', 15)  # Read Percentage
-            worksheet.set_column('M:M', 20)  # Created At
-            
-            # Add summary
-            summary_row = len(rows) + 2
-            published_count = len([r for r in rows if r['is_published'] == 'Yes'])
-            draft_count = len([r for r in rows if r['is_published'] == 'No'])
-            
-            worksheet.write(summary_row, 0, 'Total Notices:')
-            worksheet.write(summary_row, 1, len(rows))
-            
-            worksheet.write(summary_row + 1, 0, 'Published:')
-            worksheet.write(summary_row + 1, 1, published_count)
-            
-            worksheet.write(summary_row + 2, 0, 'Drafts:')
-            worksheet.write(summary_row + 2, 1, draft_count)
-            
-            worksheet.write(summary_row + 3, 0, 'Organization:')
-            worksheet.write(summary_row + 3, 1, organization.name if organization else 'N/A')
-            
-            worksheet.write(summary_row + 4, 0, 'Export Date:')
-            worksheet.write(summary_row + 4, 1, timezone.now().strftime("%Y-%m-%d %H:%M"))
-        
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
-        return response
+        return self.export_pdf(rows, filename, organization, len(rows))
     
     def export_pdf(self, rows, filename, organization, total_count):
         """Export notices to PDF format"""
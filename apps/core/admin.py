@@ -0,0 +1,20 @@
+# core/admin.py
+from django.contrib import admin
+
+from .models import AuditLog
+
+
+@admin.register(AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "action", "content_type", "object_repr", "user", "institution", "ip_address")
+    list_filter = ("action", "content_type", "institution")
+    search_fields = ("object_id", "object_repr", "user__email")
+    date_hierarchy = "created_at"
+    list_select_related = ("content_type", "user", "institution")
+    readonly_fields = [field.name for field in AuditLog._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
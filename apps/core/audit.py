@@ -0,0 +1,309 @@
+# core/audit.py
+"""
+Audit trail of model changes: who created, changed or deleted what, on which
+institution, with a field-level before/after diff.
+
+Registration (core/signals.py):
+    audit.register(Student)
+    audit.register(User, exclude=('password', 'last_login'))
+
+pre_save reads the stored row of an update (one SELECT, only on saves of
+audited models), post_save/post_delete turn it into an event. Events are
+queued when the transaction commits, so rolled-back changes are not logged,
+and never written in the request:
+
+    thread  a per-process buffer flushed with bulk_create by a background
+            thread every AUDIT_FLUSH_INTERVAL seconds or AUDIT_BATCH_SIZE events
+    celery  the same buffer, each batch handed to the write_audit_events task
+    sync    written on commit (tests, management commands that need it)
+
+AuditLogMiddleware supplies the user, IP and path of the current request.
+Rows written with bulk_create/update() skip the signals and are not audited
+unless the caller passes them to record_created()/record_updated().
+
+Querying:
+    AuditLog.objects.for_user(user).for_model(Student).between(start, end)
+"""
+import atexit
+import ipaddress
+import json
+import logging
+import threading
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+_request = ContextVar('audit_request', default=None)
+_registry = {}
+
+
+def set_request(request):
+    """Bind `request` to audit events recorded in this context; returns a reset token."""
+    return _request.set(request)
+
+
+def reset_request(token):
+    _request.reset(token)
+
+
+class AuditBuffer:
+    """Thread-safe in-process queue of events, written in batches."""
+
+    def __init__(self, backend='thread', batch_size=200, interval=2.0):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        # Held while writing, so the atexit flush waits for the writer thread's batch
+        self._writing = threading.Lock()
+        self._events = []
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, event):
+        if self.backend == 'sync':
+            try:
+                write_events([event])
+            except Exception:
+                logger.exception("Audit log write failed")
+            return
+        with self._lock:
+            self._events.append(event)
+            full = len(self._events) >= self.batch_size
+            if self._thread is None:
+                self._start()
+        if full:
+            self._wake.set()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit log flush failed")
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of events."""
+        with self._writing:
+            with self._lock:
+                events, self._events = self._events, []
+            for start in range(0, len(events), self.batch_size):
+                batch = events[start:start + self.batch_size]
+                try:
+                    if self.backend == 'celery':
+                        from apps.core.tasks import write_audit_events
+                        write_audit_events.delay(batch)
+                    else:
+                        write_events(batch)
+                except Exception:
+                    # Keep what was not written for the next flush (e.g. SQLite busy)
+                    with self._lock:
+                        self._events[:0] = events[start:]
+                    raise
+        return len(events)
+
+    def pending(self):
+        with self._lock:
+            return len(self._events)
+
+
+buffer = AuditBuffer(
+    backend=getattr(settings, 'AUDIT_LOG_BACKEND', 'thread'),
+    batch_size=getattr(settings, 'AUDIT_BATCH_SIZE', 200),
+    interval=getattr(settings, 'AUDIT_FLUSH_INTERVAL', 2.0),
+)
+
+
+def write_events(events):
+    from apps.core.models import AuditLog
+
+    AuditLog.objects.bulk_create([
+        AuditLog(**{**event, 'created_at': parse_datetime(event['created_at'])})
+        for event in events
+    ], batch_size=500)
+
+
+def register(model, exclude=(), institution='institution'):
+    """
+    Audit saves and deletes of `model`. Fields in `exclude` and auto_now
+    timestamps are left out of the diff. `institution` is the path to the
+    owning institution ('pk' for Institution itself, None: the request's).
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in exclude and not getattr(field, 'auto_now', False)
+    ]
+    _registry[model] = (fields, institution)
+
+    uid = f'audit_log_{model._meta.label_lower}'
+    pre_save.connect(_pre_save, sender=model, dispatch_uid=uid)
+    post_save.connect(_post_save, sender=model, dispatch_uid=uid)
+    post_delete.connect(_post_delete, sender=model, dispatch_uid=uid)
+
+
+def registered_models():
+    return list(_registry)
+
+
+def _json(value):
+    return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+
+
+def _python(field, value):
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        return value
+
+
+def _values(instance, fields):
+    return {field.attname: _python(field, field.value_from_object(instance)) for field in fields}
+
+
+def _fields(sender, update_fields=None):
+    fields, _ = _registry[sender]
+    if update_fields:
+        fields = [field for field in fields if field.name in update_fields or field.attname in update_fields]
+    return fields
+
+
+def _pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    fields = _fields(sender, update_fields)
+    if not fields:
+        return
+    stored = sender._base_manager.using(instance._state.db).filter(pk=instance.pk).values(
+        *[field.attname for field in fields]
+    ).first()
+    if stored is not None:
+        instance._audit_before = {field.attname: _python(field, stored[field.attname]) for field in fields}
+
+
+def _post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    fields = _fields(sender, update_fields)
+    if not fields:
+        return  # e.g. save(update_fields=['last_login']) on an excluded field
+    after = _values(instance, fields)
+    before = instance.__dict__.pop('_audit_before', None)
+    if created or before is None:
+        changes = _created(after)
+        action = 'create'
+    else:
+        # Compare Python values (Decimal('10') == Decimal('10.00')), store JSON
+        changes = {name: [before[name], value] for name, value in after.items() if before.get(name) != value}
+        if not changes:
+            return
+        action = 'update'
+    record(sender, instance, action, _json(changes))
+
+
+def _created(values):
+    return {name: [None, value] for name, value in values.items() if value not in (None, '')}
+
+
+def record_created(model, instances):
+    """Queue 'create' events for rows written with bulk_create (which skips the signals)."""
+    fields = _fields(model)
+    for instance in instances:
+        record(model, instance, 'create', _json(_created(_values(instance, fields))))
+
+
+def record_updated(model, changes):
+    """
+    Queue 'update' events for rows changed with update() (which skips the
+    signals). `changes` holds (instance, {attname: (before, after)}) pairs.
+    """
+    for instance, diff in changes:
+        changed = {name: [before, after] for name, (before, after) in diff.items() if before != after}
+        if changed:
+            record(model, instance, 'update', _json(changed))
+
+
+def _post_delete(sender, instance, **kwargs):
+    record(sender, instance, 'delete', {})
+
+
+def _institution_id(instance, path):
+    if not path:
+        return None
+    if path == 'pk':
+        return instance.pk
+    if LOOKUP_SEP not in path:
+        return getattr(instance, f'{path}_id', None)
+    value = instance
+    for name in path.split(LOOKUP_SEP):
+        value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value.pk
+
+
+def _client_ip(request):
+    """
+    REMOTE_ADDR, or behind AUDIT_TRUSTED_PROXIES proxies the X-Forwarded-For
+    entry the outermost of them appended: entries left of it come from the
+    client and can be forged.
+    """
+    address = request.META.get('REMOTE_ADDR')
+    proxies = getattr(settings, 'AUDIT_TRUSTED_PROXIES', 0)
+    forwarded = [entry.strip() for entry in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if entry.strip()]
+    if proxies > 0 and forwarded:
+        address = forwarded[-min(proxies, len(forwarded))]
+    try:
+        return str(ipaddress.ip_address(address))
+    except ValueError:
+        return None
+
+
+def _repr(instance):
+    try:
+        return str(instance)[:200]
+    except Exception:
+        # __str__ of a half-deleted row may follow a relation that is gone
+        return ''
+
+
+def record(model, instance, action, changes):
+    """Queue one event for `instance`; written after the transaction commits."""
+    _, institution_path = _registry[model]
+    request = _request.get()
+    user = getattr(request, 'user', None)
+    institution_id = _institution_id(instance, institution_path)
+    if institution_id is None and request is not None:
+        institution_id = getattr(getattr(request, 'institution', None), 'pk', None)
+
+    event = {
+        'institution_id': _json(institution_id),
+        'user_id': _json(user.pk) if getattr(user, 'is_authenticated', False) else None,
+        'action': action,
+        'content_type_id': ContentType.objects.get_for_model(model).pk,
+        'object_id': str(instance.pk),
+        'object_repr': _repr(instance),
+        'changes': changes,
+        'ip_address': _client_ip(request) if request is not None else None,
+        'path': request.path[:255] if request is not None else '',
+        'created_at': timezone.now().isoformat(),
+    }
+    transaction.on_commit(lambda: buffer.add(event))
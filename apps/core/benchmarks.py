@@ -0,0 +1,425 @@
+# core/benchmarks.py
+"""
+Hot-path benchmark suite, run by `manage.py run_benchmarks`.
+
+Each scenario drives the Django test client against one of the heaviest entry
+points of an institution built by `manage.py generate_scale_data` and records
+latency percentiles, the SQL query count (and repeated query shapes, see
+core.profiling) and peak Python memory of a request. Results are compared with
+a JSON baseline so a change that makes a dashboard slower or adds queries
+fails the run.
+
+Everything runs inside one transaction that is rolled back at the end, and
+every request inside its own savepoint, so POST scenarios (marking attendance,
+generating invoices) measure the same work on every iteration and the dataset
+is left untouched.
+"""
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from apps.academics.models import AcademicYear, Section
+from apps.attendance.models import Attendance
+from apps.core.profiling import QueryRecorder
+from apps.finance.models import FeeInvoice, FeeStructure
+from apps.hr.models import Department, Designation, Staff
+from apps.students.models import Student
+from apps.users.models import User
+
+BASELINE_VERSION = 1
+# Attendance marking / invoice generation post one section, as a teacher would
+BATCH_STUDENTS = 200
+
+
+class BenchmarkError(Exception):
+    """The dataset or a scenario is not in a state that can be benchmarked."""
+
+
+@dataclass
+class Scenario:
+    name: str
+    path: object  # str, or callable(fixture) -> str
+    method: str = 'get'
+    user: str = 'admin'
+    data: object = None  # callable(fixture) -> dict
+    check: object = None  # callable(fixture, response) -> error message or None
+    iterations: int = None  # overrides --iterations for slow scenarios
+    expected_status: tuple = (200,)
+
+    def get_path(self, fixture):
+        return self.path(fixture) if callable(self.path) else self.path
+
+
+@dataclass
+class Fixture:
+    """Objects of the benchmarked institution the scenarios need."""
+    institution: object
+    admin: object
+    student_user: object
+    academic_year: object
+    invoice_year: object
+    section: object
+    last_attendance_date: datetime.date
+    students: list = field(default_factory=list)
+    fee_structure: object = None
+
+    @property
+    def batch_ids(self):
+        return [str(student.pk) for student in self.students]
+
+
+# ---- scenarios --------------------------------------------------------------
+
+def _attendance_data(fixture):
+    statuses = ['present'] * 8 + ['absent', 'late']
+    marks = {student_id: statuses[i % len(statuses)] for i, student_id in enumerate(fixture.batch_ids)}
+    return {
+        'attendance_data': json.dumps(marks),
+        'date': timezone.localdate().isoformat(),
+        'class_id': str(fixture.section.class_name_id),
+    }
+
+
+def _check_attendance(fixture, response):
+    marked = Attendance.objects.filter(
+        institution=fixture.institution,
+        student_id__in=fixture.batch_ids,
+        date=timezone.localdate(),
+    ).count()
+    if marked != len(fixture.batch_ids):
+        return f'{marked} of {len(fixture.batch_ids)} attendance rows were written'
+    return None
+
+
+def _invoice_data(fixture):
+    return {
+        'fee_structure': str(fixture.fee_structure.pk),
+        'academic_year': str(fixture.invoice_year.pk),
+        'students': fixture.batch_ids,
+    }
+
+
+def _check_invoices(fixture, response):
+    created = FeeInvoice.objects.filter(academic_year=fixture.invoice_year).count()
+    if created != len(fixture.batch_ids):
+        return f'{created} of {len(fixture.batch_ids)} invoices were created'
+    return None
+
+
+def _attendance_export_path(fixture):
+    # One section over the last month of the register
+    end = fixture.last_attendance_date
+    start = end - datetime.timedelta(days=30)
+    return (
+        f'/attendance/export/?format=csv&class_id={fixture.section.class_name_id}'
+        f'&section_id={fixture.section.pk}&start_date={start.isoformat()}&end_date={end.isoformat()}'
+    )
+
+
+SCENARIOS = [
+    Scenario('exam_dashboard', '/examination/dashboard/'),
+    Scenario('communications_dashboard', '/communications/dashboard/'),
+    Scenario('reports_dashboard', '/reports/'),
+    Scenario('student_portal_dashboard', '/student-portal/portal/', user='student'),
+    Scenario(
+        'mark_attendance', '/attendance/mark/', method='post',
+        data=_attendance_data, check=_check_attendance, expected_status=(302,),
+    ),
+    Scenario(
+        'create_fee_invoices', '/finance/invoices/create/', method='post',
+        data=_invoice_data, check=_check_invoices, expected_status=(302,),
+    ),
+    Scenario('student_export', '/students/export/?format=csv', iterations=3),
+    Scenario('payment_export', '/finance/payments/export/?format=csv', iterations=3),
+    Scenario('attendance_export', _attendance_export_path, iterations=3),
+]
+
+
+def get_scenarios(names=None):
+    if not names:
+        return list(SCENARIOS)
+    known = {scenario.name: scenario for scenario in SCENARIOS}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise BenchmarkError(f"Unknown scenario(s): {', '.join(unknown)}")
+    return [known[name] for name in names]
+
+
+# ---- fixture ----------------------------------------------------------------
+
+def build_fixture(institution):
+    """
+    Look up the users and records the scenarios post against, and add what the
+    generated dataset lacks (an hr.Staff profile for the admin, the backdating
+    permission, an empty academic year to generate invoices into). Must run
+    inside the benchmark transaction.
+    """
+    admin = (
+        User.objects.filter(profile__institution=institution, role=User.Role.INSTITUTION_ADMIN)
+        .order_by('email').first()
+    )
+    student = (
+        Student.objects.filter(institution=institution, status='ACTIVE', user__isnull=False)
+        .select_related('user').order_by('admission_number').first()
+    )
+    academic_year = AcademicYear.objects.filter(institution=institution, is_current=True).first()
+    section = (
+        Section.objects.filter(institution=institution)
+        .select_related('class_name').order_by('class_name__code', 'name').first()
+    )
+    last_attendance_date = (
+        Attendance.objects.filter(institution=institution).aggregate(last=Max('date'))['last']
+        or timezone.localdate()
+    )
+    if not (admin and student and academic_year and section):
+        raise BenchmarkError(
+            f'{institution.code} has no admin, student, current academic year or section; '
+            'build it with `manage.py generate_scale_data`'
+        )
+
+    students = list(
+        Student.objects.filter(section=section, status='ACTIVE').order_by('admission_number')[:BATCH_STUDENTS]
+    )
+    fee_structure = FeeStructure.objects.filter(
+        institution=institution, class_name=section.class_name, is_active=True
+    ).first()
+    if fee_structure is None:
+        fee_structure = FeeStructure.objects.create(
+            institution=institution, name=f'Benchmark {section.class_name.name}',
+            academic_year=academic_year, class_name=section.class_name, amount=Decimal('25000'),
+        )
+
+    start = academic_year.end_date + datetime.timedelta(days=1)
+    invoice_year = AcademicYear.objects.create(
+        institution=institution, name=f'{start.year}-{start.year + 1} (benchmark)',
+        start_date=start, end_date=start.replace(year=start.year + 1) - datetime.timedelta(days=1),
+    )
+
+    if not Staff.objects.filter(user=admin).exists():
+        department, _ = Department.objects.get_or_create(
+            institution=institution, code='BENCH-ADM',
+            defaults={'name': 'administration', 'department_type': 'administrative'},
+        )
+        designation, _ = Designation.objects.get_or_create(
+            institution=institution, code='BENCH-ADM',
+            defaults={'name': 'Administrator', 'category': 'administrative'},
+        )
+        Staff.objects.create(
+            user=admin, institution=institution, employee_id='BENCH-0001',
+            staff_type='administrative', department=department, designation=designation,
+            employment_type='permanent', joining_date=academic_year.start_date, salary=Decimal('50000'),
+        )
+    admin.user_permissions.add(
+        Permission.objects.get(content_type__app_label='attendance', codename='can_backdate')
+    )
+
+    return Fixture(
+        institution=institution,
+        admin=admin,
+        student_user=student.user,
+        academic_year=academic_year,
+        invoice_year=invoice_year,
+        section=section,
+        last_attendance_date=last_attendance_date,
+        students=students,
+        fee_structure=fee_structure,
+    )
+
+
+def client_settings():
+    """Settings overrides for driving views in-process with the test client."""
+    return {
+        'ALLOWED_HOSTS': ['testserver', *settings.ALLOWED_HOSTS],
+        'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+        # Measure the streaming export path, not the background job hand-off
+        'EXPORT_ASYNC_THRESHOLD': 10 ** 9,
+        'PROFILING_ENABLED': False,
+    }
+
+
+def make_clients(fixture):
+    """Logged-in test clients for the fixture's admin and student, by role."""
+    clients = {}
+    for role, user in (('admin', fixture.admin), ('student', fixture.student_user)):
+        clients[role] = Client(HTTP_X_SCHOOL_SLUG=fixture.institution.slug)
+        clients[role].force_login(user)
+    return clients
+
+
+# ---- measurement --------------------------------------------------------------
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _request(client, scenario, fixture):
+    path = scenario.get_path(fixture)
+    data = scenario.data(fixture) if scenario.data else None
+    response = getattr(client, scenario.method)(path, data)
+    # Streaming exports do their work while being consumed
+    if getattr(response, 'streaming', False):
+        for _ in response.streaming_content:
+            pass
+    else:
+        response.content
+    return response
+
+
+def isolated_request(client, scenario, fixture, verify=False):
+    """One request inside a savepoint that is always rolled back."""
+    savepoint = transaction.savepoint()
+    try:
+        response = _request(client, scenario, fixture)
+        if response.status_code not in scenario.expected_status:
+            raise BenchmarkError(
+                f'{scenario.name}: HTTP {response.status_code} '
+                f'(expected {", ".join(map(str, scenario.expected_status))})'
+            )
+        if verify and scenario.check:
+            error = scenario.check(fixture, response)
+            if error:
+                raise BenchmarkError(f'{scenario.name}: {error}')
+        return response
+    finally:
+        transaction.savepoint_rollback(savepoint)
+
+
+def run_scenario(scenario, fixture, clients, iterations, warmup):
+    client = clients[scenario.user]
+    iterations = scenario.iterations or iterations
+
+    # Warm-up (also verifies the request does what the scenario expects)
+    for index in range(max(1, warmup)):
+        isolated_request(client, scenario, fixture, verify=index == 0)
+
+    # Profiled pass: queries and peak memory. Kept out of the timed runs
+    # because tracemalloc and the execute wrapper both slow requests down.
+    recorder = QueryRecorder()
+    tracemalloc.start()
+    try:
+        with connection.execute_wrapper(recorder):
+            isolated_request(client, scenario, fixture)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        isolated_request(client, scenario, fixture)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    threshold = getattr(settings, 'PROFILING_DUPLICATE_THRESHOLD', 3)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'p99_ms': round(percentile(timings, 99), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': recorder.count,
+        'query_ms': round(recorder.total_time * 1000, 2),
+        'duplicate_queries': sum(recorder.duplicates(threshold).values()),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_suite(institution, scenarios, iterations=20, warmup=2, on_result=None):
+    """
+    Benchmark `scenarios` against `institution`. Returns a results document
+    ({'meta': ..., 'scenarios': {name: metrics}}) in baseline format.
+    """
+    results = {}
+    with override_settings(**client_settings()), transaction.atomic():
+        students = Student.objects.filter(institution=institution).count()
+        fixture = build_fixture(institution)
+        clients = make_clients(fixture)
+
+        try:
+            for scenario in scenarios:
+                try:
+                    results[scenario.name] = run_scenario(scenario, fixture, clients, iterations, warmup)
+                except Exception as e:
+                    # A broken page is a result too: record it and keep going
+                    results[scenario.name] = {'error': f'{type(e).__name__}: {e}'}
+                if on_result:
+                    on_result(scenario.name, results[scenario.name])
+        finally:
+            transaction.set_rollback(True)
+
+    return {
+        'version': BASELINE_VERSION,
+        'meta': {
+            'created_at': timezone.now().isoformat(timespec='seconds'),
+            'institution': institution.code,
+            'students': students,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': iterations,
+        },
+        'scenarios': results,
+    }
+
+
+# ---- baseline ---------------------------------------------------------------
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise BenchmarkError(f'{path} is not a version {BASELINE_VERSION} benchmark baseline')
+    return baseline
+
+
+def save_baseline(path, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def compare(results, baseline, latency_tolerance=0.25, min_delta_ms=5.0,
+            query_tolerance=0, memory_tolerance=0.25):
+    """
+    Regressions of `results` against `baseline` as a list of
+    (scenario, metric, baseline value, current value) tuples. A scenario that
+    errors is always a regression.
+
+    Latency (p50/p95) regresses when it grows by more than latency_tolerance
+    and by more than min_delta_ms, so sub-millisecond noise on fast pages does
+    not fail the run; query counts may grow by at most query_tolerance.
+    """
+    regressions = []
+    previous = baseline.get('scenarios', {})
+    for name, current in results['scenarios'].items():
+        before = previous.get(name)
+        if 'error' in current:
+            regressions.append((name, 'error', (before or {}).get('error', 'ok'), current['error']))
+            continue
+        if before is None or 'error' in before:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            limit = max(before[metric] * (1 + latency_tolerance), before[metric] + min_delta_ms)
+            if current[metric] > limit:
+                regressions.append((name, metric, before[metric], current[metric]))
+        if current['queries'] > before['queries'] + query_tolerance:
+            regressions.append((name, 'queries', before['queries'], current['queries']))
+        if current['peak_memory_kb'] > before['peak_memory_kb'] * (1 + memory_tolerance):
+            regressions.append((name, 'peak_memory_kb', before['peak_memory_kb'], current['peak_memory_kb']))
+    return regressions
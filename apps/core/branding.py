@@ -0,0 +1,124 @@
+# core/branding.py
+"""
+Institution branding lookup for templates.
+
+The institution and its branding (name, logo/stamp URLs, ID card colors) are
+kept in a process-local dict backed by the shared cache. The process-local copy
+is trusted only while the namespace version in the shared cache is unchanged,
+so saving an Institution (see core/signals.py) refreshes every worker without
+touching the database on normal page renders.
+"""
+import threading
+
+from django.core.cache import cache
+
+from apps.core import cache as tenant_cache
+
+BRANDING_NAMESPACE = "branding"
+DEFAULT_BRANDING_NAMESPACE = "branding-default"
+USER_INSTITUTION_TIMEOUT = 60 * 60
+
+_local = {}
+_local_lock = threading.Lock()
+
+
+def user_institution_key(user_id):
+    return f"user-institution:{user_id}"
+
+
+def _file_url(field):
+    try:
+        return field.url if field else ""
+    except ValueError:
+        return ""
+
+
+def build_branding(institution):
+    """Return a plain dict with the branding fields templates need."""
+    if institution is None:
+        return {}
+    return {
+        "id": str(institution.pk),
+        "name": institution.name,
+        "short_name": institution.short_name or institution.name,
+        "logo_url": _file_url(institution.logo),
+        "stamp_url": _file_url(institution.stamp),
+        "favicon_url": _file_url(institution.favicon),
+        "colors": institution.get_id_card_colors(),
+    }
+
+
+def _load_institution(institution_id):
+    from apps.organization.models import Institution
+
+    if institution_id is None:
+        return Institution.objects.filter(is_active=True).first()
+    return Institution.objects.filter(pk=institution_id, is_active=True).first()
+
+
+def _cached_entry(institution_id):
+    """Return (institution, branding) using the local copy when still current."""
+    namespace = BRANDING_NAMESPACE if institution_id else DEFAULT_BRANDING_NAMESPACE
+    version = tenant_cache.get_namespace_version(institution_id, namespace)
+    local_key = (str(institution_id), namespace)
+
+    entry = _local.get(local_key)
+    if entry and entry[0] == version:
+        return entry[1]
+
+    def compute():
+        institution = _load_institution(institution_id)
+        return institution, build_branding(institution)
+
+    value = tenant_cache.get_or_set(institution_id, namespace, "institution", compute)
+    with _local_lock:
+        _local[local_key] = (version, value)
+    return value
+
+
+def get_user_institution_id(user):
+    """Resolve the institution id for a user, cached per user."""
+    if not getattr(user, "is_authenticated", False):
+        return None
+
+    key = user_institution_key(user.pk)
+    institution_id = cache.get(key)
+    if institution_id is not None:
+        return institution_id or None
+
+    from apps.users.models import UserProfile
+    from apps.students.models import Student
+
+    institution_id = (
+        UserProfile.objects.filter(user_id=user.pk, institution__isnull=False)
+        .values_list("institution_id", flat=True)
+        .first()
+    )
+    if institution_id is None:
+        institution_id = (
+            Student.objects.filter(user_id=user.pk)
+            .values_list("institution_id", flat=True)
+            .first()
+        )
+    # Cache misses as "" so unlinked accounts don't query on every page.
+    cache.set(key, str(institution_id) if institution_id else "", USER_INSTITUTION_TIMEOUT)
+    return institution_id
+
+
+def get_branding(user=None, institution_id=None):
+    """
+    Return (institution, branding) for the given institution id, the user's
+    institution, or the first active institution as a fallback.
+    """
+    if institution_id is None and user is not None:
+        institution_id = get_user_institution_id(user)
+
+    institution, branding = _cached_entry(institution_id) if institution_id else (None, {})
+    if institution is None:
+        institution, branding = _cached_entry(None)
+    return institution, branding
+
+
+def clear_local_cache():
+    with _local_lock:
+        _local.clear()
@@ -0,0 +1,122 @@
+# core/cache.py
+"""
+Per-institution cache helpers.
+
+Every cached value lives under a (institution, namespace) pair. Each pair has
+a version counter stored in the cache itself; the version is part of every key,
+so bumping it makes all older entries of that namespace unreachable at once
+(they simply expire). Models register with `invalidate_on_change` so their
+post_save/post_delete signals bump the right namespace.
+
+Usage:
+    from apps.core.cache import get_or_set, invalidate_on_change
+
+    stats = get_or_set(institution, 'dashboard', 'stats', compute_stats, timeout=600)
+
+    invalidate_on_change(Student, 'dashboard')
+"""
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from apps.core import metrics
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+
+def _scope(institution):
+    """Return the key scope for an institution instance, id, or None."""
+    if institution is None:
+        return GLOBAL_SCOPE
+    return str(getattr(institution, "pk", institution))
+
+
+def _version_key(institution, namespace):
+    return f"nsv:{_scope(institution)}:{namespace}"
+
+
+def _initial_version():
+    # Time based so an evicted counter never restarts at a version that
+    # still has live entries in the cache.
+    return int(time.time() * 1000)
+
+
+def get_namespace_version(institution, namespace):
+    """Return the current version of a namespace, creating it if needed."""
+    key = _version_key(institution, namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key) or _initial_version()
+    return version
+
+
+def bump_namespace(institution, namespace):
+    """Invalidate every entry of a namespace by moving to a new version."""
+    key = _version_key(institution, namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def make_key(institution, namespace, *parts):
+    """Build a versioned cache key for the given institution and namespace."""
+    version = get_namespace_version(institution, namespace)
+    suffix = ":".join(str(part) for part in parts)
+    return f"inst:{_scope(institution)}:{namespace}:v{version}:{suffix}"
+
+
+def get_or_set(institution, namespace, key, default, timeout=None):
+    """
+    Return the cached value for `key`, computing it with `default()` on a miss.
+    `key` may be a string or a tuple of key parts.
+    """
+    parts = key if isinstance(key, (tuple, list)) else (key,)
+    cache_key = make_key(institution, namespace, *parts)
+    sentinel = object()
+    value = cache.get(cache_key, sentinel)
+    if value is sentinel:
+        metrics.CACHE_LOOKUPS.inc(namespace=namespace, result="miss")
+        value = default() if callable(default) else default
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        cache.set(cache_key, value, **kwargs)
+    else:
+        metrics.CACHE_LOOKUPS.inc(namespace=namespace, result="hit")
+    return value
+
+
+def _resolve_institution(instance, institution_attr):
+    if callable(institution_attr):
+        return institution_attr(instance)
+    return getattr(instance, institution_attr, None)
+
+
+def invalidate_on_change(model, namespace, institution_attr="institution_id"):
+    """
+    Bump `namespace` for the instance's institution whenever `model` is saved
+    or deleted. `institution_attr` is an attribute name or a callable taking
+    the instance; returning None bumps the global scope.
+
+    The bump runs on transaction commit so a concurrent request cannot
+    repopulate the cache with data from before the write.
+    """
+    def handler(sender, instance, **kwargs):
+        try:
+            institution = _resolve_institution(instance, institution_attr)
+        except Exception as e:
+            logger.warning(f"Cache invalidation skipped for {sender.__name__}: {e}")
+            return
+        transaction.on_commit(lambda: bump_namespace(institution, namespace))
+
+    uid = f"core.cache:{model._meta.label}:{namespace}"
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=f"{uid}:save")
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f"{uid}:delete")
+    return handler
@@ -1,16 +1,27 @@
-from apps.organization.models import Institution
-from apps.communications.models import PushNotification
-from apps.core.utils import get_user_institution
-from django.db.models import Q, Count
-from django.utils import timezone
+from apps.communications.summary import get_notification_summary
+from apps.core.branding import get_branding, get_user_institution_id
+
+def _request_institution_id(request):
+    """Institution id from InstitutionMiddleware, else the cached user lookup."""
+    institution = getattr(request, "institution", None)
+    if institution is not None:
+        return institution.pk
+    return get_user_institution_id(request.user)
+
 
 def organization_context(request):
-    try:
-        org = Institution.objects.filter(is_active=True).first()
-    except Institution.DoesNotExist:
-        org = None
+    """
+    Institution and branding for templates, served from core/branding.py's
+    process-local + shared cache instead of a query per render.
+    """
+    institution = getattr(request, "institution", None)
+    org, branding = get_branding(
+        user=getattr(request, "user", None),
+        institution_id=institution.pk if institution else None,
+    )
     return {
-        "organization": org
+        "organization": org,
+        "organization_branding": branding,
     }
 
 def role_flags(request):
@@ -43,10 +54,6 @@ def header_notifications(request):
         return context
 
     try:
-        institution = get_user_institution(request.user)
-        if not institution:
-            return context
-
         # Check user permissions for notifications
         user_roles = role_flags(request)
         has_notification_permission = any([
@@ -56,53 +63,21 @@ def header_notifications(request):
             user_roles.get('is_hr', False),
         ])
         
-        context["has_notification_permission"] = has_notification_permission
-
         if not has_notification_permission:
             return context
 
-        # Notification counts by status
-        notifications = PushNotification.objects.filter(institution=institution)
-        
-        # Status counts for dashboard
-        status_counts = notifications.values('status').annotate(count=Count('id'))
-        status_dict = {item['status']: item['count'] for item in status_counts}
-        
-        # Pending notifications (for badge count)
-        pending_notifications = notifications.filter(
-            Q(status='draft') | Q(status='scheduled')
-        )
-        
-        # Latest notifications for dropdown
-        latest_notifications = notifications.select_related('created_by').order_by('-created_at')[:5]
-        
-        # Today's notifications
-        today = timezone.now().date()
-        todays_notifications = notifications.filter(created_at__date=today).count()
-        
-        # Statistics for notification dashboard
-        total_sent = notifications.filter(status='sent').aggregate(
-            total_recipients=Count('total_recipients'),
-            successful=Count('successful')
-        )
-        
-        success_rate = 0
-        if total_sent['total_recipients'] and total_sent['total_recipients'] > 0:
-            success_rate = (total_sent['successful'] / total_sent['total_recipients']) * 100
+        institution_id = _request_institution_id(request)
+        if not institution_id:
+            return context
+
+        context["has_notification_permission"] = has_notification_permission
+
+        summary = get_notification_summary(institution_id)
 
         context.update({
-            "header_notifications_count": pending_notifications.count(),
-            "header_notifications_list": latest_notifications,
-            "notification_stats": {
-                'total': notifications.count(),
-                'draft': status_dict.get('draft', 0),
-                'scheduled': status_dict.get('scheduled', 0),
-                'sent': status_dict.get('sent', 0),
-                'failed': status_dict.get('failed', 0),
-                'today': todays_notifications,
-                'success_rate': round(success_rate, 1),
-                'pending': pending_notifications.count(),
-            },
+            "header_notifications_count": summary['pending_count'],
+            "header_notifications_list": summary['latest'],
+            "notification_stats": summary['stats'],
             "can_create_notification": user_roles.get('is_superadmin', False) or 
                                      user_roles.get('is_institution_admin', False),
         })
@@ -0,0 +1,287 @@
+# core/exports.py
+"""
+Streaming CSV / Excel export engine.
+
+An export is declared once as a list of Column specs over a queryset:
+
+    class ExamExport(QuerysetExport):
+        sheet_name = 'Exams'
+        total_label = 'Total Exams:'
+        count_by = 'Status'
+        columns = [
+            Column('Exam Name', 'name', width=25),
+            Column('Exam Type', 'exam_type.name', width=20),
+            Column('Status', 'get_status_display'),
+            Column('Start Date', 'start_date'),
+        ]
+
+    return ExamExport(queryset, filename, organization).response('csv')
+
+Rows are fetched with queryset.iterator(chunk_size) and written as they are
+read: CSV goes out through a StreamingHttpResponse, Excel is written by
+xlsxwriter in constant_memory mode to a temporary file that is streamed back.
+Neither the full result set nor the whole file is held in memory.
+
+write_csv() / write_excel() write to a path instead of a response; the
+background export jobs in reports.jobs use them together with on_progress().
+Exports that may run in the background implement filter_queryset(), the
+view's filter logic over a dict of GET parameters, so the worker can rebuild
+the same queryset from the stored filters:
+
+    queryset = ExamExport.filter_queryset(request.GET, organization)
+"""
+import csv
+import datetime
+import os
+import tempfile
+from collections import Counter
+from decimal import Decimal
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from apps.core import metrics
+
+CSV_CONTENT_TYPE = 'text/csv'
+EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class Column:
+    """
+    One export column. `accessor` is a dotted attribute path
+    ('staff.user.get_full_name'; callables are called) or a function of the row.
+    `total` sums the column in the footer, labelled `total_label` (default
+    "Total <header>:", or "<header>:" when the header already says Total).
+    """
+
+    def __init__(self, header, accessor, width=15, total=False, default='', date_format=None, total_label=None):
+        self.header = header
+        self.accessor = accessor
+        self.width = width
+        self.total = total
+        if total_label is None:
+            total_label = f'{header}:' if header.startswith('Total') else f'Total {header}:'
+        self.total_label = total_label
+        self.default = default
+        self.date_format = date_format
+
+    def value(self, obj):
+        if callable(self.accessor):
+            value = self.accessor(obj)
+        else:
+            value = obj
+            for part in self.accessor.split('.'):
+                value = getattr(value, part, None)
+                if value is None:
+                    break
+                if callable(value):
+                    value = value()
+        return self.default if value is None else value
+
+    def text(self, value):
+        """CSV representation of a value."""
+        if isinstance(value, datetime.datetime):
+            if timezone.is_aware(value):
+                value = timezone.localtime(value)
+            return value.strftime(self.date_format or '%Y-%m-%d %H:%M')
+        if isinstance(value, datetime.date):
+            return value.strftime(self.date_format or '%Y-%m-%d')
+        return value
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer streaming."""
+
+    def write(self, value):
+        return value
+
+
+class QuerysetExport:
+    columns = []
+    sheet_name = 'Export'
+    chunk_size = 2000
+    total_label = 'Total Records:'
+    # Header of a column whose values are counted in the summary footer
+    count_by = None
+    header_format = {
+        'bold': True,
+        'bg_color': '#3b5998',
+        'font_color': 'white',
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter',
+        'text_wrap': True,
+    }
+
+    def __init__(self, queryset, filename, organization=None, columns=None):
+        self.queryset = queryset
+        self.filename = filename
+        self.organization = organization
+        if columns is not None:
+            self.columns = columns
+        self.row_count = 0
+        self.totals = {}
+        self.counts = Counter()
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        """The export's queryset for GET-style `filters` (a dict or QueryDict)."""
+        raise NotImplementedError(f'{cls.__name__} does not implement filter_queryset()')
+
+    @classmethod
+    def from_filters(cls, filters, filename, organization=None):
+        """Rebuild an export from the filters it was requested with."""
+        return cls(cls.filter_queryset(filters, organization), filename, organization)
+
+    # ---- rows -----------------------------------------------------------
+
+    def get_queryset(self):
+        return self.queryset
+
+    def iter_rows(self):
+        """Yield one list of raw values per object, tracking footer stats."""
+        self.row_count = 0
+        self.totals = {column.header: Decimal('0') for column in self.columns if column.total}
+        self.counts = Counter()
+        count_index = self._column_index(self.count_by)
+
+        for obj in self.get_queryset().iterator(chunk_size=self.chunk_size):
+            row = [column.value(obj) for column in self.columns]
+            self.row_count += 1
+            for column, value in zip(self.columns, row):
+                if column.total and value not in (None, ''):
+                    self.totals[column.header] += Decimal(str(value))
+            if count_index is not None:
+                self.counts[row[count_index]] += 1
+            if self.row_count % self.chunk_size == 0:
+                self.on_progress(self.row_count)
+            yield row
+        self.on_progress(self.row_count)
+
+    def on_progress(self, row_count):
+        """Called after every chunk of rows; background jobs override it."""
+
+    def record_metrics(self, format_type, size):
+        labels = {'export': type(self).__name__, 'format': format_type}
+        metrics.EXPORT_ROWS.inc(self.row_count, **labels)
+        metrics.EXPORT_BYTES.inc(size, **labels)
+
+    def _column_index(self, header):
+        for index, column in enumerate(self.columns):
+            if column.header == header:
+                return index
+        return None
+
+    def footer_rows(self):
+        """Summary lines written after the data (valid once rows are consumed)."""
+        rows = [[], [self.total_label, self.row_count]]
+        for column in self.columns:
+            if column.total:
+                rows.append([column.total_label, self.totals[column.header]])
+        for value, count in self.counts.items():
+            rows.append([f'{value} Count:', count])
+        rows.append(['Organization:', self.organization.name if self.organization else 'N/A'])
+        rows.append(['Export Date:', timezone.now().strftime('%Y-%m-%d %H:%M')])
+        return rows
+
+    # ---- CSV ------------------------------------------------------------
+
+    def stream_csv(self):
+        writer = csv.writer(_Echo())
+        size = 0
+        for line in self._csv_lines(writer):
+            size += len(line.encode('utf-8'))
+            yield line
+        self.record_metrics('csv', size)
+
+    def _csv_lines(self, writer):
+        yield writer.writerow([column.header for column in self.columns])
+        for row in self.iter_rows():
+            yield writer.writerow([column.text(value) for column, value in zip(self.columns, row)])
+        for row in self.footer_rows():
+            yield writer.writerow(row)
+
+    def write_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as handle:
+            for line in self.stream_csv():
+                handle.write(line)
+
+    def csv_response(self):
+        response = StreamingHttpResponse(self.stream_csv(), content_type=CSV_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="{self.filename}.csv"'
+        return response
+
+    # ---- Excel ----------------------------------------------------------
+
+    @staticmethod
+    def _excel_value(value):
+        if isinstance(value, datetime.datetime):
+            if timezone.is_aware(value):
+                value = timezone.make_naive(value)
+            return value, 'datetime'
+        if isinstance(value, datetime.date):
+            return value, 'date'
+        if isinstance(value, Decimal):
+            return float(value), None
+        if isinstance(value, (int, float, str)) or value is None:
+            return value, None
+        return str(value), None
+
+    def write_excel(self, path):
+        """Write the workbook to `path` row by row (constant memory)."""
+        import xlsxwriter
+
+        with xlsxwriter.Workbook(path, {'constant_memory': True}) as workbook:
+            worksheet = workbook.add_worksheet(self.sheet_name[:31])
+            header_format = workbook.add_format(self.header_format)
+            formats = {
+                'date': workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+                'datetime': workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'}),
+            }
+
+            for col, column in enumerate(self.columns):
+                worksheet.set_column(col, col, column.width)
+                worksheet.write(0, col, column.header, header_format)
+
+            row_idx = 0
+            for row_idx, row in enumerate(self.iter_rows(), start=1):
+                for col, raw in enumerate(row):
+                    value, kind = self._excel_value(raw)
+                    if kind:
+                        worksheet.write_datetime(row_idx, col, value, formats[kind])
+                    else:
+                        worksheet.write(row_idx, col, value)
+
+            for offset, row in enumerate(self.footer_rows(), start=1):
+                for col, raw in enumerate(row):
+                    worksheet.write(row_idx + offset, col, self._excel_value(raw)[0])
+        self.record_metrics('excel', os.path.getsize(path))
+
+    def excel_response(self):
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            self.write_excel(path)
+            handle = open(path, 'rb')
+        finally:
+            # The open handle keeps the data readable on POSIX until it is closed.
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return FileResponse(
+            handle,
+            as_attachment=True,
+            filename=f'{self.filename}.xlsx',
+            content_type=EXCEL_CONTENT_TYPE,
+        )
+
+    # ---- dispatch -------------------------------------------------------
+
+    def response(self, format_type):
+        """Return a response for 'csv' or 'excel', or None for other formats."""
+        if format_type == 'csv':
+            return self.csv_response()
+        if format_type == 'excel':
+            return self.excel_response()
+        return None
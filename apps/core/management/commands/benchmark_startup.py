@@ -0,0 +1,96 @@
+# apps/core/management/commands/benchmark_startup.py
+"""
+Import time and memory of a fresh worker (see apps/core/startup.py):
+
+    python manage.py benchmark_startup --update-baseline   # record benchmarks/startup.json
+    python manage.py benchmark_startup                     # fails on regression
+
+A regression is a slower boot, a larger RSS or a heavy library (xhtml2pdf,
+reportlab, xlsxwriter, PIL, qrcode, razorpay, pandas) that is imported at boot
+again instead of through utils.lazy.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import startup
+
+
+class Command(BaseCommand):
+    help = 'Measure boot time, RSS and heavy imports of a fresh worker and compare with a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to boot (default: 5)')
+        parser.add_argument(
+            '--baseline',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'startup.json'),
+            help='Baseline file (default: benchmarks/startup.json)',
+        )
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed boot time growth as a fraction (default: 0.25)')
+        parser.add_argument('--min-delta-ms', type=float, default=50.0,
+                            help='Ignore boot time growth smaller than this (default: 50ms)')
+        parser.add_argument('--rss-tolerance', type=float, default=0.15,
+                            help='Allowed RSS growth as a fraction (default: 0.15)')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Booting {options['runs']} fresh worker(s)"))
+        self.stdout.write(f"{'run':>4} {'setup':>9} {'urlconf':>9} {'total':>9} {'rss':>9}  heavy modules")
+        try:
+            results = startup.measure(options['runs'], on_run=self.print_run)
+        except startup.StartupError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{'p50':>4} {results['setup_ms']:>7.0f}ms {results['urlconf_ms']:>7.0f}ms "
+            f"{results['total_ms']:>7.0f}ms {results['rss_kb'] / 1024:>7.1f}MB  "
+            f"{', '.join(results['heavy_modules']) or '-'}"
+        )
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(baseline_path, 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+                handle.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(
+                f'No baseline at {baseline_path}; run with --update-baseline to record one'
+            ))
+            return
+
+        try:
+            baseline = startup.load_baseline(baseline_path)
+        except (ValueError, startup.StartupError) as e:
+            raise CommandError(f'Could not read baseline {baseline_path}: {e}')
+
+        regressions = startup.compare(
+            results,
+            baseline,
+            time_tolerance=options['tolerance'],
+            min_delta_ms=options['min_delta_ms'],
+            rss_tolerance=options['rss_tolerance'],
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
+            return
+
+        for metric, before, after in regressions:
+            self.stderr.write(self.style.ERROR(f'REGRESSION {metric}: {before} -> {after}'))
+        raise CommandError(f'{len(regressions)} regression(s) against {baseline_path}')
+
+    def print_run(self, index, sample):
+        self.stdout.write(
+            f"{index + 1:>4} {sample['setup_ms']:>7.0f}ms {sample['urlconf_ms']:>7.0f}ms "
+            f"{sample['total_ms']:>7.0f}ms {sample['rss_kb'] / 1024:>7.1f}MB  "
+            f"{', '.join(sample['heavy_modules']) or '-'}"
+        )
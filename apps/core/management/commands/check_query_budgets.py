@@ -0,0 +1,76 @@
+# apps/core/management/commands/check_query_budgets.py
+"""
+Check the per-view query budgets declared in apps/core/query_budgets.py:
+
+    python manage.py check_query_budgets
+    python manage.py check_query_budgets --view exam_result_list --view student_list
+
+Builds two small institutions (rolled back afterwards), so it can run against
+any database, including an empty one.
+"""
+import io
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import benchmarks, query_budgets
+
+MAX_FINGERPRINTS = 5
+
+
+class Command(BaseCommand):
+    help = 'Fail when a list/detail/export view exceeds its SQL query budget or its query count grows with the data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--view', action='append', dest='views',
+                            help='Only check this URL name, e.g. exam_result_list (repeatable)')
+        parser.add_argument('--list', action='store_true', help='List the budgets and exit')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for entry in query_budgets.BUDGETS:
+                self.stdout.write(f'{entry.name:45} {entry.max_queries:>4} queries')
+            return
+
+        try:
+            entries = query_budgets.get_budgets(options['views'])
+        except benchmarks.BenchmarkError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"Checking {len(entries)} view(s) at {' and '.join(query_budgets.SIZES)} data sizes"
+        ))
+        self.stdout.write(f"{'view':45} {'budget':>6} {'small':>6} {'large':>6}")
+        # generate_scale_data's progress output and 4xx/5xx request logs are
+        # noise here; failures are reported per view below
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            results = query_budgets.check_budgets(entries, stdout=io.StringIO(), on_result=self.print_result)
+        finally:
+            request_logger.setLevel(level)
+
+        failed = [result for result in results if result['failures']]
+        if failed:
+            raise CommandError(f'{len(failed)} of {len(results)} view(s) over their query budget')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} view(s) within their query budget'))
+
+    def print_result(self, result):
+        queries = result['queries']
+        line = (
+            f"{result['name']:45} {result['budget']:>6} "
+            f"{queries.get('small', '-'):>6} {queries.get('large', '-'):>6}"
+        )
+        if not result['failures']:
+            self.stdout.write(f'{line}  ok')
+            return
+
+        self.stdout.write(self.style.ERROR(f'{line}  FAIL'))
+        for failure in result['failures']:
+            self.stdout.write(f'    {failure}')
+        duplicates = sorted(result['duplicates'].items(), key=lambda item: item[1], reverse=True)
+        for shape, count in duplicates[:MAX_FINGERPRINTS]:
+            self.stdout.write(f'    {count:>5}x  {shape[:200]}')
+        if len(duplicates) > MAX_FINGERPRINTS:
+            self.stdout.write(f'    ... {len(duplicates) - MAX_FINGERPRINTS} more repeated statement(s)')
@@ -0,0 +1,579 @@
+# apps/core/management/commands/generate_scale_data.py
+"""
+Deterministic synthetic dataset for load testing and benchmarks.
+
+Builds N institutions (codes SCALE001, SCALE002, ...) with classes, sections,
+subjects, students (with their User + UserProfile), guardians, daily
+attendance, exams and results, fee structures, invoices and payments, a
+library with loans, and notices. Rows are written with bulk_create in
+fixed-size batches; the two tables that reach millions of rows (attendance and
+exam results) use insert_rows(), a raw batched INSERT of pre-adapted values
+that skips bulk_create's per-value field preparation. Every value (including
+primary keys) comes from an RNG seeded per institution with (--seed, index), so
+the same arguments always produce the same data, and --first-index alone gives
+a new institution disjoint from the existing ones:
+
+    python manage.py generate_scale_data --preset large --clear
+
+`large` is 5 institutions x 10,000 students x 200 school days, i.e. 50k
+students and 10M attendance rows. Pass --end-date to pin the calendar too.
+"""
+import datetime
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.academics.models import AcademicYear, Class, Section, Subject
+from apps.attendance.models import Attendance
+from apps.communications.models import Notice
+from apps.core import search
+from apps.core.cache import bump_namespace
+from apps.core.branding import DEFAULT_BRANDING_NAMESPACE
+from apps.core.middleware import TENANT_NAMESPACE
+from apps.examination.models import Exam, ExamResult, ExamSubject, ExamType
+from apps.finance.models import FeeInvoice, FeeStructure, Payment
+from apps.library.models import Author, Book, BorrowRecord, Category
+from apps.organization.models import Institution
+from apps.students.models import Guardian, Student
+from apps.users.models import User, UserProfile
+
+CODE_PREFIX = 'SCALE'
+EMAIL_DOMAIN = 'scale.invalid'
+
+PRESETS = {
+    'small': {'institutions': 1, 'students': 500, 'attendance_days': 30},
+    'medium': {'institutions': 2, 'students': 5000, 'attendance_days': 100},
+    'large': {'institutions': 5, 'students': 10000, 'attendance_days': 200},
+}
+
+FIRST_NAMES = [
+    'Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Reyansh', 'Ayaan', 'Krishna', 'Ishaan',
+    'Ananya', 'Diya', 'Aadhya', 'Saanvi', 'Pari', 'Myra', 'Anika', 'Navya', 'Ira', 'Kiara',
+    'Rohan', 'Kabir', 'Aryan', 'Dhruv', 'Meera', 'Riya', 'Tara', 'Nisha', 'Zoya', 'Farhan',
+]
+LAST_NAMES = [
+    'Sharma', 'Verma', 'Gupta', 'Singh', 'Kumar', 'Patel', 'Reddy', 'Nair', 'Iyer', 'Das',
+    'Bose', 'Khan', 'Mehta', 'Joshi', 'Chopra', 'Malhotra', 'Banerjee', 'Mishra', 'Yadav', 'Pillai',
+]
+SUBJECTS = [
+    ('English', 'ENG'), ('Mathematics', 'MATH'), ('Science', 'SCI'), ('Social Studies', 'SST'),
+    ('Hindi', 'HIN'), ('Computer Science', 'CS'), ('Physical Education', 'PE'), ('Art', 'ART'),
+]
+EXAMS = [('Unit Test', 'UT'), ('Mid Term', 'MID'), ('Final', 'FIN'), ('Pre Board', 'PB')]
+ATTENDANCE_WEIGHTS = [('present', 0.90), ('absent', 0.05), ('late', 0.03), ('half_day', 0.01), ('excused', 0.01)]
+
+
+def _grade(percentage):
+    """Same thresholds as ExamResult.save (bulk_create skips save())."""
+    for floor, grade in ((90, 'A+'), (80, 'A'), (70, 'B+'), (60, 'B'), (50, 'C'), (40, 'D')):
+        if percentage >= floor:
+            return grade
+    return 'F'
+
+
+class Command(BaseCommand):
+    help = 'Generate a large deterministic multi-institution dataset with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', choices=sorted(PRESETS), help='Size preset (explicit options override it)')
+        parser.add_argument('--institutions', type=int, help='Number of institutions (default 1)')
+        parser.add_argument('--first-index', type=int, default=1,
+                            help=f'Number of the first institution, i.e. {CODE_PREFIX}001 (default 1)')
+        parser.add_argument('--students', type=int, help='Students per institution (default 1000)')
+        parser.add_argument('--attendance-days', type=int, help='School days of attendance per student (default 60)')
+        parser.add_argument('--guardians', type=int, default=2, help='Guardians per student')
+        parser.add_argument('--exams', type=int, default=3, help=f'Exams per institution (max {len(EXAMS)})')
+        parser.add_argument('--invoices', type=int, default=4, help='Fee invoices per student')
+        parser.add_argument('--books', type=int, default=500, help='Library books per institution')
+        parser.add_argument('--loans', type=int, default=2, help='Average library loans per student')
+        parser.add_argument('--notices', type=int, default=50, help='Notices per institution')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--end-date', type=datetime.date.fromisoformat,
+                            help='Last attendance day, YYYY-MM-DD (default today)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument('--clear', action='store_true', help=f'Delete previously generated {CODE_PREFIX}* data first')
+
+    # ---- helpers --------------------------------------------------------
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def bulk(self, model, objects):
+        """bulk_create an iterable in batches; returns the number of rows."""
+        start = time.perf_counter()
+        count = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                with transaction.atomic():
+                    model.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            count += len(batch)
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f'  {model._meta.label:<28} {count:>10,} rows  {elapsed:7.1f}s  ({rate:,.0f}/s)')
+        return count
+
+    def insert_rows(self, model, fields, rows):
+        """
+        Raw batched INSERT for the multi-million row tables. `rows` yields tuples
+        already adapted for the database (see adapt_uuid / adapt_date); no
+        model instances, defaults or signals are involved.
+        """
+        start = time.perf_counter()
+        meta = model._meta
+        qn = connection.ops.quote_name
+        columns = ', '.join(qn(meta.get_field(name).column) for name in fields)
+        placeholders = '(' + ', '.join(['%s'] * len(fields)) + ')'
+        table = qn(meta.db_table)
+        count = 0
+
+        def flush(batch):
+            with transaction.atomic(), connection.cursor() as cursor:
+                if connection.vendor == 'sqlite':
+                    cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES {placeholders}', batch)
+                else:
+                    values = ', '.join([placeholders] * len(batch))
+                    cursor.execute(
+                        f'INSERT INTO {table} ({columns}) VALUES {values}',
+                        [value for row in batch for value in row],
+                    )
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                flush(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+            count += len(batch)
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f'  {meta.label:<28} {count:>10,} rows  {elapsed:7.1f}s  ({rate:,.0f}/s)')
+        return count
+
+    def adapt_uuid(self, value):
+        return value if connection.features.has_native_uuid_field else value.hex
+
+    def adapt_date(self, value):
+        return connection.ops.adapt_datefield_value(value)
+
+    def aware(self, day, hour=9):
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time(hour)))
+
+    # ---- entry point ----------------------------------------------------
+
+    def handle(self, *args, **options):
+        preset = PRESETS.get(options['preset'], {})
+        self.institutions = options['institutions'] or preset.get('institutions', 1)
+        self.students = options['students'] or preset.get('students', 1000)
+        self.attendance_days = options['attendance_days'] or preset.get('attendance_days', 60)
+        self.guardians = options['guardians']
+        self.exams = min(options['exams'], len(EXAMS))
+        self.invoices = options['invoices']
+        self.books = options['books']
+        self.loans = options['loans']
+        self.notices = options['notices']
+        self.batch_size = options['batch_size']
+        self.seed = options['seed']
+        if self.students < 1 or self.institutions < 1 or options['first_index'] < 1:
+            raise CommandError('--institutions, --students and --first-index must be positive')
+
+        self.end_date = options['end_date'] or timezone.localdate()
+        year = self.end_date.year if self.end_date.month >= 4 else self.end_date.year - 1
+        self.year_start = datetime.date(year, 4, 1)
+        self.year_end = datetime.date(year + 1, 3, 31)
+        self.school_days = self._school_days()
+        # One shared unusable hash: hashing 50k passwords would dominate the run
+        self.password = make_password(None)
+
+        if connection.vendor == 'sqlite' and not connection.in_atomic_block:
+            # Bulk-load settings for this connection only: no fsync per commit and a
+            # 256 MB page cache so random UUID index inserts stay in memory
+            # (SQLite refuses to change them inside a transaction)
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = OFF')
+                cursor.execute('PRAGMA cache_size = -262144')
+
+        if options['clear']:
+            self.clear()
+
+        started = time.perf_counter()
+        first = options['first_index']
+        for index in range(first, first + self.institutions):
+            self.build_institution(index)
+
+        bump_namespace(None, TENANT_NAMESPACE)
+        bump_namespace(None, DEFAULT_BRANDING_NAMESPACE)
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {self.institutions} institution(s) in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def clear(self):
+        self.stdout.write(self.style.WARNING(f'Deleting {CODE_PREFIX}* institutions and their users...'))
+        with transaction.atomic():
+            Institution.objects.filter(code__startswith=CODE_PREFIX).delete()
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+
+    def _school_days(self):
+        """The last N Monday-Saturday dates up to end_date, oldest first."""
+        days = []
+        day = self.end_date
+        while len(days) < self.attendance_days:
+            if day.weekday() != 6:
+                days.append(day)
+            day -= datetime.timedelta(days=1)
+        return days[::-1]
+
+    # ---- per institution ------------------------------------------------
+
+    def build_institution(self, index):
+        code = f'{CODE_PREFIX}{index:03d}'
+        # Seeded per institution: SCALE002 gets the same rows (and primary keys)
+        # whether it is built alone or after SCALE001
+        self.rng = random.Random(f'{self.seed}:{index}')
+        if Institution.objects.filter(code=code).exists():
+            raise CommandError(f'{code} already exists, run with --clear')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{code}: {self.students:,} students'))
+
+        institution = Institution.objects.create(
+            id=self.uuid(),
+            name=f'Scale Test School {index}',
+            short_name=f'STS{index}',
+            slug=f'scale-{index:03d}',
+            code=code,
+            address=f'{index} Benchmark Road',
+            city='Bengaluru',
+            contact_email=f'office.{code.lower()}@{EMAIL_DOMAIN}',
+            contact_phone=f'+91-80-{index:04d}0000',
+            fiscal_year_start=self.year_start,
+            academic_year_start=self.year_start,
+            academic_year_end=self.year_end,
+        )
+        iid = institution.pk
+        slug = code.lower()
+
+        admin = User(
+            id=self.uuid(), email=f'admin.{slug}@{EMAIL_DOMAIN}', password=self.password,
+            first_name='Admin', last_name=code, role=User.Role.INSTITUTION_ADMIN, is_staff=True,
+        )
+        teachers = [
+            User(id=self.uuid(), email=f'teacher{n}.{slug}@{EMAIL_DOMAIN}', password=self.password,
+                 first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES),
+                 role=User.Role.TEACHER)
+            for n in range(max(1, self.students // 25))
+        ]
+        self.bulk(User, [admin] + teachers)
+        self.bulk(UserProfile, (UserProfile(id=self.uuid(), user=user, institution_id=iid) for user in [admin] + teachers))
+
+        academic_year = AcademicYear.objects.create(
+            id=self.uuid(), institution_id=iid, name=f'{self.year_start.year}-{self.year_end.year}',
+            start_date=self.year_start, end_date=self.year_end, is_current=True,
+        )
+
+        classes = [
+            Class(id=self.uuid(), institution_id=iid, name=f'Class {grade}', code=f'C{grade:02d}', capacity=200)
+            for grade in range(1, 13)
+        ]
+        self.bulk(Class, classes)
+        sections = [
+            Section(id=self.uuid(), institution_id=iid, class_name=klass, name=letter, capacity=50)
+            for klass in classes for letter in 'ABCD'
+        ]
+        self.bulk(Section, sections)
+        subjects = [
+            Subject(id=self.uuid(), institution_id=iid, name=name, code=subject_code)
+            for name, subject_code in SUBJECTS
+        ]
+        self.bulk(Subject, subjects)
+
+        students = self.build_students(iid, slug, academic_year, classes, sections)
+        self.build_guardians(students)
+        self.build_attendance(iid, students, admin)
+        self.build_exams(iid, academic_year, subjects, students)
+        self.build_finance(iid, slug, academic_year, classes, students)
+        self.build_library(iid, index, slug, students, admin)
+        self.build_notices(iid, admin)
+        # bulk_create skips the signals that maintain search documents
+        search.rebuild(institution=institution, batch_size=self.batch_size)
+
+    def build_students(self, iid, slug, academic_year, classes, sections):
+        """Create students with their User and UserProfile; returns (id, user_id, class_index, ability)."""
+        rng = self.rng
+        rows = []
+        users = []
+        students = []
+        for n in range(1, self.students + 1):
+            class_index = rng.randrange(len(classes))
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f'student{n}.{slug}@{EMAIL_DOMAIN}'
+            user = User(id=self.uuid(), email=email, password=self.password,
+                        first_name=first, last_name=last, role=User.Role.STUDENT)
+            users.append(user)
+            age = 6 + class_index
+            student = Student(
+                id=self.uuid(),
+                user_id=user.pk,
+                institution_id=iid,
+                first_name=first,
+                last_name=last,
+                email=email,
+                mobile=f'9{rng.randrange(10 ** 9):09d}',
+                gender=rng.choice('MF'),
+                date_of_birth=self.year_start - datetime.timedelta(days=age * 365 + rng.randrange(365)),
+                category=rng.choice(['', 'SC', 'ST', 'OBC']),
+                religion=rng.choice(['HINDU', 'MUSLIM', 'CHRISTIAN', 'SIKH']),
+                blood_group=rng.choice(['A+', 'B+', 'O+', 'AB+', 'A-', 'O-']),
+                admission_number=f'ADM-{slug.upper()}-{n:06d}',
+                roll_number=str(n),
+                enrollment_date=self.year_start - datetime.timedelta(days=rng.randrange(365 * (class_index + 1))),
+                status='ACTIVE' if rng.random() < 0.97 else 'INACTIVE',
+                academic_year=academic_year,
+                current_class=classes[class_index],
+                section=sections[class_index * 4 + rng.randrange(4)],
+            )
+            students.append(student)
+            rows.append((student.pk, user.pk, class_index, rng.gauss(65, 15)))
+
+        self.bulk(User, users)
+        self.bulk(UserProfile, (UserProfile(id=self.uuid(), user_id=user.pk, institution_id=iid) for user in users))
+        self.bulk(Student, students)
+        return rows
+
+    def build_guardians(self, students):
+        relations = ['FATHER', 'MOTHER', 'GUARDIAN', 'GRANDFATHER', 'GRANDMOTHER', 'UNCLE']
+        rng = self.rng
+
+        def guardians():
+            for student_id, _, _, _ in students:
+                for position in range(self.guardians):
+                    yield Guardian(
+                        id=self.uuid(),
+                        student_id=student_id,
+                        relation=relations[position % len(relations)],
+                        name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                        occupation=rng.choice(['SERVICE', 'BUSINESS', 'GOVT', 'FARMER']),
+                        phone=f'8{rng.randrange(10 ** 9):09d}',
+                        is_primary=position == 0,
+                    )
+
+        self.bulk(Guardian, guardians())
+
+    def build_attendance(self, iid, students, admin):
+        rng = self.rng
+        thresholds = []
+        cumulative = 0.0
+        for status, weight in ATTENDANCE_WEIGHTS:
+            cumulative += weight
+            thresholds.append((cumulative, status))
+
+        institution_id = self.adapt_uuid(iid)
+        marked_by_id = self.adapt_uuid(admin.pk)
+        # Student-major in key order keeps the (institution, student, date) and
+        # student indexes append-only, which is what makes 10M rows feasible
+        student_ids = sorted(self.adapt_uuid(student_id) for student_id, _, _, _ in students)
+        dates = [self.adapt_date(day) for day in self.school_days]
+        stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        def rows():
+            for student_id in student_ids:
+                for date in dates:
+                    roll = rng.random()
+                    status = next((s for limit, s in thresholds if roll < limit), 'present')
+                    yield (self.adapt_uuid(self.uuid()), institution_id, student_id, date, status, '',
+                           marked_by_id, stamp, stamp)
+
+        self.insert_rows(
+            Attendance,
+            ['id', 'institution', 'student', 'date', 'status', 'remarks', 'marked_by', 'created_at', 'updated_at'],
+            rows(),
+        )
+
+    def build_exams(self, iid, academic_year, subjects, students):
+        rng = self.rng
+        exam_types = [
+            ExamType(id=self.uuid(), institution_id=iid, name=name, code=code)
+            for name, code in EXAMS[:self.exams]
+        ]
+        self.bulk(ExamType, exam_types)
+
+        span = max((self.end_date - self.year_start).days, 30)
+        exams = []
+        for position, exam_type in enumerate(exam_types, start=1):
+            start = self.year_start + datetime.timedelta(days=span * position // (len(exam_types) + 1))
+            exams.append(Exam(
+                id=self.uuid(), institution_id=iid, exam_type=exam_type,
+                name=f'{exam_type.name} {academic_year.name}', academic_year=academic_year,
+                start_date=start, end_date=start + datetime.timedelta(days=10), is_published=True,
+            ))
+        self.bulk(Exam, exams)
+
+        exam_subjects = [
+            ExamSubject(
+                id=self.uuid(), exam=exam, subject=subject, max_marks=Decimal('100'), pass_marks=Decimal('33'),
+                exam_date=exam.start_date + datetime.timedelta(days=offset),
+                start_time=datetime.time(9), end_time=datetime.time(12),
+            )
+            for exam in exams for offset, subject in enumerate(subjects)
+        ]
+        self.bulk(ExamSubject, exam_subjects)
+
+        marks_field = ExamResult._meta.get_field('marks_obtained')
+        adapted_marks = [
+            connection.ops.adapt_decimalfield_value(Decimal(marks), marks_field.max_digits, marks_field.decimal_places)
+            for marks in range(101)
+        ]
+        stamp = connection.ops.adapt_datetimefield_value(timezone.now())
+        student_rows = [(self.adapt_uuid(student_id), ability) for student_id, _, _, ability in students]
+
+        def results():
+            for exam_subject in exam_subjects:
+                exam_subject_id = self.adapt_uuid(exam_subject.pk)
+                for student_id, ability in student_rows:
+                    marks = max(0, min(100, round(ability + rng.gauss(0, 10))))
+                    yield (self.adapt_uuid(self.uuid()), exam_subject_id, student_id, adapted_marks[marks],
+                           _grade(marks), '', stamp, stamp)
+
+        self.insert_rows(
+            ExamResult,
+            ['id', 'exam_subject', 'student', 'marks_obtained', 'grade', 'remarks', 'created_at', 'updated_at'],
+            results(),
+        )
+
+    def build_finance(self, iid, slug, academic_year, classes, students):
+        rng = self.rng
+        structures = [
+            FeeStructure(
+                id=self.uuid(), institution_id=iid, name=f'Tuition {klass.name}',
+                academic_year=academic_year, class_name=klass, amount=Decimal(24000 + 2000 * grade),
+            )
+            for grade, klass in enumerate(classes)
+        ]
+        self.bulk(FeeStructure, structures)
+        if not self.invoices:
+            return
+
+        prefix = slug.upper()
+        invoices = []
+        payments = []
+        months_per_invoice = max(1, 12 // self.invoices)
+        for student_id, _, class_index, _ in students:
+            installment = (structures[class_index].amount / self.invoices).quantize(Decimal('1.00'))
+            for term in range(self.invoices):
+                month = self.year_start.month - 1 + term * months_per_invoice
+                issue_date = datetime.date(self.year_start.year + month // 12, month % 12 + 1, 1)
+                due_date = issue_date + datetime.timedelta(days=15)
+                paid = Decimal('0')
+                status = 'issued'
+                if due_date <= self.end_date:
+                    roll = rng.random()
+                    if roll < 0.75:
+                        paid, status = installment, 'paid'
+                    elif roll < 0.85:
+                        paid, status = (installment / 2).quantize(Decimal('1.00')), 'partial'
+                invoice = FeeInvoice(
+                    id=self.uuid(), invoice_number=f'INV-{prefix}-{len(invoices) + 1:07d}',
+                    institution_id=iid, student_id=student_id, academic_year=academic_year,
+                    issue_date=issue_date, due_date=due_date, total_amount=installment,
+                    paid_amount=paid, status=status,
+                )
+                invoices.append(invoice)
+                if paid:
+                    payments.append(Payment(
+                        id=self.uuid(), student_id=student_id, institution_id=iid, invoice=invoice,
+                        payment_number=f'PAY-{prefix}-{len(payments) + 1:07d}',
+                        payment_mode=rng.choice(['cash', 'online', 'bank_transfer', 'cheque']),
+                        payment_date=min(self.end_date, due_date - datetime.timedelta(days=rng.randrange(15))),
+                        amount=installment, amount_paid=paid,
+                        status='paid' if status == 'paid' else 'partially_paid',
+                    ))
+        self.bulk(FeeInvoice, invoices)
+        self.bulk(Payment, payments)
+
+    def build_library(self, iid, index, slug, students, admin):
+        rng = self.rng
+        categories = [
+            Category(id=self.uuid(), institution_id=iid, name=name, slug=f'{slugify(name)}-{slug}')
+            for name in ['Fiction', 'Science', 'History', 'Mathematics', 'Biography', 'Reference',
+                         'Poetry', 'Geography', 'Technology', 'Art', 'Sports', 'Languages']
+        ]
+        self.bulk(Category, categories)
+        authors = [
+            Author(id=self.uuid(), institution_id=iid, name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {n}',
+                   slug=f'author-{n}-{slug}')
+            for n in range(max(1, self.books // 5))
+        ]
+        self.bulk(Author, authors)
+        books = []
+        for n in range(self.books):
+            quantity = rng.randint(1, 5)
+            books.append(Book(
+                id=self.uuid(), institution_id=iid, title=f'{rng.choice(categories).name} Volume {n + 1}',
+                slug=f'book-{n + 1}', author=rng.choice(authors), category=rng.choice(categories),
+                isbn=f'978{index:03d}{n:07d}', quantity=quantity, available_copies=quantity,
+                pages=rng.randint(80, 600), created_by_id=admin.pk,
+            ))
+        self.bulk(Book, books)
+        if not books or not self.loans:
+            return
+
+        span = max((self.end_date - self.year_start).days, 1)
+        now = self.aware(self.end_date, 17)
+
+        def loans():
+            for _, user_id, _, _ in students:
+                for _ in range(rng.randint(0, 2 * self.loans)):
+                    borrowed = self.aware(self.year_start + datetime.timedelta(days=rng.randrange(span)), 10)
+                    due = borrowed + datetime.timedelta(days=14)
+                    returned = None
+                    fine = Decimal('0')
+                    if due > now:
+                        status = 'active'
+                    else:
+                        roll = rng.random()
+                        if roll < 0.9:
+                            returned = borrowed + datetime.timedelta(days=rng.randint(3, 20))
+                            status = 'returned'
+                            if returned > due:
+                                fine = Decimal((returned - due).days * 5)
+                        else:
+                            status = 'overdue' if roll < 0.97 else 'lost'
+                    yield BorrowRecord(
+                        id=self.uuid(), institution_id=iid, book_id=rng.choice(books).pk, borrower_id=user_id,
+                        borrowed_date=borrowed, due_date=due, returned_date=returned, status=status,
+                        fine_amount=fine, created_by_id=admin.pk,
+                    )
+
+        self.bulk(BorrowRecord, loans())
+
+    def build_notices(self, iid, admin):
+        rng = self.rng
+        span = max((self.end_date - self.year_start).days, 1)
+
+        def notices():
+            for n in range(self.notices):
+                published = self.aware(self.year_start + datetime.timedelta(days=rng.randrange(span)))
+                yield Notice(
+                    id=self.uuid(), institution_id=iid, title=f'Notice {n + 1}',
+                    content=' '.join(rng.choice(LAST_NAMES) for _ in range(60)),
+                    priority=rng.choice(['low', 'medium', 'medium', 'high', 'urgent']),
+                    audience=rng.choice(['all', 'students', 'parents', 'teachers', 'staff']),
+                    is_published=rng.random() < 0.85, publish_date=published,
+                    expiry_date=published + datetime.timedelta(days=30), created_by_id=admin.pk,
+                )
+
+        self.bulk(Notice, notices())
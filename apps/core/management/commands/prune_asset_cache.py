@@ -0,0 +1,41 @@
+# apps/core/management/commands/prune_asset_cache.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils import assets
+
+
+class Command(BaseCommand):
+    help = 'Evict least recently used files from the remote asset cache (ASSET_CACHE_DIR)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-size',
+            type=int,
+            help='Size cap in MB (default: ASSET_CACHE_MAX_BYTES)',
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            help='Also remove files not used for this many days',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove everything from the cache',
+        )
+
+    def handle(self, *args, **options):
+        files, size = assets.usage()
+        self.stdout.write(f'Asset cache {settings.ASSET_CACHE_DIR}: {files} files, {size / 1024 / 1024:.1f} MB')
+
+        if options['clear']:
+            removed, freed = assets.clear()
+        else:
+            max_bytes = options['max_size'] * 1024 * 1024 if options['max_size'] is not None else None
+            older_than = options['older_than'] * 86400 if options['older_than'] is not None else None
+            removed, freed = assets.evict(max_bytes=max_bytes, older_than=older_than)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} files ({freed / 1024 / 1024:.1f} MB)'
+        ))
@@ -0,0 +1,48 @@
+# apps/core/management/commands/rebuild_search_index.py
+"""
+Rebuild the full-text search documents (see apps/core/search.py). Needed
+after bulk loads that bypass model signals (bulk_create, update(), raw SQL):
+
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --model students.Student --institution SCALE001
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core import search
+from apps.organization.models import Institution
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for the registered models'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models',
+                            help='app_label.Model to rebuild (repeatable, default: all registered)')
+        parser.add_argument('--institution', help='Only rebuild documents of this institution code')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+                for model in models:
+                    search.get_spec(model)
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+
+        institution = None
+        if options['institution']:
+            institution = Institution.objects.filter(code=options['institution']).first()
+            if institution is None:
+                raise CommandError(f"Institution {options['institution']} not found")
+
+        with transaction.atomic():
+            total = search.rebuild(models, institution, options['batch_size'], stdout=self.stdout)
+        if connection.vendor == 'sqlite':
+            # Merge the FTS5 b-tree segments written by the rebuild
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO core_search_document_fts(core_search_document_fts) VALUES ('optimize')")
+        self.stdout.write(self.style.SUCCESS(f'Indexed {total} document(s)'))
@@ -0,0 +1,151 @@
+# apps/core/management/commands/run_benchmarks.py
+"""
+Benchmark the hot paths (see apps/core/benchmarks.py) against a generated
+dataset and compare with the stored baseline:
+
+    python manage.py generate_scale_data --preset medium --clear
+    python manage.py run_benchmarks --update-baseline   # record a baseline
+    python manage.py run_benchmarks                     # fails on regression
+
+Baselines are only comparable on the same machine, database and dataset; the
+run refuses to compare against a baseline taken on a different one.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import benchmarks
+from apps.organization.models import Institution
+
+from .generate_scale_data import CODE_PREFIX
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the heaviest views on the synthetic dataset and fail on regressions against a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--institution', help=f'Institution code (default: the first {CODE_PREFIX}* institution)')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Only run this scenario (repeatable)')
+        parser.add_argument('--list', action='store_true', help='List the scenarios and exit')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per scenario (default: 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per scenario (default: 2)')
+        parser.add_argument(
+            '--baseline',
+            default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'),
+            help='Baseline file (default: benchmarks/baseline.json)',
+        )
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p50/p95 latency growth as a fraction (default: 0.25)')
+        parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                            help='Ignore latency growth smaller than this (default: 5ms)')
+        parser.add_argument('--query-tolerance', type=int, default=0,
+                            help='Allowed growth in queries per request (default: 0)')
+        parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                            help='Allowed peak memory growth as a fraction (default: 0.25)')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for scenario in benchmarks.SCENARIOS:
+                self.stdout.write(f'{scenario.name:28} {scenario.method.upper():5} {scenario.user}')
+            return
+
+        try:
+            scenarios = benchmarks.get_scenarios(options['scenarios'])
+        except benchmarks.BenchmarkError as e:
+            raise CommandError(str(e))
+
+        institution = self.get_institution(options['institution'])
+        baseline_path = Path(options['baseline'])
+        baseline = None
+        if baseline_path.exists() and not options['update_baseline']:
+            try:
+                baseline = benchmarks.load_baseline(baseline_path)
+            except (ValueError, benchmarks.BenchmarkError) as e:
+                raise CommandError(f'Could not read baseline {baseline_path}: {e}')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'Benchmarking {len(scenarios)} scenario(s) on {institution.code}'
+        ))
+        self.stdout.write(
+            f"{'scenario':28} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'dupes':>6} {'peak mem':>10}"
+        )
+        try:
+            results = benchmarks.run_suite(
+                institution,
+                scenarios,
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                on_result=self.print_result,
+            )
+        except benchmarks.BenchmarkError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            benchmarks.save_baseline(Path(options['output']), results)
+
+        failed = [name for name, result in results['scenarios'].items() if 'error' in result]
+        if options['update_baseline']:
+            if failed:
+                raise CommandError(f"Not writing a baseline, scenario(s) failed: {', '.join(failed)}")
+            benchmarks.save_baseline(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        if baseline is None:
+            if failed:
+                raise CommandError(f"Scenario(s) failed: {', '.join(failed)}")
+            self.stdout.write(self.style.WARNING(
+                f'No baseline at {baseline_path}; run with --update-baseline to record one'
+            ))
+            return
+
+        self.check_comparable(baseline, results)
+        regressions = benchmarks.compare(
+            results,
+            baseline,
+            latency_tolerance=options['tolerance'],
+            min_delta_ms=options['min_delta_ms'],
+            query_tolerance=options['query_tolerance'],
+            memory_tolerance=options['memory_tolerance'],
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline_path}'))
+            return
+
+        for name, metric, before, after in regressions:
+            self.stderr.write(self.style.ERROR(f'REGRESSION {name} {metric}: {before} -> {after}'))
+        raise CommandError(f'{len(regressions)} regression(s) against {baseline_path}')
+
+    def get_institution(self, code):
+        queryset = Institution.objects.all()
+        if code:
+            institution = queryset.filter(code=code).first()
+        else:
+            institution = queryset.filter(code__startswith=CODE_PREFIX).order_by('code').first()
+        if institution is None:
+            raise CommandError(
+                f"Institution {code or CODE_PREFIX + '*'} not found; create one with `manage.py generate_scale_data`"
+            )
+        return institution
+
+    def check_comparable(self, baseline, results):
+        keys = ('institution', 'students', 'database')
+        before = {key: baseline['meta'].get(key) for key in keys}
+        after = {key: results['meta'][key] for key in keys}
+        if before != after:
+            raise CommandError(
+                f'Baseline was recorded on {before}, this run is {after}; '
+                'regenerate the dataset or record a new baseline with --update-baseline'
+            )
+
+    def print_result(self, name, result):
+        if 'error' in result:
+            self.stdout.write(self.style.ERROR(f"{name:28} {result['error']}"))
+            return
+        self.stdout.write(
+            f"{name:28} {result['p50_ms']:>7.1f}ms {result['p95_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms "
+            f"{result['queries']:>8} {result['duplicate_queries']:>6} {result['peak_memory_kb'] / 1024:>8.1f}MB"
+        )
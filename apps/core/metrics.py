@@ -0,0 +1,330 @@
+# core/metrics.py
+"""
+Process metrics in the Prometheus text format, served at /metrics.
+
+    REQUEST_LATENCY.observe(0.25, view='students:student_list', method='GET')
+    EXPORT_ROWS.inc(1200, export='StudentExport', format='csv')
+
+Counters and histograms live in a per-process registry. Under gunicorn
+(several worker processes) set METRICS_DIR to a directory shared by the
+workers: each process writes its snapshot there every METRICS_FLUSH_INTERVAL
+seconds and at exit, and /metrics sums the snapshots of all processes, like
+prometheus_client's multiprocess mode. Snapshots of exited workers are kept so
+totals never go backwards; empty the directory when the service is restarted.
+
+Recorded here: request latency and status by URL name, SQL queries per request
+(MetricsMiddleware), PDF render durations (utils.pdf), export rows and bytes
+(core.exports), Celery task durations (config/celery.py) and core.cache
+hit/miss counts, with the hit ratio derived at scrape time.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def describe(self):
+        return {'type': self.type, 'help': self.documentation, 'labelnames': list(self.labelnames)}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.registry.touch()
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        return [[list(key), value] for key, value in self.values.items()]
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.registry.touch()
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def describe(self):
+        return {**super().describe(), 'buckets': list(self.buckets)}
+
+    def samples(self):
+        return [[list(key), [list(counts), total, count]] for key, (counts, total, count) in self.values.items()]
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    """Thread-safe metrics of this process, optionally mirrored to METRICS_DIR."""
+
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.lock = threading.RLock()
+        self.metrics = {}
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._pid = None
+        self._dirty = False
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def touch(self):
+        """Called under the lock on every update; (re)starts the writer after a fork."""
+        self._dirty = True
+        pid = os.getpid()
+        if self._pid != pid:
+            if self._pid is not None:
+                # Forked child (gunicorn/celery prefork): the parent's counts are not ours
+                for metric in self.metrics.values():
+                    metric.values.clear()
+            self._pid = pid
+            if self.directory:
+                threading.Thread(target=self._run, name='metrics-writer', daemon=True).start()
+                atexit.register(self.flush)
+
+    # ---- snapshots ------------------------------------------------------
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {**metric.describe(), 'samples': metric.samples()}
+                for name, metric in self.metrics.items()
+            }
+
+    def _path(self):
+        return os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR (atomic replace)."""
+        if not self.directory:
+            return
+        with self.lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            data = self.snapshot()
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.metrics-', suffix='.tmp')
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(data, handle)
+        os.replace(tmp, self._path())
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Metrics snapshot failed")
+
+    def collect(self):
+        """Snapshots to expose: every process in METRICS_DIR, else just this one."""
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics snapshot {path}: {e}")
+        return snapshots
+
+
+def merge(snapshots):
+    """Sum the samples of several process snapshots."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, {**data, 'samples': {}})
+            for labels, value in data['samples']:
+                key = tuple(labels)
+                current = target['samples'].get(key)
+                if data['type'] == 'histogram':
+                    if current is None or len(current[0]) != len(value[0]):
+                        current = target['samples'][key] = [[0] * len(value[0]), 0.0, 0]
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target['samples'][key] = (current or 0) + value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _cache_hit_ratio(merged):
+    lookups = merged.get('cache_lookups_total')
+    if not lookups:
+        return None
+    totals = {}
+    for (namespace, result), value in lookups['samples'].items():
+        hits, count = totals.get(namespace, (0, 0))
+        totals[namespace] = (hits + (value if result == 'hit' else 0), count + value)
+    return {
+        'type': 'gauge',
+        'help': 'core.cache hit ratio per namespace since the processes started',
+        'labelnames': ['namespace'],
+        'samples': {(namespace,): hits / count for namespace, (hits, count) in totals.items() if count},
+    }
+
+
+def render(snapshots=None):
+    """Prometheus text exposition format (version 0.0.4)."""
+    merged = merge(registry.collect() if snapshots is None else snapshots)
+    ratio = _cache_hit_ratio(merged)
+    if ratio:
+        merged['cache_hit_ratio'] = ratio
+
+    lines = []
+    for name in sorted(merged):
+        data = merged[name]
+        names = data['labelnames']
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        for key in sorted(data['samples']):
+            value = data['samples'][key]
+            if data['type'] != 'histogram':
+                lines.append(f'{name}{_labels(names, key)} {_number(value)}')
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(data['buckets'], counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{_labels(names, key, ("le", _number(float(bound))))} {cumulative}')
+            lines.append(f'{name}_bucket{_labels(names, key, ("le", "+Inf"))} {count}')
+            lines.append(f'{name}_sum{_labels(names, key)} {_number(float(total))}')
+            lines.append(f'{name}_count{_labels(names, key)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry(
+    directory=getattr(settings, 'METRICS_DIR', '') or None,
+    flush_interval=getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0),
+)
+
+REQUEST_LATENCY = registry.histogram(
+    'django_http_request_duration_seconds', 'Request latency by URL name', ['view', 'method'],
+)
+REQUESTS = registry.counter(
+    'django_http_requests_total', 'Responses by URL name and status', ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = registry.histogram(
+    'django_http_request_db_queries', 'SQL queries per request by URL name', ['view'], buckets=QUERY_BUCKETS,
+)
+DB_QUERIES = registry.counter(
+    'django_db_queries_total', 'SQL queries executed while handling requests', ['view'],
+)
+PDF_RENDER = registry.histogram(
+    'pdf_render_duration_seconds', 'utils.pdf render time by template', ['template', 'status'],
+    buckets=DURATION_BUCKETS,
+)
+EXPORT_ROWS = registry.counter('export_rows_total', 'Rows written by CSV/Excel exports', ['export', 'format'])
+EXPORT_BYTES = registry.counter('export_bytes_total', 'Bytes written by CSV/Excel exports', ['export', 'format'])
+CELERY_TASK = registry.histogram(
+    'celery_task_duration_seconds', 'Celery task run time by task and final state', ['task', 'state'],
+    buckets=DURATION_BUCKETS,
+)
+CACHE_LOOKUPS = registry.counter(
+    'cache_lookups_total', 'core.cache get_or_set lookups by namespace', ['namespace', 'result'],
+)
+
+
+def instrument_celery():
+    """Time every task run by this worker (connected from config/celery.py)."""
+    from celery.signals import task_postrun, task_prerun
+
+    started = {}
+
+    def prerun(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    def postrun(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None:
+            CELERY_TASK.observe(time.perf_counter() - start, task=getattr(task, 'name', 'unknown'), state=state or '')
+
+    task_prerun.connect(prerun, weak=False, dispatch_uid='core.metrics.task_prerun')
+    task_postrun.connect(postrun, weak=False, dispatch_uid='core.metrics.task_postrun')
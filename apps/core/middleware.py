@@ -1,31 +1,183 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponseForbidden
+
+from apps.core import cache as tenant_cache
+from apps.core.branding import get_branding
+from apps.core.utils import get_user_institution
+from apps.core import profiling
+from apps.core import audit
+from apps.core import metrics
+
+TENANT_NAMESPACE = "tenant-map"
+TENANT_MAP_TIMEOUT = 60 * 60
+
+
+def get_institution_id_for_slug(slug):
+    """Cached slug -> active institution id map (None when unknown)."""
+    from apps.organization.models import Institution
+
+    return tenant_cache.get_or_set(
+        None,
+        TENANT_NAMESPACE,
+        slug,
+        lambda: Institution.objects.filter(slug=slug, is_active=True)
+        .values_list("pk", flat=True)
+        .first(),
+        timeout=TENANT_MAP_TIMEOUT,
+    )
+
+
 class TenantMiddleware:
+    """
+    Resolve the institution from the X-School-Slug header or the subdomain.
+    The slug -> institution map and the institution itself come from the cache,
+    so a normal request does not touch the database here.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         host = request.get_host().split(':')[0]
         subdomain = host.split('.')[0]
-        
+
         school_slug = request.headers.get('X-School-Slug', subdomain)
-        
-        try:
-            from apps.organization.models import School
-            school = School.objects.get(slug=school_slug, is_active=True)
-            request.school = school
-        except School.DoesNotExist:
+
+        institution_id = get_institution_id_for_slug(school_slug)
+        institution = get_branding(institution_id=institution_id)[0] if institution_id else None
+
+        if institution is None:
             if not request.path.startswith('/admin/'):
-                from django.http import HttpResponseForbidden
                 return HttpResponseForbidden("School not found or inactive")
-        
+        else:
+            request.institution = institution
+            request.school = institution
+
         response = self.get_response(request)
         return response
-    
-    
-class AuditLogMiddleware:
+
+
+class InstitutionMiddleware:
+    """
+    Resolve the logged-in user's institution once per request and expose it as
+    request.institution (profile joined in). get_user_institution, the context
+    processors and InstitutionMixin all reuse it.
+    Must come after AuthenticationMiddleware (and after TenantMiddleware, whose
+    host-based institution takes precedence).
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        # You can later add logging of requests here
+        if getattr(request, 'institution', None) is None:
+            user = getattr(request, 'user', None)
+            request.institution = get_user_institution(user) if user is not None else None
+
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
+
+
+class QueryProfilingMiddleware:
+    """
+    Opt-in SQL instrumentation (settings.PROFILING_ENABLED).
+    Records query count, SQL time, render time and duplicate query fingerprints
+    per resolved URL name into core.profiling.store; see the superadmin report
+    at core:profiling_report.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.duplicate_threshold = getattr(settings, 'PROFILING_DUPLICATE_THRESHOLD', 3)
+
+    def __call__(self, request):
+        if request.path.startswith(('/static/', '/media/')):
+            return self.get_response(request)
+
+        recorder = profiling.QueryRecorder()
+        request._profiling_render_time = 0.0
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        total_time = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        profiling.store.record({
+            'view': (match.view_name if match else None) or request.path,
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'sql_time': recorder.total_time,
+            'render_time': request._profiling_render_time,
+            'total_time': total_time,
+            'duplicates': recorder.duplicates(self.duplicate_threshold),
+            'timestamp': time.time(),
+        })
+        return response
+
+    def process_template_response(self, request, response):
+        render_start = time.perf_counter()
+
+        def finished(rendered):
+            request._profiling_render_time += time.perf_counter() - render_start
+
+        response.add_post_render_callback(finished)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Request latency, status and SQL query count per URL name into
+    core.metrics (exposed at /metrics). Place first so the time spent in the
+    other middleware is included.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            with connection.execute_wrapper(count):
+                response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            match = getattr(request, 'resolver_match', None)
+            view = (match.view_name if match else None) or '<unresolved>'
+            metrics.REQUEST_LATENCY.observe(time.perf_counter() - start, view=view, method=request.method)
+            metrics.REQUESTS.inc(view=view, method=request.method, status=status)
+            metrics.REQUEST_QUERIES.observe(queries[0], view=view)
+            metrics.DB_QUERIES.inc(queries[0], view=view)
+
+
+class AuditLogMiddleware:
+    """
+    Attribute model changes made while handling the request (core.audit) to
+    its user, institution, IP and path. Writes nothing itself; events are
+    batched by core.audit.buffer. Must come after InstitutionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = audit.set_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            audit.reset_request(token)
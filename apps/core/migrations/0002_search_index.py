@@ -0,0 +1,87 @@
+"""
+Full-text index for core_search_document, per database vendor.
+
+PostgreSQL: a stored generated tsvector column (title weighted A, body B)
+with a GIN index, plus a pg_trgm GIN index on title for typo-tolerant name
+matching. SQLite: an FTS5 external-content table kept in sync with triggers.
+Other databases get no index; core.search falls back to icontains there.
+
+Note: SQLite rebuilds a table for most ALTERs, which drops its triggers. A
+later migration that alters core_search_document must recreate them (run
+this migration's SQLite statements again).
+"""
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE core_search_document ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX core_search_document_vector_idx ON core_search_document USING gin (search_vector)",
+    "CREATE INDEX core_search_document_title_trgm_idx ON core_search_document USING gin (title gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS core_search_document_title_trgm_idx",
+    "DROP INDEX IF EXISTS core_search_document_vector_idx",
+    "ALTER TABLE core_search_document DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_search_document_fts USING fts5(
+        title, body,
+        content='core_search_document', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER core_search_document_ai AFTER INSERT ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_search_document_ad AFTER DELETE ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(core_search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_search_document_au AFTER UPDATE ON core_search_document BEGIN
+        INSERT INTO core_search_document_fts(core_search_document_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_search_document_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "INSERT INTO core_search_document_fts(core_search_document_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_search_document_au",
+    "DROP TRIGGER IF EXISTS core_search_document_ad",
+    "DROP TRIGGER IF EXISTS core_search_document_ai",
+    "DROP TABLE IF EXISTS core_search_document_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0001_initial'),
+        ('core', '0003_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('institution', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organization.institution')),
+            ],
+            options={
+                'db_table': 'core_sequence',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sequence',
+            constraint=models.UniqueConstraint(fields=('institution', 'key'), name='core_sequence_institution_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='sequence',
+            constraint=models.UniqueConstraint(condition=models.Q(('institution__isnull', True)), fields=('key',), name='core_sequence_global_key'),
+        ),
+    ]
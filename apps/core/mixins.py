@@ -10,7 +10,7 @@ from django.shortcuts import get_object_or_404, redirect,render
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.contrib.auth.mixins import LoginRequiredMixin
-logger = logging.getLogger(__name__),
+logger = logging.getLogger(__name__)
 
 
 class RoleRequiredMixin(LoginRequiredMixin,AccessMixin):
@@ -39,27 +39,42 @@ class RoleRequiredMixin(LoginRequiredMixin,AccessMixin):
 
 class InstitutionMixin:
     """Mixin to handle institution-based filtering"""
-    
+
+    def get_institution_id(self):
+        """
+        URL kwarg, then session selection, then request.institution
+        (superadmins are not scoped unless they pick an institution).
+        """
+        institution_id = self.kwargs.get('institution_id') or self.request.session.get('current_institution')
+        if not institution_id and not getattr(self.request.user, 'is_superadmin', False):
+            institution = getattr(self.request, 'institution', None)
+            institution_id = institution.pk if institution else None
+        return institution_id
+
+    def get_current_institution(self):
+        institution = getattr(self.request, 'institution', None)
+        institution_id = self.get_institution_id()
+        if institution is not None and str(institution.pk) == str(institution_id):
+            return institution
+        from apps.organization.models import Institution
+        return get_object_or_404(Institution, id=institution_id)
+
     def get_queryset(self):
         queryset = super().get_queryset()
-        institution_id = self.kwargs.get('institution_id') or self.request.session.get('current_institution')
+        institution_id = self.get_institution_id()
         if institution_id and hasattr(queryset.model, 'institution'):
             return queryset.filter(institution_id=institution_id)
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        institution_id = self.kwargs.get('institution_id') or self.request.session.get('current_institution')
-        if institution_id:
-            from organization.models import Institution
-            context['current_institution'] = get_object_or_404(Institution, id=institution_id)
+        if self.get_institution_id():
+            context['current_institution'] = self.get_current_institution()
         return context
 
     def form_valid(self, form):
-        institution_id = self.kwargs.get('institution_id') or self.request.session.get('current_institution')
-        if institution_id and hasattr(form.instance, 'institution'):
-            from organization.models import Institution
-            form.instance.institution = get_object_or_404(Institution, id=institution_id)
+        if self.get_institution_id() and hasattr(form.instance, 'institution'):
+            form.instance.institution = self.get_current_institution()
         return super().form_valid(form)
     
 
@@ -0,0 +1,126 @@
+# core/models.py
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Flattened, searchable text of one indexed object (see core/search.py).
+
+    The full-text index lives next to the table and is created by migrations:
+    a generated tsvector column with GIN and pg_trgm indexes on PostgreSQL,
+    an FTS5 external-content table kept in sync by triggers on SQLite.
+    """
+    institution = models.ForeignKey(
+        'organization.Institution', on_delete=models.CASCADE, null=True, blank=True, related_name='+'
+    )
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=64)
+    title = models.CharField(max_length=500)
+    body = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'core_search_document'
+        unique_together = ['content_type', 'object_id']
+        indexes = [
+            models.Index(fields=['institution', 'content_type']),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model}: {self.title}"
+
+
+class AuditLogQuerySet(models.QuerySet):
+    def for_user(self, user):
+        return self.filter(user=user)
+
+    def for_model(self, model):
+        return self.filter(content_type=ContentType.objects.get_for_model(model))
+
+    def for_object(self, instance):
+        return self.for_model(type(instance)).filter(object_id=str(instance.pk))
+
+    def between(self, start=None, end=None):
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(created_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(created_at__lt=end)
+        return queryset
+
+
+class AuditLog(models.Model):
+    """
+    One create/update/delete of an audited model (see core/audit.py).
+    `changes` maps field name to [before, after]. Rows are written in batches,
+    so created_at is when the change happened, not when the row was inserted.
+    User and institution are kept as plain ids (no constraint, no cascade) so
+    the trail outlives them and a late batch never fails on a deleted row.
+    """
+    ACTION_CREATE = 'create'
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+    ACTION_CHOICES = (
+        (ACTION_CREATE, 'Create'),
+        (ACTION_UPDATE, 'Update'),
+        (ACTION_DELETE, 'Delete'),
+    )
+
+    institution = models.ForeignKey(
+        'organization.Institution', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+',
+        db_constraint=False,
+    )
+    user = models.ForeignKey(
+        'users.User', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+',
+        db_constraint=False,
+    )
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    object_id = models.CharField(max_length=64)
+    object_repr = models.CharField(max_length=200, blank=True)
+    changes = models.JSONField(default=dict, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    path = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    objects = AuditLogQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'core_audit_log'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['content_type', 'created_at']),
+            models.Index(fields=['content_type', 'object_id']),
+            models.Index(fields=['institution', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.content_type.model} {self.object_repr}"
+
+
+class Sequence(models.Model):
+    """
+    Last number handed out for one (institution, key) pair, e.g. the
+    "INV-ABC-2025-03-" invoice numbers of one institution (see core/sequences.py).
+    A null institution is a global sequence.
+    """
+    institution = models.ForeignKey(
+        'organization.Institution', on_delete=models.CASCADE, null=True, blank=True, related_name='+'
+    )
+    key = models.CharField(max_length=100)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'core_sequence'
+        constraints = [
+            models.UniqueConstraint(fields=['institution', 'key'], name='core_sequence_institution_key'),
+            models.UniqueConstraint(
+                fields=['key'], condition=models.Q(institution__isnull=True), name='core_sequence_global_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
@@ -0,0 +1,337 @@
+# core/pagination.py
+"""
+Keyset (cursor) pagination for large list views.
+
+OFFSET pagination reads and throws away every row before the requested page
+and runs a full COUNT(*) on each request, so page 5000 of a log table costs
+5000 times page 1. Keyset pagination remembers the ordering values of the
+last row shown and asks for the rows after it:
+
+    WHERE (start_date < %s) OR (start_date = %s AND first_name > %s)
+       OR (start_date = %s AND first_name = %s AND id > %s)
+    ORDER BY start_date DESC, first_name, id LIMIT 51
+
+which is one index range scan whatever the depth. The trade-off is that pages
+have no numbers: the controls are First / Previous / Next, and the total is an
+estimate unless count_mode = 'exact'.
+
+Usage:
+    class EmailLogListView(KeysetPaginationMixin, StaffRequiredMixin, ListView):
+        paginate_by = 25
+        keyset_ordering = ('-created_at',)   # default: the queryset's ordering
+
+    {% include 'partials/keyset_pagination.html' %}
+
+The primary key is appended to the ordering as a tie-breaker so the cursor is
+unique. Ordering fields should be covered by an index (led by the columns the
+view filters on, usually institution) for the seek to stay cheap.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404
+from django.utils.translation import gettext as _
+
+# Without planner statistics, counting stops here and the total shows as "N+"
+COUNT_LIMIT = 10000
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+# One ordering column: annotation name, field path, direction, model field and
+# whether the path can produce NULL (nullable field or nullable relation)
+Key = namedtuple('Key', 'name path descending field nullable')
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder keeping full microseconds: it cuts datetimes to
+    milliseconds, and a truncated `-created_at` value no longer matches the
+    boundary row, so the seek would skip or repeat rows.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction, values], cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidCursor(_('Invalid cursor'))
+    if direction not in ('n', 'p') or not isinstance(values, list):
+        raise InvalidCursor(_('Invalid cursor'))
+    return direction, values
+
+
+def estimate_count(queryset, limit=COUNT_LIMIT):
+    """
+    (count, kind) without scanning a large table; kind is 'exact', 'estimate'
+    or 'at_least'. On PostgreSQL the planner's
+    estimate is used: pg_class.reltuples for an unfiltered table, the EXPLAIN
+    row estimate otherwise. Elsewhere rows are counted up to `limit`.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                estimate = row[0] if row else -1
+            else:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = plan[0]['Plan']['Plan Rows']
+        # Small or never-analyzed tables: an exact count is cheap and honest
+        if estimate >= limit:
+            return int(estimate), 'estimate'
+
+    count = queryset[:limit + 1].count()
+    if count > limit:
+        return limit, 'at_least'
+    return count, 'exact'
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator; quacks like django.core.paginator.Page where it can."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # Query strings for the template controls, see KeysetPaginationMixin
+        self.first_url = self.next_url = self.previous_url = None
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self.object_list)} {self.paginator.model._meta.verbose_name_plural}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def count(self):
+        return self.paginator.count
+
+    @property
+    def count_kind(self):
+        return self.paginator.count_kind
+
+    def build_urls(self, query_dict, cursor_kwarg='cursor'):
+        """Fill first/next/previous_url from the current request's GET parameters."""
+        params = query_dict.copy()
+        params.pop(cursor_kwarg, None)
+        params.pop('page', None)
+        self.first_url = f'?{params.urlencode()}'
+        if self.has_next():
+            params[cursor_kwarg] = self.next_cursor
+            self.next_url = f'?{params.urlencode()}'
+        if self.has_previous():
+            params[cursor_kwarg] = self.previous_cursor
+            self.previous_url = f'?{params.urlencode()}'
+
+
+class KeysetPaginator:
+    """
+    Paginate `queryset` by the values of `ordering` (field paths, '-' for
+    descending; the queryset's own ordering when omitted). NULLs sort last.
+
+    count_mode: 'approximate' (estimate_count), 'exact' (COUNT(*)) or None.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None, count_mode='approximate', count_limit=COUNT_LIMIT):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.per_page = int(per_page)
+        self.count_mode = count_mode
+        self.count_limit = count_limit
+        self.keys = self._build_keys(ordering or self._default_ordering())
+        self._count = None
+
+    def _default_ordering(self):
+        ordering = list(self.queryset.query.order_by) or list(self.model._meta.ordering)
+        for field in ordering:
+            if not isinstance(field, str) or field == '?':
+                raise ImproperlyConfigured(
+                    f'{self.model.__name__}: keyset pagination needs field-name ordering, got {field!r}; '
+                    'set keyset_ordering'
+                )
+        return ordering or ['-pk']
+
+    def _build_keys(self, ordering):
+        """Key per ordering field, primary key last."""
+        keys = []
+        for field in ordering:
+            path = field.lstrip('-+')
+            keys.append(Key(f'_keyset_{len(keys)}', path, field.startswith('-'), *self._resolve_field(path)))
+        if not any(key.path in ('pk', self.model._meta.pk.name) for key in keys):
+            descending = keys[0].descending if keys else False
+            keys.append(Key(f'_keyset_{len(keys)}', 'pk', descending, self.model._meta.pk, False))
+        return keys
+
+    def _resolve_field(self, path):
+        model, field, nullable = self.model, None, False
+        for name in path.split(LOOKUP_SEP):
+            if model is None:
+                raise ImproperlyConfigured(f'{self.model.__name__}: cannot order by {path!r}')
+            try:
+                field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f'{self.model.__name__}: unknown ordering field {path!r}')
+            if field.many_to_many or field.one_to_many:
+                raise ImproperlyConfigured(f'{self.model.__name__}: cannot order by multi-valued {path!r}')
+            nullable = nullable or field.null or bool(field.one_to_one and not field.concrete)
+            model = field.related_model
+        return field, nullable
+
+    @property
+    def count(self):
+        if self._count is None and self.count_mode:
+            if self.count_mode == 'exact':
+                self._count = (self.queryset.count(), 'exact')
+            else:
+                self._count = estimate_count(self.queryset, self.count_limit)
+        return self._count[0] if self._count else None
+
+    @property
+    def count_kind(self):
+        if self.count is None:
+            return None
+        return self._count[1]
+
+    def _ordered(self, forward):
+        queryset = self.queryset.annotate(**{key.name: F(key.path) for key in self.keys})
+        # Walking backwards is the mirror image: every key flipped, NULLs first
+        order_by = []
+        for key in self.keys:
+            nulls = {} if not key.nullable else {'nulls_last': True} if forward else {'nulls_first': True}
+            expression = F(key.name)
+            order_by.append(expression.desc(**nulls) if key.descending == forward else expression.asc(**nulls))
+        return queryset.order_by(*order_by)
+
+    def _seek(self, values, forward):
+        """Rows strictly after `values` in the fetch order of `forward`."""
+        condition, equal = None, Q()
+        for key, value in zip(self.keys, values):
+            name = key.name
+            if value is None:
+                after = None if forward else Q(**{f'{name}__isnull': False})
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f"{name}__{'lt' if key.descending == forward else 'gt'}": value})
+                if forward and key.nullable:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            if after is not None:
+                condition = equal & after if condition is None else condition | (equal & after)
+            equal &= same
+        return condition
+
+    def _key_values(self, obj):
+        return [getattr(obj, key.name) for key in self.keys]
+
+    def _decode_values(self, values):
+        if len(values) != len(self.keys):
+            raise InvalidCursor(_('Cursor does not match this list'))
+        try:
+            return [
+                None if value is None else key.field.to_python(value)
+                for key, value in zip(self.keys, values)
+            ]
+        except Exception:
+            raise InvalidCursor(_('Invalid cursor'))
+
+    def page(self, cursor=None):
+        if not cursor:
+            rows = list(self._ordered(True)[:self.per_page + 1])
+            return self._page(rows[:self.per_page], has_next=len(rows) > self.per_page, has_previous=False)
+
+        direction, values = decode_cursor(cursor)
+        values = self._decode_values(values)
+        forward = direction == 'n'
+        rows = list(self._ordered(forward).filter(self._seek(values, forward))[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if forward:
+            return self._page(rows, has_next=more, has_previous=True)
+        if not more and len(rows) < self.per_page:
+            # Walked back past the start (rows were added/removed): show page one
+            return self.page()
+        return self._page(rows[::-1], has_next=True, has_previous=more)
+
+    def _page(self, rows, has_next, has_previous):
+        next_cursor = encode_cursor('n', self._key_values(rows[-1])) if rows and has_next else None
+        previous_cursor = encode_cursor('p', self._key_values(rows[0])) if rows and has_previous else None
+        return KeysetPage(rows, self, has_next, has_previous, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin replacing OFFSET pagination with KeysetPaginator. page_obj
+    and paginator in the context are the keyset versions; render the controls
+    with {% include 'partials/keyset_pagination.html' %}.
+    """
+
+    keyset_ordering = None
+    cursor_kwarg = 'cursor'
+    count_mode = 'approximate'
+
+    def get_keyset_ordering(self):
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.get_keyset_ordering(),
+            count_mode=self.count_mode,
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        page.build_urls(self.request.GET, self.cursor_kwarg)
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -1,76 +1,15 @@
 # core/permissions_views.py
 from django.http import HttpResponseForbidden
 from django.core.exceptions import ObjectDoesNotExist
+from apps.core.utils import get_user_institution
+from apps.users.permissions import PERMISSION_MATRIX, role_has_permission
 
 class RoleBasedPermissionMixin:
     """
     Role-based permission mixin for normal CBVs
     """
-       # Define role permissions matrix
-    ROLE_PERMISSIONS = {
-        'superadmin': {
-            'academics': ['view', 'add', 'change', 'delete', 'export'],
-            'students': ['view', 'add', 'change', 'delete', 'export'],
-            'teachers': ['view', 'add', 'change', 'delete', 'export'],
-            'attendance': ['view', 'add', 'change', 'delete', 'export'],
-            'hr': ['view', 'add', 'change', 'delete', 'export'],
-            'finance': ['view', 'add', 'change', 'delete', 'export'],
-        },
-        'institution_admin': {
-            'academics': ['view', 'add', 'change', 'delete', 'export'],
-            'students': ['view', 'add', 'change', 'delete', 'export'],
-            'teachers': ['view', 'add', 'change', 'delete', 'export'],
-            'attendance': ['view', 'add', 'change', 'delete', 'export'],
-            'hr': ['view', 'add', 'change', 'delete', 'export'],
-            'finance': ['view', 'add', 'change', 'delete', 'export'],
-        },
-        'principal': {
-            'academics': ['view', 'add', 'change', 'export'],
-            'students': ['view', 'add', 'change', 'export'],
-            'teachers': ['view', 'add', 'change', 'export'],
-            'attendance': ['view', 'add', 'change', 'export'],
-            'hr': ['view', 'export'],
-            'finance': ['view', 'export'],
-        },
-        'teacher': {
-            'academics': ['view', 'export'],
-            'students': ['view', 'export'],
-            'attendance': ['view', 'add', 'change', 'export'],
-            'hr': [],  # No access to HR
-            'finance': [],  # No access to finance
-        },
-        'accountant': {
-            'finance': ['view', 'add', 'change', 'export'],
-            'students': ['view'],  # For fee-related operations
-            'attendance': ['view'],  # For payroll calculations
-        },
-        'hr': {
-            'hr': ['view', 'add', 'change', 'export'],
-            'attendance': ['view', 'add', 'change', 'export'],
-            'students': ['view'],
-            'teachers': ['view', 'add', 'change', 'export'],
-        },
-        'student': {
-            'academics': ['view'],
-            'attendance': ['view'],  # Can view own attendance
-        },
-        'parent': {
-            'students': ['view'],  # Can view own children
-            'attendance': ['view'],  # Can view children's attendance
-            'academics': ['view'],  # Can view academic info
-        },
-        'librarian': {
-            'library': ['view', 'add', 'change', 'export'],
-        },
-        'transport_manager': {
-            'transport': ['view', 'add', 'change', 'export'],
-            'students': ['view'],
-        },
-        'support_staff': {
-            # Limited access based on specific assignments
-        }
-        
-        }
+    # Shared, compiled role matrix (see apps/users/permissions.py)
+    ROLE_PERMISSIONS = PERMISSION_MATRIX
     required_permission = 'view'
 
     def has_permission(self):
@@ -79,9 +18,7 @@ class RoleBasedPermissionMixin:
             return True
 
         app_label = getattr(self.model, '_meta').app_label
-        role_permissions = self.ROLE_PERMISSIONS.get(getattr(user, 'role', None), {})
-        app_permissions = role_permissions.get(app_label, [])
-        return self.required_permission in app_permissions
+        return role_has_permission(getattr(user, 'role', None), app_label, self.required_permission)
 
     def dispatch(self, request, *args, **kwargs):
         if not self.has_permission():
@@ -97,25 +34,20 @@ class InstitutionPermissionMixin:
         user = self.request.user
         if user.is_superuser:
             return True
-        try:
-            user_institution = user.profile.institution
-        except AttributeError:
-            user_institution = None
+        user_institution = get_user_institution(user)
+        user_institution_id = user_institution.pk if user_institution else None
 
-        if hasattr(obj, 'institution'):
-            return obj.institution == user_institution
-
-        for field in ['school', 'college']:
-            if hasattr(obj, field):
-                return getattr(obj, field) == user_institution
+        # Compare ids so checking a row never loads its institution
+        for field in ['institution', 'school', 'college']:
+            if hasattr(obj, f'{field}_id'):
+                return getattr(obj, f'{field}_id') == user_institution_id
         return False
 
     def get_queryset(self, queryset=None):
         if queryset is None:
             queryset = super().get_queryset()
-        try:
-            user_institution = self.request.user.profile.institution
-        except AttributeError:
+        user_institution = get_user_institution(self.request.user)
+        if user_institution is None:
             return queryset.none()
 
         if hasattr(self.model, 'institution'):
@@ -0,0 +1,129 @@
+# core/profiling.py
+"""
+Per-view SQL profiling used by QueryProfilingMiddleware.
+
+For every request the middleware records the query count, total SQL time,
+template render time and repeated query fingerprints (the same statement shape
+executed several times in one request is almost always an N+1 loop). Results
+are aggregated per resolved URL name in a rolling, process-local store that the
+superadmin report page and JSON endpoint read from.
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalize SQL so statements differing only in literals compare equal."""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook that times every statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self, threshold=2):
+        """Return {fingerprint: count} for shapes executed >= threshold times."""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return {fp: n for fp, n in counts.items() if n >= threshold}
+
+
+class ViewStats:
+    def __init__(self, name):
+        self.name = name
+        self.requests = 0
+        self.total_queries = 0
+        self.max_queries = 0
+        self.total_sql_time = 0.0
+        self.total_render_time = 0.0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.duplicates = Counter()
+
+    def add(self, sample):
+        self.requests += 1
+        self.total_queries += sample["queries"]
+        self.max_queries = max(self.max_queries, sample["queries"])
+        self.total_sql_time += sample["sql_time"]
+        self.total_render_time += sample["render_time"]
+        self.total_time += sample["total_time"]
+        self.max_time = max(self.max_time, sample["total_time"])
+        for fp, count in sample["duplicates"].items():
+            self.duplicates[fp] = max(self.duplicates[fp], count)
+
+    def as_dict(self, top=5):
+        n = self.requests or 1
+        return {
+            "view": self.name,
+            "requests": self.requests,
+            "avg_queries": round(self.total_queries / n, 1),
+            "max_queries": self.max_queries,
+            "avg_sql_ms": round(self.total_sql_time / n * 1000, 2),
+            "avg_render_ms": round(self.total_render_time / n * 1000, 2),
+            "avg_total_ms": round(self.total_time / n * 1000, 2),
+            "max_total_ms": round(self.max_time * 1000, 2),
+            "duplicate_queries": [
+                {"fingerprint": fp, "count": count}
+                for fp, count in self.duplicates.most_common(top)
+            ],
+        }
+
+
+class ProfileStore:
+    """Thread-safe rolling store of recent samples and per-view aggregates."""
+
+    def __init__(self, max_samples=500):
+        self._lock = threading.Lock()
+        self.samples = deque(maxlen=max_samples)
+        self.views = {}
+
+    def record(self, sample):
+        with self._lock:
+            self.samples.append(sample)
+            stats = self.views.get(sample["view"])
+            if stats is None:
+                stats = self.views[sample["view"]] = ViewStats(sample["view"])
+            stats.add(sample)
+
+    def report(self, order_by="avg_queries"):
+        with self._lock:
+            rows = [stats.as_dict() for stats in self.views.values()]
+            recent = list(self.samples)[-50:]
+        rows.sort(key=lambda row: row.get(order_by, 0), reverse=True)
+        return {"views": rows, "recent": recent[::-1]}
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.views.clear()
+
+
+store = ProfileStore(max_samples=getattr(settings, "PROFILING_MAX_SAMPLES", 500))
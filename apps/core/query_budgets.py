@@ -0,0 +1,186 @@
+# core/query_budgets.py
+"""
+Per-URL SQL query budgets, checked by `manage.py check_query_budgets`.
+
+Every list, detail and export view below declares how many queries one
+request may run. The checker builds two throwaway institutions of different
+sizes with generate_scale_data (inside a transaction that is rolled back),
+renders every view for both and fails when a view goes over its budget or
+runs more queries on the larger institution than on the smaller one, i.e.
+when its query count depends on the data instead of the page. Failures list
+the repeated SQL fingerprints (see core.profiling), which is where the N+1
+loop is.
+
+Budgets count the whole request: session, user, institution and context
+processor queries included.
+"""
+from dataclasses import dataclass
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.attendance.models import Attendance
+from apps.communications.models import Notice
+from apps.core import benchmarks
+from apps.core.management.commands.generate_scale_data import CODE_PREFIX
+from apps.core.profiling import QueryRecorder
+from apps.examination.models import Exam, ExamResult
+from apps.finance.models import FeeInvoice, Payment
+from apps.library.models import BorrowRecord
+from apps.organization.models import Institution
+from apps.students.models import Student
+
+# Institutions SCALE901.. so the checker never collides with a benchmark dataset
+FIRST_INDEX = 901
+SIZES = {
+    'small': {'students': 10, 'attendance_days': 3, 'books': 10, 'notices': 5, 'exams': 1},
+    'large': {'students': 60, 'attendance_days': 10, 'books': 60, 'notices': 30, 'exams': 3},
+}
+
+
+@dataclass
+class QueryBudget(benchmarks.Scenario):
+    max_queries: int = 0
+    lookup: object = None  # callable(institution) -> object whose pk goes in the URL
+    query: str = ''
+
+    def get_path(self, fixture):
+        kwargs = {}
+        if self.lookup is not None:
+            obj = self.lookup(fixture.institution)
+            if obj is None:
+                raise benchmarks.BenchmarkError(f'{self.name}: no object to render')
+            kwargs['pk'] = obj.pk
+        return reverse(self.path, kwargs=kwargs) + self.query
+
+
+def budget(url_name, max_queries, lookup=None, query='', name=None):
+    return QueryBudget(name=name or url_name, path=url_name, max_queries=max_queries, lookup=lookup, query=query)
+
+
+def _first(model):
+    return lambda institution: model.objects.filter(**_scope(model, institution)).order_by('pk').first()
+
+
+def _scope(model, institution):
+    if model is ExamResult:
+        return {'student__institution': institution}
+    return {'institution': institution}
+
+
+BUDGETS = [
+    # Omnibox
+    budget('core:search', 5, query='?q=a'),
+    budget('core:search_json', 5, query='?q=a'),
+    # Students
+    budget('students:student_list', 10),
+    budget('students:student_detail', 10, _first(Student)),
+    budget('students:student_export', 7, query='?format=csv'),
+    budget('students:student_export', 10, query='?format=csv&profile=1', name='students:student_export_profile'),
+    # Examination
+    budget('examination:exam_list', 12),
+    budget('examination:exam_detail', 21, _first(Exam)),
+    budget('examination:exam_result_list', 10),
+    budget('examination:exam_result_detail', 10, _first(ExamResult)),
+    budget('examination:exam_result_export', 5, query='?format=csv'),
+    # Finance
+    budget('finance:fee_invoice_list', 13),
+    budget('finance:fee_invoice_detail', 13, _first(FeeInvoice)),
+    budget('finance:fee_invoice_export', 5, query='?format=csv'),
+    budget('finance:payment_list', 11),
+    budget('finance:payment_detail', 8, _first(Payment)),
+    budget('finance:payment_export', 5, query='?format=csv'),
+    # Attendance
+    budget('attendance:attendance_list', 8),
+    budget('attendance:attendance_detail', 9, _first(Attendance)),
+    budget('attendance:export_attendance', 5, query='?format=csv'),
+    # Communications
+    budget('communications:notice_list', 12),
+    budget('communications:notice_detail', 8, _first(Notice)),
+    budget('communications:notice_export', 7, query='?format=csv'),
+    # Library
+    budget('library:book_list', 7),
+    budget('library:borrowrecord_list', 6),
+    budget('library:borrowrecord_detail', 12, _first(BorrowRecord)),
+]
+
+
+def get_budgets(names=None):
+    if not names:
+        return list(BUDGETS)
+    selected = [entry for entry in BUDGETS if entry.name in names or entry.name.split(':')[-1] in names]
+    if len(selected) < len(set(names)):
+        raise benchmarks.BenchmarkError(f"Unknown view(s) in {', '.join(names)}")
+    return selected
+
+
+def measure(client, entry, fixture):
+    """Queries of one request (after a warm-up request) as a QueryRecorder."""
+    benchmarks.isolated_request(client, entry, fixture)
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        benchmarks.isolated_request(client, entry, fixture)
+    return recorder
+
+
+def _build_institution(size, index, stdout):
+    options = SIZES[size]
+    call_command(
+        'generate_scale_data',
+        institutions=1,
+        first_index=index,
+        guardians=1,
+        invoices=2,
+        loans=1,
+        stdout=stdout,
+        **options,
+    )
+    return Institution.objects.get(code=f'{CODE_PREFIX}{index:03d}')
+
+
+def check_budgets(entries, stdout=None, on_result=None):
+    """
+    Render every budgeted view at both data sizes. Returns one result dict per
+    view: name, budget, queries per size, duplicates (fingerprint -> count,
+    from the larger run) and failures (empty when within budget).
+    """
+    results = []
+    with override_settings(**benchmarks.client_settings()), transaction.atomic():
+        try:
+            fixtures = {}
+            for offset, size in enumerate(SIZES):
+                institution = _build_institution(size, FIRST_INDEX + offset, stdout)
+                fixture = benchmarks.build_fixture(institution)
+                fixtures[size] = (fixture, benchmarks.make_clients(fixture))
+
+            for entry in entries:
+                result = {'name': entry.name, 'budget': entry.max_queries, 'queries': {},
+                          'duplicates': {}, 'failures': []}
+                try:
+                    recorders = {}
+                    for size, (fixture, clients) in fixtures.items():
+                        recorders[size] = measure(clients[entry.user], entry, fixture)
+                        result['queries'][size] = recorders[size].count
+                except Exception as e:
+                    result['failures'].append(f'{type(e).__name__}: {e}')
+                else:
+                    worst = max(recorders.values(), key=lambda recorder: recorder.count)
+                    result['duplicates'] = worst.duplicates()
+                    small, large = result['queries']['small'], result['queries']['large']
+                    if max(small, large) > entry.max_queries:
+                        result['failures'].append(
+                            f'{max(small, large)} queries, budget is {entry.max_queries}'
+                        )
+                    if large > small:
+                        result['failures'].append(
+                            f'query count grows with the data ({small} -> {large})'
+                        )
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            transaction.set_rollback(True)
+    return results
+
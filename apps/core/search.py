@@ -0,0 +1,466 @@
+# core/search.py
+"""
+Full-text search over registered models.
+
+Each registered model gets one SearchDocument per row (title + body text,
+scoped to an institution), kept current by post_save/post_delete signals.
+Documents are matched with the database's own full-text engine:
+
+    PostgreSQL  tsvector @@ prefix tsquery, ranked by ts_rank_cd, plus pg_trgm
+                similarity on the title so misspelt names still match
+    SQLite      FTS5 MATCH with prefix terms, ranked by bm25
+    others      icontains on the document table (unranked)
+
+Registration (core/signals.py):
+    search.register(Student, title=('first_name', 'last_name'),
+                    body=('admission_number', 'email'))
+
+Querying:
+    hits = search.query(Student, 'ravi kum', institution=institution)
+    queryset = search.filter_queryset(queryset, request.GET['search'], institution)
+    results = search.omnibox(request.user, 'ravi', institution=institution)
+
+Models registered with a url_name show up in the header omnibox (/search/),
+limited to the roles given at registration.
+
+filter_queryset narrows a list view to every match, through a subquery on the
+index, and keeps the view's own ordering. Tokens match as word prefixes
+("kum" finds "Kumar", not "Sukumar"), unlike the icontains filters the list
+views used before. Rows written with bulk_create/update() skip
+the signals: index new rows with search.index_new(objects), or run
+`manage.py rebuild_search_index` after bulk loads.
+"""
+import logging
+import re
+from dataclasses import dataclass
+
+from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from django.db import connection
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+logger = logging.getLogger(__name__)
+
+OMNIBOX_LIMIT = 40
+# Matches ranked per query. Ranking is the expensive part of a broad prefix
+# ("a", "inv") that matches most of the index. Candidates are taken after the
+# model and institution scope; when the scoped matches exceed this many, only
+# that many are ranked and the results are flagged `truncated`.
+SEARCH_CANDIDATES = 5000
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass
+class SearchSpec:
+    model: type
+    title: tuple
+    body: tuple = ()
+    institution: str = 'institution'
+    select_related: tuple = ()
+    url_name: str = None
+    label: str = ''
+    roles: tuple = None
+
+
+class SearchResults(list):
+    """
+    Hits, best first. `truncated` is set when more than SEARCH_CANDIDATES
+    documents matched, so the hits are the best of the first candidates only.
+    """
+
+    def __init__(self, hits=(), truncated=False):
+        super().__init__(hits)
+        self.truncated = truncated
+
+
+@dataclass
+class Hit:
+    model: type
+    pk: object
+    title: str
+    rank: float = 0.0
+
+    @property
+    def spec(self):
+        return get_spec(self.model)
+
+    @property
+    def label(self):
+        return self.spec.label
+
+    @property
+    def url(self):
+        url_name = self.spec.url_name
+        return reverse(url_name, args=[self.pk]) if url_name else None
+
+    def as_dict(self):
+        return {
+            'type': self.model._meta.model_name,
+            'label': self.label,
+            'id': str(self.pk),
+            'title': self.title,
+            'url': self.url,
+        }
+
+
+_registry = {}
+
+
+def register(model, title, body=(), institution='institution', related=None,
+             url_name=None, label=None, roles=None):
+    """
+    Index `model`. title/body are field paths ('user__first_name'); the title
+    ranks higher and is what the omnibox shows. `institution` is the path to
+    the owning institution. `related` maps another model to a callable
+    returning the indexed instances to refresh when one of its rows changes,
+    e.g. {User: lambda user: Staff.objects.filter(user=user)}.
+
+    `url_name` (reversed with the pk) puts the model in the omnibox, for the
+    user roles in `roles` (default: every role allowed to use the omnibox).
+    """
+    select_related = tuple(sorted({
+        path.rsplit(LOOKUP_SEP, 1)[0] for path in (*title, *body, institution or '') if LOOKUP_SEP in path
+    }))
+    spec = SearchSpec(
+        model, tuple(title), tuple(body), institution, select_related,
+        url_name=url_name,
+        label=str(label or model._meta.verbose_name).capitalize(),
+        roles=tuple(roles) if roles is not None else None,
+    )
+    _registry[model] = spec
+
+    uid = f'search_index_{model._meta.label_lower}'
+    post_save.connect(_on_save, sender=model, dispatch_uid=uid)
+    post_delete.connect(_on_delete, sender=model, dispatch_uid=uid)
+    for related_model, get_instances in (related or {}).items():
+        post_save.connect(
+            _related_handler(get_instances), sender=related_model, weak=False,
+            dispatch_uid=f'{uid}_{related_model._meta.label_lower}',
+        )
+    return spec
+
+
+def registered_models():
+    return list(_registry)
+
+
+def get_spec(model):
+    try:
+        return _registry[model._meta.concrete_model]
+    except KeyError:
+        raise LookupError(f'{model._meta.label} is not registered for search')
+
+
+def _resolve(instance, path):
+    value = instance
+    for name in path.split(LOOKUP_SEP):
+        value = getattr(value, name, None)
+        if value is None:
+            return ''
+    return str(value)
+
+
+def _join(instance, paths):
+    return ' '.join(filter(None, (_resolve(instance, path).strip() for path in paths)))
+
+
+def _institution_id(instance, spec):
+    if not spec.institution:
+        return None
+    if LOOKUP_SEP not in spec.institution:
+        return getattr(instance, f'{spec.institution}_id', None)
+    institution = instance
+    for name in spec.institution.split(LOOKUP_SEP):
+        institution = getattr(institution, name, None)
+        if institution is None:
+            return None
+    return institution.pk
+
+
+def document_values(instance, spec=None):
+    spec = spec or get_spec(type(instance))
+    return {
+        'institution_id': _institution_id(instance, spec),
+        'title': _join(instance, spec.title)[:500],
+        'body': _join(instance, spec.body),
+    }
+
+
+def index_instance(instance):
+    from apps.core.models import SearchDocument
+
+    spec = get_spec(type(instance))
+    SearchDocument.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(spec.model),
+        object_id=str(instance.pk),
+        defaults=document_values(instance, spec),
+    )
+
+
+def index_new(instances, batch_size=500):
+    """
+    Documents for rows just written with bulk_create (which skips the
+    signals). The rows must not have documents yet; returns the count.
+    """
+    from apps.core.models import SearchDocument
+
+    documents = []
+    for instance in instances:
+        spec = get_spec(type(instance))
+        documents.append(SearchDocument(
+            content_type=ContentType.objects.get_for_model(spec.model),
+            object_id=str(instance.pk),
+            **document_values(instance, spec),
+        ))
+    SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+    return len(documents)
+
+
+def remove_instance(instance):
+    from apps.core.models import SearchDocument
+
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(type(instance)._meta.concrete_model),
+        object_id=str(instance.pk),
+    ).delete()
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        index_instance(instance)
+    except Exception as e:
+        # Search must never break a save; the next rebuild picks the row up
+        logger.error(f"Search indexing failed for {sender._meta.label} {instance.pk}: {e}")
+
+
+def _on_delete(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+def _related_handler(get_instances):
+    def handler(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        for indexed in get_instances(instance):
+            _on_save(type(indexed), indexed)
+    return handler
+
+
+def rebuild(models=None, institution=None, batch_size=500, stdout=None):
+    """(Re)build documents of `models` (default: all registered). Returns the count."""
+    from apps.core.models import SearchDocument
+
+    total = 0
+    for model in models or registered_models():
+        spec = get_spec(model)
+        content_type = ContentType.objects.get_for_model(spec.model)
+        queryset = spec.model._default_manager.select_related(*spec.select_related).order_by('pk')
+        documents = SearchDocument.objects.filter(content_type=content_type)
+        if institution is not None and spec.institution:
+            queryset = queryset.filter(**{spec.institution: institution})
+            documents = documents.filter(institution=institution)
+        documents.delete()
+
+        batch = []
+        for instance in queryset.iterator(chunk_size=batch_size):
+            batch.append(SearchDocument(content_type=content_type, object_id=str(instance.pk),
+                                        **document_values(instance, spec)))
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            SearchDocument.objects.bulk_create(batch)
+            total += len(batch)
+        if stdout:
+            stdout.write(f'{spec.model._meta.label}: {queryset.count()} document(s)')
+    return total
+
+
+def tokenize(text):
+    return [token.lower() for token in _TOKEN_RE.findall(text or '')][:16]
+
+
+def _db_value(field_name, value):
+    from apps.core.models import SearchDocument
+
+    return SearchDocument._meta.get_field(field_name).get_db_prep_value(value, connection)
+
+
+def _match_sql(content_types, tokens, text, institution_id):
+    """
+    (FROM/WHERE clause over documents `d`, params) for the documents matching
+    every token, scoped to the content types and institution; None where the
+    database has no full-text index.
+    """
+    placeholders = ', '.join(['%s'] * len(content_types))
+    params = [content_type.pk for content_type in content_types]
+    scope = ''
+    if institution_id is not None:
+        scope = ' AND d.institution_id = %s'
+        params.append(_db_value('institution', institution_id))
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        sql = f"""
+            FROM core_search_document d, to_tsquery('simple', %s) q
+            WHERE d.content_type_id IN ({placeholders}){scope}
+              AND (d.search_vector @@ q OR d.title %% %s)
+        """
+        return sql, [tsquery, *params, text]
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        sql = f"""
+            FROM core_search_document_fts
+            -- CROSS JOIN keeps SQLite from probing the FTS index once per document
+            CROSS JOIN core_search_document d ON d.id = core_search_document_fts.rowid
+            WHERE core_search_document_fts MATCH %s
+              AND d.content_type_id IN ({placeholders}){scope}
+        """
+        return sql, [match, *params]
+    return None
+
+
+def _backend_query(content_types, tokens, text, institution_id, limit):
+    """
+    (rows of (content_type_id, object_id, title, rank) best first, truncated).
+    Matches are scoped to the content types and institution before the
+    SEARCH_CANDIDATES cap, so other models or tenants never use up the budget.
+    """
+    match = _match_sql(content_types, tokens, text, institution_id)
+    if match is None:
+        return _fallback_query(content_types, tokens, institution_id, limit), False
+    where, params = match
+    if connection.vendor == 'postgresql':
+        rank, rank_params = 'ts_rank_cd(d.search_vector, q) + similarity(d.title, %s)', [text]
+    else:
+        rank, rank_params = '-bm25(core_search_document_fts, 10.0, 1.0)', []
+    sql = f"""
+        SELECT content_type_id, object_id, title, rank, COUNT(*) OVER () FROM (
+            SELECT d.content_type_id, d.object_id, d.title, {rank} AS rank
+            {where}
+            LIMIT %s
+        ) candidates
+        ORDER BY rank DESC
+        LIMIT %s
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*rank_params, *params, SEARCH_CANDIDATES + 1, limit])
+        rows = cursor.fetchall()
+    truncated = bool(rows) and rows[0][4] > SEARCH_CANDIDATES
+    return [row[:4] for row in rows], truncated
+
+
+def _object_id_sql(model):
+    """d.object_id (str(pk)) in the form `model`'s primary key column stores it."""
+    field = model._meta.pk
+    if field.is_relation:
+        field = field.target_field
+    if connection.vendor == 'postgresql':
+        return f'CAST(d.object_id AS {field.cast_db_type(connection)})'
+    if field.get_internal_type() == 'UUIDField':
+        # Stored as 32 hex digits without dashes outside PostgreSQL
+        return "REPLACE(d.object_id, '-', '')"
+    if field.get_internal_type().endswith(('AutoField', 'IntegerField')):
+        return 'CAST(d.object_id AS INTEGER)'
+    return 'd.object_id'
+
+
+def _fallback_query(content_types, tokens, institution_id, limit):
+    from apps.core.models import SearchDocument
+
+    documents = SearchDocument.objects.filter(content_type__in=content_types)
+    if institution_id is not None:
+        documents = documents.filter(institution_id=institution_id)
+    for token in tokens:
+        documents = documents.filter(Q(title__icontains=token) | Q(body__icontains=token))
+    return [
+        (content_type_id, object_id, title, 0.0)
+        for content_type_id, object_id, title in
+        documents.order_by('title').values_list('content_type_id', 'object_id', 'title')[:limit]
+    ]
+
+
+def query(models, text, institution=None, limit=50):
+    """Best matches for `text` among `models` (a model or a list) as SearchResults of Hits."""
+    tokens = tokenize(text)
+    if not tokens:
+        return SearchResults()
+    if isinstance(models, type):
+        models = [models]
+    content_types = ContentType.objects.get_for_models(*[get_spec(model).model for model in models])
+    by_id = {content_type.pk: model for model, content_type in content_types.items()}
+    institution_id = getattr(institution, 'pk', institution)
+    rows, truncated = _backend_query(list(content_types.values()), tokens, text, institution_id, limit)
+    return SearchResults((
+        Hit(by_id[content_type_id], by_id[content_type_id]._meta.pk.to_python(object_id), title, float(rank or 0))
+        for content_type_id, object_id, title, rank in rows
+    ), truncated)
+
+
+def matching_pks(model, text, institution=None):
+    """
+    Every match for `text` among `model`'s documents as a subquery of primary
+    keys (`pk__in=`, `student__in=`); None when `text` has no tokens. Unlike
+    query() this is neither ranked nor capped.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    model = get_spec(model).model
+    content_type = ContentType.objects.get_for_model(model)
+    institution_id = getattr(institution, 'pk', institution)
+    match = _match_sql([content_type], tokens, text, institution_id)
+    if match is None:
+        return [hit.pk for hit in query(model, text, institution=institution, limit=None)]
+    where, params = match
+    return RawSQL(f'SELECT {_object_id_sql(model)} {where}', params)
+
+
+def filter_queryset(queryset, text, institution=None):
+    """`queryset` narrowed to every match for `text` (order unchanged)."""
+    pks = matching_pks(queryset.model, text, institution)
+    return queryset if pks is None else queryset.filter(pk__in=pks)
+
+
+def search_pks(model, text, institution=None):
+    """Primary keys of every match, for filtering related querysets (student__in=...)."""
+    pks = matching_pks(model, text, institution)
+    return [] if pks is None else pks
+
+
+def omnibox_models(user):
+    """Registered models with a detail page that `user`'s role may open."""
+    role = getattr(user, 'role', None)
+    superadmin = getattr(user, 'is_superadmin', False)
+    return [
+        model for model, spec in _registry.items()
+        if spec.url_name and (superadmin or spec.roles is None or role in spec.roles)
+    ]
+
+
+def omnibox(user, text, institution=None, limit=OMNIBOX_LIMIT, per_type=5):
+    """
+    Best matches across every entity `user` may open, grouped by type in
+    registration order: SearchResults of (label, [Hit, ...]). One index query;
+    each group keeps its `per_type` best hits so one busy type (invoices)
+    does not crowd out the others.
+    """
+    models = omnibox_models(user)
+    if not models:
+        return SearchResults()
+    groups = {model: [] for model in models}
+    hits = query(models, text, institution=institution, limit=limit)
+    for hit in hits:
+        if len(groups[hit.model]) < per_type:
+            groups[hit.model].append(hit)
+    return SearchResults(
+        [(get_spec(model).label, model_hits) for model, model_hits in groups.items() if model_hits],
+        hits.truncated,
+    )
@@ -0,0 +1,79 @@
+# core/sessions.py
+"""
+Cached, database-backed sessions that skip writes which change nothing.
+
+With SESSION_SAVE_EVERY_REQUEST every response re-saves the session to slide
+its expiry, i.e. one UPDATE on django_session per page view and per AJAX call.
+This store (SESSION_ENGINE = 'apps.core.sessions') keeps the sliding cookie
+but only writes to the database when
+
+    - the session data changed (compared by content, so in-place edits of a
+      stored list or dict count even without session.modified), or
+    - the stored expiry is more than SESSION_REFRESH_INTERVAL seconds behind
+      the sliding one.
+
+Reads come from the cache (with the stored expiry alongside the data) and
+fall back to the database, as in Django's cached_db backend. As with cached_db,
+the cache must be shared between workers (Redis in production, see CACHE_URL).
+The stored expiry lags by at most SESSION_REFRESH_INTERVAL, so clearsessions
+may drop an idle session that much earlier than the cookie says.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+KEY_PREFIX = 'core.sessions'
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._stored_digest = None
+        self._stored_expiry = None
+
+    def _digest(self, data):
+        return hashlib.sha1(self.serializer().dumps(data)).hexdigest()
+
+    def _remember(self, data, expiry):
+        self._stored_digest = self._digest(data)
+        self._stored_expiry = expiry
+
+    def load(self):
+        try:
+            cached = self._cache.get(self.cache_key)
+        except Exception:
+            # Invalid cache keys raise on some backends; treat as a miss (#17810)
+            cached = None
+
+        if cached is not None:
+            data, expiry = cached
+        else:
+            session = self._get_session_from_db()
+            if session is None:
+                return {}
+            data, expiry = self.decode(session.session_data), session.expire_date
+            self._cache.set(self.cache_key, (data, expiry), self.get_expiry_age(expiry=expiry))
+        self._remember(data, expiry)
+        return data
+
+    def needs_write(self):
+        """True when the data changed or the stored expiry is too far behind."""
+        if self._stored_expiry is None or self._digest(self._get_session()) != self._stored_digest:
+            return True
+        interval = timedelta(seconds=getattr(settings, 'SESSION_REFRESH_INTERVAL', 15 * 60))
+        return self.get_expiry_date() - self._stored_expiry >= interval
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if not must_create and not self.needs_write():
+            return
+        DBStore.save(self, must_create)
+        expiry = self.get_expiry_date()
+        self._cache.set(self.cache_key, (self._session, expiry), self.get_expiry_age())
+        self._remember(self._session, expiry)
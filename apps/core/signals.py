@@ -1,9 +1,35 @@
 # core/signals.py
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from django.core.cache import cache
 from django.utils import timezone
 from apps.users.models import  User, UserProfile
-from apps.students.models import Student
+from apps.students.models import Student, StudentHostel, StudentMedicalInfo, StudentTransport
+from apps.students.services.facets import STUDENT_FACETS_NAMESPACE
+from apps.academics.models import Class, Section
+from apps.organization.models import Institution
+from apps.communications.models import Notice, PushNotification
+from apps.hr.models import Staff
+from apps.library.models import Book
+from apps.payments.models import PaymentWebhookLog
+from apps.teachers.models import Teacher
+from apps.finance.models import FeeInvoice, FeeStructure, Payment
+from apps.core import audit, search
+from apps.communications.summary import NOTIFICATION_SUMMARY_NAMESPACE
+from apps.core.cache import invalidate_on_change
+from apps.core.middleware import TENANT_NAMESPACE
+from apps.core.mixins import (
+    DirectorRequiredMixin,
+    FinanceAccessRequiredMixin,
+    LibraryManagerRequiredMixin,
+    StaffManagementRequiredMixin,
+    StudentManagementRequiredMixin,
+)
+from apps.core.branding import (
+    BRANDING_NAMESPACE,
+    DEFAULT_BRANDING_NAMESPACE,
+    user_institution_key,
+)
 import uuid
 
 @receiver(pre_save, sender=Student)
@@ -45,3 +71,94 @@ def create_user_profile_for_student(sender, instance, created, **kwargs):
                 "institution": instance.institution
             }
         )
+
+
+# ---------------------------------------------------------------------------
+# Cache invalidation
+# ---------------------------------------------------------------------------
+invalidate_on_change(Institution, BRANDING_NAMESPACE, institution_attr="pk")
+invalidate_on_change(Institution, DEFAULT_BRANDING_NAMESPACE, institution_attr=lambda instance: None)
+invalidate_on_change(Institution, TENANT_NAMESPACE, institution_attr=lambda instance: None)
+invalidate_on_change(PushNotification, NOTIFICATION_SUMMARY_NAMESPACE)
+invalidate_on_change(Student, STUDENT_FACETS_NAMESPACE)
+invalidate_on_change(Class, STUDENT_FACETS_NAMESPACE)
+invalidate_on_change(Section, STUDENT_FACETS_NAMESPACE)
+invalidate_on_change(StudentHostel, STUDENT_FACETS_NAMESPACE, institution_attr=lambda instance: instance.student.institution_id)
+invalidate_on_change(StudentTransport, STUDENT_FACETS_NAMESPACE, institution_attr=lambda instance: instance.student.institution_id)
+invalidate_on_change(StudentMedicalInfo, STUDENT_FACETS_NAMESPACE, institution_attr=lambda instance: instance.student.institution_id)
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+@receiver([post_save, post_delete], sender=Student)
+def forget_user_institution(sender, instance, **kwargs):
+    """Drop the cached user -> institution mapping when the link changes."""
+    if instance.user_id:
+        cache.delete(user_institution_key(instance.user_id))
+
+
+# ---------------------------------------------------------------------------
+# Full-text search documents
+# ---------------------------------------------------------------------------
+search.register(
+    Student,
+    title=('first_name', 'last_name'),
+    body=('admission_number', 'roll_number', 'email', 'mobile'),
+    url_name='students:student_detail',
+    roles=StudentManagementRequiredMixin.allowed_roles,
+)
+search.register(
+    Teacher,
+    title=('first_name', 'last_name'),
+    body=('employee_id', 'email', 'mobile', 'specialization'),
+    url_name='teacher_detail',
+    roles=DirectorRequiredMixin.allowed_roles,
+)
+search.register(
+    Staff,
+    title=('user__first_name', 'user__last_name'),
+    body=('employee_id', 'user__email', 'department__name', 'designation__name'),
+    related={User: lambda user: Staff.objects.filter(user=user).select_related('user', 'department', 'designation')},
+    url_name='hr:staff_detail',
+    roles=StaffManagementRequiredMixin.allowed_roles,
+)
+search.register(
+    Book,
+    title=('title',),
+    body=('author__name', 'isbn', 'publisher', 'category__name', 'description'),
+    url_name='library:book_detail',
+    roles=LibraryManagerRequiredMixin.allowed_roles,
+)
+search.register(
+    FeeInvoice,
+    title=('invoice_number',),
+    body=('student__first_name', 'student__last_name', 'student__admission_number', 'status'),
+    related={Student: lambda student: FeeInvoice.objects.filter(student=student).select_related('student')},
+    url_name='finance:fee_invoice_detail',
+    label='Invoice',
+    roles=FinanceAccessRequiredMixin.allowed_roles,
+)
+search.register(
+    Payment,
+    title=('payment_number',),
+    body=('reference_number', 'student__first_name', 'student__last_name',
+          'student__admission_number', 'invoice__invoice_number'),
+    related={Student: lambda student: Payment.objects.filter(student=student).select_related('student', 'invoice')},
+    url_name='finance:payment_detail',
+    roles=FinanceAccessRequiredMixin.allowed_roles,
+)
+search.register(Notice, title=('title',), body=('content',), url_name='communications:notice_detail')
+search.register(PaymentWebhookLog, title=('event_type',), body=('webhook_id', 'processing_notes'))
+
+
+# ---------------------------------------------------------------------------
+# Audit trail
+# ---------------------------------------------------------------------------
+audit.register(Institution, institution='pk')
+audit.register(User, exclude=('password', 'last_login'), institution=None)
+audit.register(Student)
+audit.register(Teacher)
+audit.register(Staff)
+audit.register(FeeStructure)
+audit.register(FeeInvoice)
+audit.register(Payment)
+audit.register(Notice)
@@ -0,0 +1,125 @@
+# core/startup.py
+"""
+Boot cost of a fresh worker, measured by `manage.py benchmark_startup`.
+
+Every run spawns a new interpreter (`python -m apps.core.startup`) that does
+what a gunicorn/celery worker does before its first request: django.setup()
+and loading the URLconf, which imports every views module. The child reports
+wall time of both phases, its peak RSS and which of HEAVY_MODULES got
+imported along the way; those should only be loaded on demand through
+utils.lazy.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+BASELINE_VERSION = 1
+
+# Libraries that only exports, PDFs, ID cards and payments need
+HEAVY_MODULES = (
+    'xhtml2pdf',
+    'reportlab',
+    'xlsxwriter',
+    'qrcode',
+    'PIL',
+    'razorpay',
+    'pandas',
+)
+
+
+class StartupError(Exception):
+    pass
+
+
+def probe():
+    """Boot Django in this process and return the measurements (child side)."""
+    import resource
+
+    start = time.perf_counter()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+    setup_done = time.perf_counter()
+
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    urls_done = time.perf_counter()
+
+    return {
+        'setup_ms': (setup_done - start) * 1000,
+        'urlconf_ms': (urls_done - setup_done) * 1000,
+        'total_ms': (urls_done - start) * 1000,
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == 'darwin' else 1),
+        'modules': len(sys.modules),
+        'heavy_modules': sorted(name for name in HEAVY_MODULES if name in sys.modules),
+    }
+
+
+def run_once(timeout=120):
+    completed = subprocess.run(
+        [sys.executable, '-m', 'apps.core.startup'],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')},
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if completed.returncode != 0:
+        raise StartupError(f'Worker boot failed:\n{completed.stderr.strip()}')
+    # Settings or app imports may print; the measurements are the last line
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(runs=5, on_run=None):
+    """Boot `runs` fresh interpreters; return the medians and the heavy modules seen."""
+    samples = []
+    for index in range(runs):
+        sample = run_once()
+        samples.append(sample)
+        if on_run:
+            on_run(index, sample)
+
+    heavy = sorted({name for sample in samples for name in sample['heavy_modules']})
+    return {
+        'version': BASELINE_VERSION,
+        'meta': {'python': sys.version.split()[0], 'platform': sys.platform, 'runs': runs},
+        'setup_ms': round(statistics.median(s['setup_ms'] for s in samples), 1),
+        'urlconf_ms': round(statistics.median(s['urlconf_ms'] for s in samples), 1),
+        'total_ms': round(statistics.median(s['total_ms'] for s in samples), 1),
+        'rss_kb': int(statistics.median(s['rss_kb'] for s in samples)),
+        'modules': max(s['modules'] for s in samples),
+        'heavy_modules': heavy,
+    }
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as handle:
+        baseline = json.load(handle)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise StartupError(f'{path} is not a version {BASELINE_VERSION} startup baseline')
+    return baseline
+
+
+def compare(results, baseline, time_tolerance=0.25, min_delta_ms=50.0, rss_tolerance=0.15):
+    """List of (metric, before, after) that got worse than the tolerances allow."""
+    regressions = []
+    before, after = baseline['total_ms'], results['total_ms']
+    if after - before > min_delta_ms and after > before * (1 + time_tolerance):
+        regressions.append(('total_ms', before, after))
+    before, after = baseline['rss_kb'], results['rss_kb']
+    if after > before * (1 + rss_tolerance):
+        regressions.append(('rss_kb', before, after))
+    added = sorted(set(results['heavy_modules']) - set(baseline['heavy_modules']))
+    if added:
+        regressions.append(('heavy_modules', baseline['heavy_modules'], results['heavy_modules']))
+    return regressions
+
+
+if __name__ == '__main__':
+    print(json.dumps(probe()))
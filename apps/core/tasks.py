@@ -0,0 +1,10 @@
+# core/tasks.py
+from celery import shared_task
+
+from .audit import write_events
+
+
+@shared_task(ignore_result=True)
+def write_audit_events(events):
+    """Insert one batch of audit events (AUDIT_LOG_BACKEND = 'celery', see core.audit)."""
+    write_events(events)
@@ -1,3 +1,69 @@
-from django.test import TestCase
+# core/tests.py
+import datetime
 
-# Create your tests here.
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.communications.models import Notice
+from apps.organization.models import Institution
+from apps.users.models import User
+
+from .audit import _client_ip
+from .pagination import KeysetPaginator
+
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        institution = Institution.objects.create(
+            name='Paging Test School', slug='paging-test', code='PAGETEST', address='1 Test Road',
+            contact_email='office@paging.test', contact_phone='000', fiscal_year_start=datetime.date(2025, 4, 1),
+        )
+        user, _ = User.objects.create_user(
+            email='admin@paging.test', password='x', first_name='Paging', last_name='Admin',
+        )
+        notices = Notice.objects.bulk_create([
+            Notice(institution=institution, title=f'Notice {n}', content='Body', created_by=user)
+            for n in range(10)
+        ])
+        # Ten rows inside one millisecond: only the microseconds tell them apart
+        start = timezone.now().replace(microsecond=123000)
+        for n, notice in enumerate(notices):
+            Notice.objects.filter(pk=notice.pk).update(created_at=start + datetime.timedelta(microseconds=n * 10))
+        cls.expected = list(Notice.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def paginator(self):
+        return KeysetPaginator(Notice.objects.all(), 3, ordering=('-created_at',), count_mode=None)
+
+    def test_next_cursors_visit_rows_in_the_same_millisecond(self):
+        paginator = self.paginator()
+        page = paginator.page()
+        pages = [page]
+        while page.has_next():
+            page = paginator.page(page.next_cursor)
+            pages.append(page)
+
+        self.assertEqual([notice.pk for page in pages for notice in page], self.expected)
+
+        # And back again, page by page, without repeating the boundary rows
+        back = [pages[-1]]
+        while back[-1].has_previous():
+            back.append(paginator.page(back[-1].previous_cursor))
+        self.assertEqual(
+            [[notice.pk for notice in page] for page in reversed(back)],
+            [[notice.pk for notice in page] for page in pages],
+        )
+
+
+class AuditClientIPTests(SimpleTestCase):
+
+    def request(self):
+        return RequestFactory().get('/', HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.9', REMOTE_ADDR='10.0.0.2')
+
+    def test_forwarded_header_ignored_without_trusted_proxies(self):
+        self.assertEqual(_client_ip(self.request()), '10.0.0.2')
+
+    @override_settings(AUDIT_TRUSTED_PROXIES=1)
+    def test_entry_appended_by_the_trusted_proxy(self):
+        self.assertEqual(_client_ip(self.request()), '203.0.113.9')
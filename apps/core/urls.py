@@ -5,4 +5,9 @@ app_name = "core"
 
 urlpatterns = [
     path('', views.DashboardView.as_view(), name='dashboard'),
+    path('search/', views.OmniboxSearchView.as_view(), name='search'),
+    path('search/json/', views.OmniboxSearchJSONView.as_view(), name='search_json'),
+    path('metrics', views.MetricsView.as_view(), name='metrics'),
+    path('profiling/', views.ProfilingReportView.as_view(), name='profiling_report'),
+    path('profiling/json/', views.ProfilingReportJSONView.as_view(), name='profiling_report_json'),
 ]
\ No newline at end of file
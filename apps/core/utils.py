@@ -2,23 +2,62 @@
 
 from django.contrib import messages
 
+# Attribute used to memoize the resolved institution on a user instance, so
+# every caller within a request shares one lookup.
+INSTITUTION_CACHE_ATTR = '_cached_institution'
+
+
+def resolve_user_institution(user):
+    """
+    Load the user's institution with a single joined query.
+    The fetched profile is cached on the user so `user.profile` is free too.
+    """
+    if not getattr(user, 'is_authenticated', False):
+        return None
+
+    from apps.users.models import User, UserProfile
+    from apps.students.models import Student
+
+    profile = (
+        UserProfile.objects.select_related('institution')
+        .filter(user_id=user.pk)
+        .first()
+    )
+    if profile is not None:
+        profile.user = user
+        User.profile.related.set_cached_value(user, profile)
+        if profile.institution_id:
+            return profile.institution
+
+    student = (
+        Student.objects.select_related('institution')
+        .filter(user_id=user.pk)
+        .first()
+    )
+    if student is not None:
+        return student.institution
+    return None
+
 
 def get_user_institution(user, request=None):
     """
     Get institution from user profile or student profile.
     If request is provided, add an error message when not found.
+
+    The result is memoized on the user instance (and on request.institution
+    when InstitutionMiddleware is active), so repeated calls are free.
     """
-    # Check user profile
-    if hasattr(user, 'profile') and getattr(user.profile, 'institution', None):
-        return user.profile.institution
+    if request is not None and getattr(request, 'institution', None) is not None:
+        return request.institution
 
-    # Check student profile
-    student_profile = getattr(user, 'student_profile', None)
-    if student_profile and getattr(student_profile, 'institution', None):
-        return student_profile.institution
+    institution = getattr(user, INSTITUTION_CACHE_ATTR, None)
+    if institution is None and not hasattr(user, INSTITUTION_CACHE_ATTR):
+        institution = resolve_user_institution(user)
+        if user is not None:
+            setattr(user, INSTITUTION_CACHE_ATTR, institution)
 
     # Optionally show error if request is provided
-    if request:
+    if institution is None and request:
         messages.error(request, "Your account is not linked to a school/institution.")
 
-    return None
\ No newline at end of file
+    return institution
@@ -1,11 +1,21 @@
-from django.shortcuts import render
+import hmac
+
+from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.generic import TemplateView
 from django.views.generic import View
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from .permissions import RoleBasedPermissionMixin
+from .mixins import RoleRequiredMixin, InstitutionMixin
+from . import metrics
+from . import profiling
+from . import search
+from utils import pdf
 from apps.academics.models import AcademicYear
+from apps.users.models import User
 
 
 class DashboardView(TemplateView):
@@ -18,6 +28,93 @@ class DashboardView(TemplateView):
 
 
 
+class ProfilingReportView(RoleRequiredMixin, TemplateView):
+    """Superadmin report of per-view query counts, SQL time and N+1 suspects."""
+    template_name = 'core/profiling_report.html'
+    allowed_roles = [User.Role.SUPERADMIN]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        order_by = self.request.GET.get('order_by', 'avg_queries')
+        context['report'] = profiling.store.report(order_by=order_by)
+        context['pdf_renders'] = pdf.stats.report()
+        context['order_by'] = order_by
+        return context
+
+    def post(self, request, *args, **kwargs):
+        profiling.store.reset()
+        pdf.stats.reset()
+        return redirect('core:profiling_report')
+
+
+class ProfilingReportJSONView(RoleRequiredMixin, View):
+    allowed_roles = [User.Role.SUPERADMIN]
+
+    def get(self, request, *args, **kwargs):
+        order_by = request.GET.get('order_by', 'avg_queries')
+        report = profiling.store.report(order_by=order_by)
+        report['pdf_renders'] = pdf.stats.report()
+        return JsonResponse(report)
+
+
+OMNIBOX_ROLES = [role for role in User.Role if role not in (User.Role.STUDENT, User.Role.PARENT)]
+
+
+class OmniboxMixin(RoleRequiredMixin, InstitutionMixin):
+    """Typed search across every entity the user may open (core/search.py)."""
+    allowed_roles = OMNIBOX_ROLES
+    limit = 100
+    per_type = 20
+
+    def get_results(self):
+        text = self.request.GET.get('q', '').strip()
+        return text, search.omnibox(
+            self.request.user, text, institution=self.get_institution_id(),
+            limit=self.limit, per_type=self.per_type,
+        )
+
+
+class OmniboxSearchView(OmniboxMixin, TemplateView):
+    template_name = 'core/search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['q'], context['groups'] = self.get_results()
+        context['truncated'] = context['groups'].truncated
+        context['search_candidates'] = search.SEARCH_CANDIDATES
+        return context
+
+
+class OmniboxSearchJSONView(OmniboxMixin, View):
+    """Suggestions for the header search widget."""
+    limit = search.OMNIBOX_LIMIT
+    per_type = 4
+
+    def get(self, request, *args, **kwargs):
+        text, groups = self.get_results()
+        return JsonResponse({
+            'q': text,
+            'truncated': groups.truncated,
+            'groups': [{'label': label, 'results': [hit.as_dict() for hit in hits]} for label, hits in groups],
+        })
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint: superadmin session or the METRICS_TOKEN bearer token."""
+
+    def has_access(self, request):
+        token = getattr(settings, 'METRICS_TOKEN', '')
+        header = request.headers.get('Authorization', '')
+        if token and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+            return True
+        return getattr(request.user, 'is_superadmin', False)
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_access(request):
+            return HttpResponseForbidden('Metrics access required')
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def handler404(request, exception):
     return render(request, 'errors/404.html', status=404)
 
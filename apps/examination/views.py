@@ -1,5 +1,5 @@
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from django.contrib import messages
 from datetime import datetime, timedelta
@@ -13,11 +13,16 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView, D
 from django.utils.translation import gettext_lazy as _
 from apps.core.mixins import TeacherRequiredMixin
 from apps.core.utils import get_user_institution
+from apps.core.exports import Column, QuerysetExport
+from apps.core.pagination import KeysetPaginationMixin
+from apps.core import search as search_index
+from apps.reports.jobs import export_response
 from utils.utils import render_to_pdf, export_pdf_response
 
 
 
 from .models import ExamType, Exam, ExamSubject, ExamResult
+from apps.students.models import Student
 from .forms import ExamTypeForm, ExamForm, ExamSubjectForm, ExamResultForm
 
 
@@ -27,6 +32,8 @@ from django.utils import timezone
 
 import json
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class ExamDashboardView(TeacherRequiredMixin,TemplateView):
     """
     Class-based view to render the main examination dashboard with stats and charts.
@@ -523,7 +530,7 @@ class ExamSubjectDeleteView( TeacherRequiredMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
-class ExamResultListView( TeacherRequiredMixin, ListView):
+class ExamResultListView(KeysetPaginationMixin, TeacherRequiredMixin, ListView):
     model = ExamResult
     template_name = 'examination/result/examresult_list.html'
     context_object_name = 'results'
@@ -557,10 +564,9 @@ class ExamResultListView( TeacherRequiredMixin, ListView):
         if max_marks:
             queryset = queryset.filter(marks_obtained__lte=max_marks)
         if search_query:
+            # Students through the search index; subjects are a short list
             queryset = queryset.filter(
-                Q(student__user__first_name__icontains=search_query) |
-                Q(student__user__last_name__icontains=search_query) |
-                Q(student__admission_number__icontains=search_query) |
+                Q(student__in=search_index.search_pks(Student, search_query, institution)) |
                 Q(exam_subject__subject__name__icontains=search_query)
             )
 
@@ -655,33 +661,65 @@ class ExamResultDeleteView( TeacherRequiredMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
+class ExamExport(QuerysetExport):
+    sheet_name = 'Exams'
+    total_label = 'Total Exams:'
+    count_by = 'Status'
+    columns = [
+        Column('Exam Name', 'name', width=25),
+        Column('Code', 'exam_type.code'),
+        Column('Exam Type', 'exam_type.name', width=20),
+        Column('Academic Year', 'academic_year.name'),
+        Column('Start Date', 'start_date', width=12, default='N/A'),
+        Column('End Date', 'end_date', width=12, default='N/A'),
+        Column('Status', 'get_status_display'),
+        Column('Total Subjects', 'total_subjects'),
+        Column('Description', 'exam_type.description', width=30),
+        Column('Created At', 'created_at', width=18),
+    ]
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        queryset = (
+            Exam.objects.filter(institution=organization)
+            .select_related('institution', 'exam_type', 'academic_year')
+            .annotate(total_subjects=Count('subjects'))
+        )
+
+        exam_type = filters.get('exam_type')
+        academic_year = filters.get('academic_year')
+        status = filters.get('status')
+        if exam_type:
+            queryset = queryset.filter(exam_type_id=exam_type)
+        if academic_year:
+            queryset = queryset.filter(academic_year_id=academic_year)
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+
 class ExamExportView( TeacherRequiredMixin, ListView):
     model = Exam
     context_object_name = 'exams'
     
     def get_queryset(self):
-        institution = get_user_institution(self.request.user)
-        return Exam.objects.filter(institution=institution).select_related('institution', 'exam_type', 'academic_year')
+        # Filters applied from request
+        return ExamExport.filter_queryset(self.request.GET, get_user_institution(self.request.user))
     
     def get(self, request, *args, **kwargs):
         format_type = request.GET.get('format', 'csv').lower()
-        exam_type = request.GET.get('exam_type')
-        academic_year = request.GET.get('academic_year')
-        status = request.GET.get('status')
-        
         queryset = self.get_queryset()
         
-        # Apply filters
-        if exam_type:
-            queryset = queryset.filter(exam_type_id=exam_type)
-        if academic_year:
-            queryset = queryset.filter(academic_year_id=academic_year)
-        if status:
-            queryset = queryset.filter(status=status)
-        
         # Build filename
         filename = f"exams_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
+        organization = get_user_institution(request.user)
+
+        # CSV / Excel stream from the queryset (large exports run in the background)
+        if format_type in ('csv', 'excel'):
+            return export_response(request, ExamExport(queryset, filename, organization), format_type, 'Exams export')
+        if format_type != 'pdf':
+            return HttpResponse("Invalid format specified", status=400)
+
         # Build data rows
         rows = []
         for exam in queryset:
@@ -693,154 +731,12 @@ class ExamExportView( TeacherRequiredMixin, ListView):
                 "start_date": exam.start_date.strftime('%Y-%m-%d') if exam.start_date else 'N/A',
                 "end_date": exam.end_date.strftime('%Y-%m-%d') if exam.end_date else 'N/A',
                 "status": exam.get_status_display,
-                "total_subjects": exam.subjects.count(),
+                "total_subjects": exam.total_subjects,
                 "description": exam.exam_type.description,
                 "created_at": exam.created_at.strftime('%Y-%m-%d %H:%M'),
             })
 
-        organization = get_user_institution(request.user)
-        
-        if format_type == 'csv':
-            return self.export_csv(rows, filename, organization)
-        elif format_type == 'excel':
-            return self.export_excel(rows, filename, organization)
-        elif format_type == 'pdf':
-            return self.export_pdf(rows, filename, organization, queryset.count())
-        else:
-            return HttpResponse("Invalid format specified", status=400)
-    
-    def export_csv(self, rows, filename, organization):
-        """Export data to CSV format"""
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        
-        # Write header
-        writer.writerow([
-            'Exam Name', 'Code', 'Exam Type', 'Academic Year', 'Start Date',
-            'End Date', 'Status', 'Total Subjects', 'Description', 'Created At'
-        ])
-        
-        # Write data rows
-        for row in rows:
-            writer.writerow([
-                row['name'],
-                row['code'],
-                row['exam_type'],
-                row['academic_year'],
-                row['start_date'],
-                row['end_date'],
-                row['status'],
-                row['total_subjects'],
-                row['description'],
-                row['created_at'],
-            ])
-        
-        # Add summary
-        writer.writerow([])
-        writer.writerow(['Total Exams:', len(rows)])
-        
-        # Calculate statistics
-        status_counts = {}
-        for row in rows:
-            status = row['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        for status, count in status_counts.items():
-            writer.writerow([f'{status} Count:', count])
-        
-        writer.writerow(['Organization:', organization.name if organization else 'N/A'])
-        writer.writerow(['Export Date:', timezone.now().strftime("%Y-%m-%d %H:%M")])
-        
-        response = HttpResponse(buffer.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
-        return response
-    
-    def export_excel(self, rows, filename, organization):
-        """Export data to Excel format"""
-        buffer = BytesIO()
-        
-        with xlsxwriter.Workbook(buffer) as workbook:
-            worksheet = workbook.add_worksheet('Exams')
-            
-            # Add formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#3b5998',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center',
-                'valign': 'vcenter',
-                'text_wrap': True
-            })
-            
-            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
-            datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'})
-            center_format = workbook.add_format({'align': 'center'})
-            
-            # Write headers
-            headers = [
-                'Exam Name', 'Code', 'Exam Type', 'Academic Year', 'Start Date',
-                'End Date', 'Status', 'Total Subjects', 'Description', 'Created At'
-            ]
-            
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-            
-            # Write data
-            for row_idx, row_data in enumerate(rows, start=1):
-                worksheet.write(row_idx, 0, row_data['name'])
-                worksheet.write(row_idx, 1, row_data['code'])
-                worksheet.write(row_idx, 2, row_data['exam_type'])
-                worksheet.write(row_idx, 3, row_data['academic_year'])
-                worksheet.write(row_idx, 4, row_data['start_date'], date_format)
-                worksheet.write(row_idx, 5, row_data['end_date'], date_format)
-                worksheet.write(row_idx, 6, row_data['status'], center_format)
-                worksheet.write(row_idx, 7, row_data['total_subjects'], center_format)
-                worksheet.write(row_idx, 8, row_data['description'])
-                worksheet.write(row_idx, 9, row_data['created_at'], datetime_format)
-            
-            # Adjust column widths
-            worksheet.set_column('A:A', 25)  # Exam Name
-            worksheet.set_column('B:B', 15)  # Code
-            worksheet.set_column('C:C', 20)  # Exam Type
-            worksheet.set_column('D:D', 15)  # Academic Year
-            worksheet.set_column('E:F', 12)  # Dates
-            worksheet.set_column('G:G', 15)  # Status
-            worksheet.set_column('H:H', 15)  # Total Subjects
-            worksheet.set_column('I:I', 30)  # Description
-            worksheet.set_column('J:J', 18)  # Created At
-            
-            # Add summary
-            summary_row = len(rows) + 2
-            worksheet.write(summary_row, 0, 'Total Exams:')
-            worksheet.write(summary_row, 1, len(rows))
-            
-            # Calculate status counts
-            status_counts = {}
-            for row in rows:
-                status = row['status']
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            for status, count in status_counts.items():
-                summary_row += 1
-                worksheet.write(summary_row, 0, f'{status} Count:')
-                worksheet.write(summary_row, 1, count)
-            
-            summary_row += 2
-            worksheet.write(summary_row, 0, 'Organization:')
-            worksheet.write(summary_row, 1, organization.name if organization else 'N/A')
-            
-            summary_row += 1
-            worksheet.write(summary_row, 0, 'Export Date:')
-            worksheet.write(summary_row, 1, timezone.now().strftime("%Y-%m-%d %H:%M"))
-        
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
-        return response
+        return self.export_pdf(rows, filename, organization, len(rows))
     
     def export_pdf(self, rows, filename, organization, total_count):
         """Export data to PDF format"""
@@ -1066,6 +962,7 @@ class ExamResultExportView( TeacherRequiredMixin, ListView):
         ).select_related(
             'exam_subject',
             'exam_subject__exam',
+            'exam_subject__exam__academic_year',
             'exam_subject__subject',
             'student',
             'student__user'
@@ -1097,7 +994,7 @@ class ExamResultExportView( TeacherRequiredMixin, ListView):
             rows.append({
                 "student_name": result.student.full_name,
                 "admission_number": result.student.admission_number,
-        
+                "exam_name": result.exam_subject.exam.name,
                 "academic_year": result.exam_subject.exam.academic_year.name,
                 "duration": result.exam_subject.exam.duration,
                 "status": result.exam_subject.exam.get_status_display,
@@ -92,6 +92,7 @@ class PaymentExportView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin, Vi
     """
     Export Payment data with filters and totals calculation
     """
+    model = Payment
     permission_required = 'finance.view_payment'
 
     def get(self, request, *args, **kwargs):
@@ -313,6 +314,7 @@ class FeeInvoiceExportView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin,
     - start_date, end_date: Filter by date range
     - Only for invoices in the user's institution
     """
+    model = FeeInvoice
     permission_required = 'finance.view_feeinvoice'
 
     def get(self, request, *args, **kwargs):
@@ -491,6 +493,7 @@ class FeeInvoiceDetailExportView(FinanceAccessRequiredMixin, RoleBasedPermission
     """
     Export Invoice detail view with modern template
     """
+    model = FeeInvoice
     permission_required = 'finance.view_feeinvoice'
 
     def get(self, request, pk, *args, **kwargs):
@@ -584,6 +587,7 @@ class FeeStructureExportView(FinanceAccessRequiredMixin,RoleBasedPermissionMixin
     - is_active: Filter by active status
     - Only for fee structures in the user's institution
     """
+    model = FeeStructure
 
     def get(self, request, *args, **kwargs):
         fmt = request.GET.get("format", "csv").lower()
@@ -4,13 +4,14 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib import messages
 from django.db.models import Sum, Q, Count
+from django.db import transaction
 from django.http import HttpResponse, JsonResponse
 from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
-from xhtml2pdf import pisa
+from utils.lazy import lazy_import
 import csv
 import json
 from django.utils.translation import gettext_lazy as _
@@ -27,6 +28,8 @@ from django.contrib.auth.decorators import login_required
 import uuid
 from .export import FeeInvoiceExportView,FeeInvoiceDetailExportView
 
+pisa = lazy_import('xhtml2pdf.pisa')
+
 
 fee_invoice_list_export = FeeInvoiceExportView.as_view()
 fee_invoice_detail_export = FeeInvoiceDetailExportView.as_view()
@@ -146,6 +149,7 @@ def get_students_by_class(request):
 
 
 class FeeInvoiceCreateView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin, TemplateView):
+    model = FeeInvoice
     template_name = 'finance/invoices/fee_invoice_form.html'
     permission_required = 'finance.add_feeinvoice'
 
@@ -189,7 +193,15 @@ class FeeInvoiceCreateView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin,
                 id__in=student_ids,
                 institution=institution,
                 status='ACTIVE'
-            )
+            ).select_related('current_class')
+            existing_invoices = {
+                invoice.student_id: invoice.invoice_number
+                for invoice in FeeInvoice.objects.filter(
+                    institution=institution,
+                    student__in=students,
+                    academic_year=academic_year
+                ).only('student_id', 'invoice_number')
+            }
 
             results = {
                 'created': [],
@@ -197,10 +209,11 @@ class FeeInvoiceCreateView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin,
                 'wrong_class': [],
                 'inactive': []
             }
+            invoices = []
 
             for student in students:
                 # Check if student is in the correct class
-                if student.current_class != fee_structure.class_name:
+                if student.current_class_id != fee_structure.class_name_id:
                     results['wrong_class'].append(
                         f"{student.full_name} (Current class: {student.current_class.name})"
                     )
@@ -212,19 +225,12 @@ class FeeInvoiceCreateView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin,
                     continue
 
                 # Check if invoice already exists
-                existing_invoice = FeeInvoice.objects.filter(
-                    institution=institution,
-                    student=student,
-                    academic_year=academic_year
-                ).first()
-
-                if existing_invoice:
+                if student.id in existing_invoices:
                     results['exists'].append(
-                        f"{student.full_name} (Invoice: {existing_invoice.invoice_number})"
+                        f"{student.full_name} (Invoice: {existing_invoices[student.id]})"
                     )
                 else:
-                    # Create new invoice
-                    invoice = FeeInvoice.objects.create(
+                    invoices.append(FeeInvoice(
                         institution=institution,
                         student=student,
                         academic_year=academic_year,
@@ -232,9 +238,16 @@ class FeeInvoiceCreateView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin,
                         issue_date=timezone.now().date(),
                         due_date=timezone.now().date() + timezone.timedelta(days=30),
                         status='issued'
-                    )
+                    ))
+
+            # One block of invoice numbers for the whole run, then save each
+            # invoice so the usual signals (search index, audit log) fire
+            FeeInvoice.INVOICE_NUMBER.assign(invoices)
+            with transaction.atomic():
+                for invoice in invoices:
+                    invoice.save()
                     results['created'].append(
-                        f"{student.full_name} (Invoice: {invoice.invoice_number})"
+                        f"{invoice.student.full_name} (Invoice: {invoice.invoice_number})"
                     )
 
             # Generate appropriate messages
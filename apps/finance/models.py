@@ -6,6 +6,8 @@ from decimal import Decimal
 from django.utils import timezone
 from django.db.models import Sum
 
+from apps.core.sequences import NumberFormat
+
 
 class FeeStructure(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -34,6 +36,10 @@ class FeeInvoice(models.Model):
         ('partial', 'Partially Paid'),
         ('cancelled', 'Cancelled'),
     )
+    # INV-<institution code>-<year>-<month>-0001, per-institution sequence (core.sequences)
+    INVOICE_NUMBER = NumberFormat(
+        'invoice_number', lambda invoice: f"INV-{invoice.institution.code}-{timezone.now():%Y-%m}-"
+    )
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     invoice_number = models.CharField(max_length=50, unique=True, blank=True)
@@ -60,20 +66,7 @@ class FeeInvoice(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.invoice_number:
-            year = timezone.now().year
-            month = timezone.now().month
-            last_invoice = FeeInvoice.objects.filter(
-                institution=self.institution,
-                invoice_number__startswith=f"INV-{year}-{month:02d}-"
-            ).order_by('-invoice_number').first()
-
-            if last_invoice:
-                last_num = int(last_invoice.invoice_number.split('-')[-1])
-                new_num = last_num + 1
-            else:
-                new_num = 1
-
-            self.invoice_number = f"INV-{year}-{month:02d}-{new_num:04d}"
+            self.INVOICE_NUMBER.assign([self])
 
         # Auto update status
         if self.paid_amount >= self.total_amount:
@@ -117,6 +110,10 @@ class Payment(models.Model):
         ("cancelled", _("Cancelled")),
         ("completed", _("Completed")),
     )
+    # PAY-<institution code>-<year>-<month>-0001, per-institution sequence (core.sequences)
+    PAYMENT_NUMBER = NumberFormat(
+        "payment_number", lambda payment: f"PAY-{payment.institution.code}-{timezone.now():%Y-%m}-"
+    )
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(
@@ -158,15 +155,7 @@ class Payment(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.payment_number:
-            year = timezone.now().year
-            month = timezone.now().month
-            prefix = f"PAY-{year}-{month:02d}-"
-            last_payment = Payment.objects.filter(payment_number__startswith=prefix).order_by("payment_number").last()
-            if last_payment:
-                last_number = int(last_payment.payment_number.split("-")[-1])
-                self.payment_number = f"{prefix}{last_number + 1:04d}"
-            else:
-                self.payment_number = f"{prefix}0001"
+            self.PAYMENT_NUMBER.assign([self])
 
         super().save(*args, **kwargs)
 
@@ -11,7 +11,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
-from xhtml2pdf import pisa
+from utils.lazy import lazy_import
 import csv
 import json
 from django.utils.translation import gettext_lazy as _
@@ -22,6 +22,8 @@ from apps.core.mixins import FinanceAccessRequiredMixin
 from apps.core.permissions import RoleBasedPermissionMixin
 from .forms import FeeStructureForm,FeeInvoiceSearchForm,FeeInvoiceForm
 
+pisa = lazy_import('xhtml2pdf.pisa')
+
 
 class FeeCollectionReportView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin, TemplateView):
     template_name = 'finance/fee_collection_report.html'
@@ -10,7 +10,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
 from django.core.exceptions import PermissionDenied
-from xhtml2pdf import pisa
+from utils.lazy import lazy_import
 import csv
 import json
 from django.utils.translation import gettext_lazy as _
@@ -23,6 +23,8 @@ from .forms import FeeStructureForm,FeeInvoiceSearchForm,FeeInvoiceForm
 from .export import FeeStructureExportView
 from apps.core.utils import get_user_institution 
 
+pisa = lazy_import('xhtml2pdf.pisa')
+
 fee_structure_export_pdf = FeeStructureExportView.as_view()
 
 class FeeStructureListView(FinanceAccessRequiredMixin, RoleBasedPermissionMixin, ListView):
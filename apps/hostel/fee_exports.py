@@ -10,7 +10,9 @@ from apps.core.mixins import DirectorRequiredMixin, FinanceAccessRequiredMixin
 from .models import HostelFeeStructure
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response
-import xlsxwriter
+from utils.lazy import lazy_import
+
+xlsxwriter = lazy_import('xlsxwriter')
 
 class FeeStructureExportView(FinanceAccessRequiredMixin, View):
     """
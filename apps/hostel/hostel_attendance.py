@@ -9,7 +9,7 @@ from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 
 from apps.core.mixins import DirectorRequiredMixin
 from apps.core.utils import get_user_institution
@@ -17,6 +17,8 @@ from .models import HostelAttendance
 from .forms import HostelAttendanceForm
 from utils.utils import render_to_pdf, export_pdf_response
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class HostelAttendanceListView(DirectorRequiredMixin, ListView):
     model = HostelAttendance
@@ -1,7 +1,7 @@
 from datetime import datetime
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q
@@ -17,6 +17,8 @@ from .models import HostelInventory, Hostel
 from .forms import HostelInventoryForm
 from utils.utils import render_to_pdf, export_pdf_response  # Ensure these exist
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class HostelInventoryListView(LoginRequiredMixin, ListView):
     model = HostelInventory
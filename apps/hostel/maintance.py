@@ -9,7 +9,7 @@ from django.http import HttpResponse
 from django.db.models import Q, Count
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 
 from .models import MaintenanceRequest,Room
 from .forms import MaintenanceRequestForm
@@ -17,6 +17,8 @@ from apps.core.utils import get_user_institution
 from apps.core.mixins import FinanceAccessRequiredMixin, DirectorRequiredMixin
 from utils.utils import render_to_pdf, export_pdf_response
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class MaintenanceRequestListView(FinanceAccessRequiredMixin, ListView):
     model = MaintenanceRequest
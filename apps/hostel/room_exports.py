@@ -4,13 +4,15 @@ from django.http import HttpResponse
 from django.utils import timezone
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 
 from apps.core.mixins import FinanceAccessRequiredMixin
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response
 from .models import Room  # Import your Room model
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class RoomExportView(FinanceAccessRequiredMixin, View):
     """
     Export Room data in CSV, PDF, Excel formats
@@ -17,7 +17,9 @@ from django.http import HttpResponse
 from django.utils import timezone
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
+
+xlsxwriter = lazy_import('xlsxwriter')
 
 
 
@@ -1,5 +1,5 @@
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from django.contrib import messages
 from datetime import datetime, timedelta
@@ -18,6 +18,8 @@ from utils.utils import render_to_pdf, export_pdf_response
 from .models import HrAttendance, Staff,Department,Designation
 from .forms import AttendanceForm, AttendanceFilterForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 
 class AttendanceListView( StaffManagementRequiredMixin, ListView):
@@ -8,7 +8,7 @@ from django.contrib import messages
 from django.db.models import Q
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 import uuid
 from .models import Department
 from .forms import DepartmentForm
@@ -16,6 +16,8 @@ from apps.core.utils import get_user_institution
 from apps.core.mixins import HRRequiredMixin,DirectorRequiredMixin
 from utils.utils import render_to_pdf, export_pdf_response
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class DepartmentListView( HRRequiredMixin, ListView):
     model = Department
@@ -13,7 +13,7 @@ from django.contrib import messages
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.db.models import Q, Count
-import xlsxwriter
+from utils.lazy import lazy_import
 # App-specific imports
 from apps.core.utils import get_user_institution
 from apps.core.mixins import HRRequiredMixin
@@ -23,6 +23,8 @@ from utils.utils import render_to_pdf, export_pdf_response
 from .models import Designation, Staff
 from .forms import DesignationForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 
 class DesignationListView( HRRequiredMixin, ListView):
@@ -1,6 +1,6 @@
 
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import StringIO, BytesIO
 from datetime import datetime
 from django.utils import timezone
@@ -16,10 +16,13 @@ from django.core.exceptions import PermissionDenied
 from apps.core.mixins import StaffManagementRequiredMixin,DirectorRequiredMixin
 from apps.core.utils import get_user_institution
 from utils.utils import  render_to_pdf, export_pdf_response, qr_generate
+from utils.assets import local_path
 from .models import Faculty
 from .forms import FacultyForm
 from .faculty_icard import FacultyIDCardGenerator
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 def generate_faculty_id_card(request, faculty_id):
     faculty = get_object_or_404(Faculty, id=faculty_id)
@@ -27,8 +30,8 @@ def generate_faculty_id_card(request, faculty_id):
 
     # Get logo and stamp paths from the institution via Staff
     institution = faculty.staff.institution
-    logo_path = institution.logo.path if institution and institution.logo else None
-    stamp_path = institution.stamp.path if institution and institution.stamp else None
+    logo_path = local_path(institution.logo) if institution else None
+    stamp_path = local_path(institution.stamp) if institution else None
 
     # Reuse your staff ID card generator
     generator = FacultyIDCardGenerator(faculty, logo_path, stamp_path)
@@ -1,10 +1,16 @@
 import os
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageColor
-import qrcode
+from utils.lazy import lazy_import
 from django.conf import settings
 from django.http import HttpResponse
 from django.utils.encoding import force_str
+from utils.assets import local_path
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+ImageColor = lazy_import('PIL.ImageColor')
+qrcode = lazy_import('qrcode')
 
 # Gracefully handle the absence of the typing module in older Python versions
 try:
@@ -146,7 +152,7 @@ class FacultyIDCardGenerator:
         draw.ellipse((x - 6, y_pos - 6, x + size + 6, y_pos + size + 6), fill=self.colors['primary_accent'])
         draw.ellipse((x - 3, y_pos - 3, x + size + 3, y_pos + size + 3), fill=self.colors['text_light'])
 
-        photo_path = getattr(self.staff.photo, 'path', None)
+        photo_path = local_path(self.staff.photo)
         if photo_path and os.path.exists(photo_path):
             with Image.open(photo_path).convert("RGBA") as photo_img:
                 photo_img = photo_img.resize((size, size), Image.LANCZOS)
@@ -1,10 +1,16 @@
 import os
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageColor
-import qrcode
+from utils.lazy import lazy_import
 from django.conf import settings
 from django.http import HttpResponse
 from django.utils.encoding import force_str
+from utils.assets import local_path
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+ImageColor = lazy_import('PIL.ImageColor')
+qrcode = lazy_import('qrcode')
 
 # It's good practice to handle potential missing modules gracefully
 try:
@@ -135,8 +141,9 @@ class StaffIDCardGenerator:
         draw.ellipse((x - 6, y_pos - 6, x + size + 6, y_pos + size + 6), fill=self.colors['primary_accent'])
         draw.ellipse((x - 4, y_pos - 4, x + size + 4, y_pos + size + 4), fill=self.colors['text_light'])
 
-        if self.staff.photo and hasattr(self.staff.photo, 'path') and os.path.exists(self.staff.photo.path):
-            photo_img = Image.open(self.staff.photo.path).convert("RGBA").resize((size, size), Image.LANCZOS)
+        photo_path = local_path(self.staff.photo)
+        if photo_path and os.path.exists(photo_path):
+            photo_img = Image.open(photo_path).convert("RGBA").resize((size, size), Image.LANCZOS)
             mask = Image.new('L', (size, size), 0)
             ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
             base_img.paste(photo_img, (x, y_pos), mask)
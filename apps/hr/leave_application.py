@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from io import BytesIO, StringIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -20,6 +20,8 @@ from utils.utils import render_to_pdf, export_pdf_response, qr_generate
 from .models import LeaveApplication, LeaveType
 from .forms import LeaveApplicationForm, LeaveApplicationReviewForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class LeaveApplicationExportView( DirectorRequiredMixin, ListView):
     model = LeaveApplication
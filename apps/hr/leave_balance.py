@@ -1,6 +1,6 @@
 
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from django.contrib import messages
 from datetime import datetime
@@ -21,6 +21,8 @@ from utils.utils import render_to_pdf, export_pdf_response
 from .models import LeaveBalance, LeaveType, Staff
 from .forms import LeaveBalanceForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class LeaveBalanceListView( StaffManagementRequiredMixin, ListView):
     model = LeaveBalance
     template_name = 'hr/leave_balance/leave_balance_list.html'
@@ -1,5 +1,5 @@
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from django.contrib import messages
 from datetime import datetime
@@ -14,11 +14,15 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView, D
 
 from apps.core.mixins import StaffManagementRequiredMixin
 from apps.core.utils import get_user_institution
+from apps.core.exports import Column, QuerysetExport
+from apps.reports.jobs import export_response
 from utils.utils import render_to_pdf, export_pdf_response
 
 from .models import Payroll, Staff
 from .forms import PayrollForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class PayrollListView( StaffManagementRequiredMixin, ListView):
     model = Payroll
     template_name = 'hr/payroll/payroll_list.html'
@@ -168,37 +172,83 @@ class PayrollDeleteView( StaffManagementRequiredMixin, DeleteView):
         messages.success(request, "Payroll record deleted successfully.")
         return super().delete(request, *args, **kwargs)
 
+class PayrollExport(QuerysetExport):
+    sheet_name = 'Payroll'
+    columns = [
+        Column('Employee ID', 'staff.employee_id'),
+        Column('Staff Name', 'staff.user.get_full_name', width=25),
+        Column('Month', 'month', width=10),
+        Column('Year', 'year', width=10),
+        Column('Basic Salary', 'basic_salary'),
+        Column('House Rent Allowance', 'house_rent_allowance'),
+        Column('Travel Allowance', 'travel_allowance'),
+        Column('Medical Allowance', 'medical_allowance'),
+        Column('Special Allowance', 'special_allowance'),
+        Column('Performance Bonus', 'performance_bonus'),
+        Column('Other Allowances', 'other_allowances'),
+        Column('Professional Tax', 'professional_tax'),
+        Column('Provident Fund', 'provident_fund'),
+        Column('Income Tax', 'income_tax'),
+        Column('Insurance', 'insurance'),
+        Column('Loan Deductions', 'loan_deductions'),
+        Column('Other Deductions', 'other_deductions'),
+        Column('Total Earnings', 'total_earnings', total=True),
+        Column('Total Deductions', 'total_deductions', total=True),
+        Column('Net Salary', 'net_salary', total=True),
+        Column('Payment Date', 'payment_date', default='N/A'),
+        Column('Payment Mode', 'get_payment_mode_display'),
+        Column('Payment Reference', 'payment_reference', width=20),
+        Column('Payment Status', 'get_payment_status_display'),
+        Column('Created At', 'created_at', width=18),
+        Column('Updated At', 'updated_at', width=18),
+    ]
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        queryset = Payroll.objects.filter(institution=organization).select_related('staff', 'staff__user')
+
+        staff_id = filters.get('staff')
+        if staff_id:
+            queryset = queryset.filter(staff_id=staff_id)
+
+        month = filters.get('month')
+        if month:
+            queryset = queryset.filter(month=month)
+
+        year = filters.get('year')
+        if year:
+            queryset = queryset.filter(year=year)
+
+        payment_status = filters.get('payment_status')
+        if payment_status:
+            queryset = queryset.filter(payment_status=payment_status)
+
+        return queryset
+
+
 class PayrollExportView( StaffManagementRequiredMixin, ListView):
     model = Payroll
     context_object_name = 'payrolls'
     
     def get_queryset(self):
-        institution = get_user_institution(self.request.user)
-        return Payroll.objects.filter(institution=institution).select_related('staff', 'staff__user')
+        # Filters applied from request
+        return PayrollExport.filter_queryset(self.request.GET, get_user_institution(self.request.user))
     
     def get(self, request, *args, **kwargs):
         format_type = request.GET.get('format', 'csv').lower()
         queryset = self.get_queryset()
         
-        # Apply filters from request
-        staff_id = request.GET.get('staff')
-        if staff_id:
-            queryset = queryset.filter(staff_id=staff_id)
-        
-        month = request.GET.get('month')
-        if month:
-            queryset = queryset.filter(month=month)
-        
-        year = request.GET.get('year')
-        if year:
-            queryset = queryset.filter(year=year)
-        
-        payment_status = request.GET.get('payment_status')
-        if payment_status:
-            queryset = queryset.filter(payment_status=payment_status)
-        
         # Build filename
         filename = f"payroll_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        # Get organization info
+        organization = get_user_institution(request.user)
+
+        # CSV / Excel stream from the queryset (large exports run in the background)
+        if format_type in ('csv', 'excel'):
+            return export_response(request, PayrollExport(queryset, filename, organization), format_type, 'Payroll export')
+        if format_type != 'pdf':
+            return HttpResponse("Invalid format specified", status=400)
         
         # Build data rows
         rows = []
@@ -232,199 +282,7 @@ class PayrollExportView( StaffManagementRequiredMixin, ListView):
                 "updated_at": payroll.updated_at.strftime('%Y-%m-%d %H:%M'),
             })
 
-        # Get organization info
-        organization = get_user_institution(request.user)
-        
-        if format_type == 'csv':
-            return self.export_csv(rows, filename, organization)
-        elif format_type == 'excel':
-            return self.export_excel(rows, filename, organization)
-        elif format_type == 'pdf':
-            return self.export_pdf(rows, filename, organization, queryset.count())
-        else:
-            return HttpResponse("Invalid format specified", status=400)
-    
-    def export_csv(self, rows, filename, organization):
-        """Export data to CSV format"""
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-        
-        # Write header
-        writer.writerow([
-            'Employee ID', 'Staff Name', 'Month', 'Year', 'Basic Salary',
-            'House Rent Allowance', 'Travel Allowance', 'Medical Allowance',
-            'Special Allowance', 'Performance Bonus', 'Other Allowances',
-            'Professional Tax', 'Provident Fund', 'Income Tax', 'Insurance',
-            'Loan Deductions', 'Other Deductions', 'Total Earnings', 'Total Deductions',
-            'Net Salary', 'Payment Date', 'Payment Mode', 'Payment Reference',
-            'Payment Status', 'Created At', 'Updated At'
-        ])
-        
-        # Write data rows
-        for row in rows:
-            writer.writerow([
-                row['employee_id'],
-                row['staff_name'],
-                row['month'],
-                row['year'],
-                row['basic_salary'],
-                row['house_rent_allowance'],
-                row['travel_allowance'],
-                row['medical_allowance'],
-                row['special_allowance'],
-                row['performance_bonus'],
-                row['other_allowances'],
-                row['professional_tax'],
-                row['provident_fund'],
-                row['income_tax'],
-                row['insurance'],
-                row['loan_deductions'],
-                row['other_deductions'],
-                row['total_earnings'],
-                row['total_deductions'],
-                row['net_salary'],
-                row['payment_date'],
-                row['payment_mode'],
-                row['payment_reference'],
-                row['payment_status'],
-                row['created_at'],
-                row['updated_at'],
-            ])
-        
-        # Add summary row
-        writer.writerow([])
-        writer.writerow(['Total Records:', len(rows)])
-        
-        # Calculate totals
-        total_earnings = sum(row['total_earnings'] for row in rows)
-        total_deductions = sum(row['total_deductions'] for row in rows)
-        total_net_salary = sum(row['net_salary'] for row in rows)
-        
-        writer.writerow(['Total Earnings:', total_earnings])
-        writer.writerow(['Total Deductions:', total_deductions])
-        writer.writerow(['Total Net Salary:', total_net_salary])
-        
-        writer.writerow(['Organization:', organization.name if organization else 'N/A'])
-        writer.writerow(['Export Date:', timezone.now().strftime("%Y-%m-%d %H:%M")])
-        
-        response = HttpResponse(buffer.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
-        return response
-    
-    def export_excel(self, rows, filename, organization):
-        """Export data to Excel format"""
-        buffer = BytesIO()
-        
-        with xlsxwriter.Workbook(buffer) as workbook:
-            worksheet = workbook.add_worksheet('Payroll')
-            
-            # Add formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#3b5998',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center',
-                'valign': 'vcenter',
-                'text_wrap': True
-            })
-            
-            number_format = workbook.add_format({'num_format': '#,##0.00'})
-            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
-            datetime_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'})
-            center_format = workbook.add_format({'align': 'center'})
-            
-            # Write headers
-            headers = [
-                'Employee ID', 'Staff Name', 'Month', 'Year', 'Basic Salary',
-                'House Rent Allowance', 'Travel Allowance', 'Medical Allowance',
-                'Special Allowance', 'Performance Bonus', 'Other Allowances',
-                'Professional Tax', 'Provident Fund', 'Income Tax', 'Insurance',
-                'Loan Deductions', 'Other Deductions', 'Total Earnings', 'Total Deductions',
-                'Net Salary', 'Payment Date', 'Payment Mode', 'Payment Reference',
-                'Payment Status', 'Created At', 'Updated At'
-            ]
-            
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-            
-            # Write data
-            for row_idx, row_data in enumerate(rows, start=1):
-                worksheet.write(row_idx, 0, row_data['employee_id'])
-                worksheet.write(row_idx, 1, row_data['staff_name'])
-                worksheet.write(row_idx, 2, row_data['month'], center_format)
-                worksheet.write(row_idx, 3, row_data['year'], center_format)
-                worksheet.write(row_idx, 4, float(row_data['basic_salary']), number_format)
-                worksheet.write(row_idx, 5, float(row_data['house_rent_allowance']), number_format)
-                worksheet.write(row_idx, 6, float(row_data['travel_allowance']), number_format)
-                worksheet.write(row_idx, 7, float(row_data['medical_allowance']), number_format)
-                worksheet.write(row_idx, 8, float(row_data['special_allowance']), number_format)
-                worksheet.write(row_idx, 9, float(row_data['performance_bonus']), number_format)
-                worksheet.write(row_idx, 10, float(row_data['other_allowances']), number_format)
-                worksheet.write(row_idx, 11, float(row_data['professional_tax']), number_format)
-                worksheet.write(row_idx, 12, float(row_data['provident_fund']), number_format)
-                worksheet.write(row_idx, 13, float(row_data['income_tax']), number_format)
-                worksheet.write(row_idx, 14, float(row_data['insurance']), number_format)
-                worksheet.write(row_idx, 15, float(row_data['loan_deductions']), number_format)
-                worksheet.write(row_idx, 16, float(row_data['other_deductions']), number_format)
-                worksheet.write(row_idx, 17, float(row_data['total_earnings']), number_format)
-                worksheet.write(row_idx, 18, float(row_data['total_deductions']), number_format)
-                worksheet.write(row_idx, 19, float(row_data['net_salary']), number_format)
-                worksheet.write(row_idx, 20, row_data['payment_date'] if row_data['payment_date'] != 'N/A' else '', date_format)
-                worksheet.write(row_idx, 21, row_data['payment_mode'])
-                worksheet.write(row_idx, 22, row_data['payment_reference'])
-                worksheet.write(row_idx, 23, row_data['payment_status'])
-                worksheet.write(row_idx, 24, row_data['created_at'], datetime_format)
-                worksheet.write(row_idx, 25, row_data['updated_at'], datetime_format)
-            
-            # Adjust column widths
-            worksheet.set_column('A:A', 15)  # Employee ID
-            worksheet.set_column('B:B', 25)  # Staff Name
-            worksheet.set_column('C:D', 10)  # Month, Year
-            worksheet.set_column('E:T', 15)  # Numeric columns
-            worksheet.set_column('U:U', 12)  # Payment Date
-            worksheet.set_column('V:V', 15)  # Payment Mode
-            worksheet.set_column('W:W', 20)  # Payment Reference
-            worksheet.set_column('X:X', 15)  # Payment Status
-            worksheet.set_column('Y:Z', 18)  # Date columns
-            
-            # Add summary
-            summary_row = len(rows) + 2
-            worksheet.write(summary_row, 0, 'Total Records:')
-            worksheet.write(summary_row, 1, len(rows))
-            
-            # Calculate totals
-            total_earnings = sum(float(row['total_earnings']) for row in rows)
-            total_deductions = sum(float(row['total_deductions']) for row in rows)
-            total_net_salary = sum(float(row['net_salary']) for row in rows)
-            
-            summary_row += 1
-            worksheet.write(summary_row, 0, 'Total Earnings:')
-            worksheet.write(summary_row, 1, total_earnings, number_format)
-            
-            summary_row += 1
-            worksheet.write(summary_row, 0, 'Total Deductions:')
-            worksheet.write(summary_row, 1, total_deductions, number_format)
-            
-            summary_row += 1
-            worksheet.write(summary_row, 0, 'Total Net Salary:')
-            worksheet.write(summary_row, 1, total_net_salary, number_format)
-            
-            summary_row += 2
-            worksheet.write(summary_row, 0, 'Organization:')
-            worksheet.write(summary_row, 1, organization.name if organization else 'N/A')
-            
-            summary_row += 1
-            worksheet.write(summary_row, 0, 'Export Date:')
-            worksheet.write(summary_row, 1, timezone.now().strftime("%Y-%m-%d %H:%M"))
-        
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
-        return response
+        return self.export_pdf(rows, filename, organization, len(rows))
     
     def export_pdf(self, rows, filename, organization, total_count):
         """Export data to PDF format"""
@@ -8,7 +8,6 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils import timezone
-from django.db.models import Q
 from .models import Staff,Designation,Department
 from apps.organization.models import Institution
 from apps.core.mixins import HRManagementRequiredMixin,StaffManagementRequiredMixin, DirectorRequiredMixin
@@ -21,22 +20,26 @@ from django.views.generic import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from apps.core.mixins import StaffManagementRequiredMixin
 from apps.core.utils import get_user_institution
+from apps.core import search as search_index
 from utils.utils import render_to_pdf, export_pdf_response,qr_generate
-import xlsxwriter
+from utils.assets import local_path
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from .forms import StaffForm,StaffFilterForm
 
 
 from .idcard import StaffIDCardGenerator
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 def generate_staff_id_card(request, staff_id):
     staff = Staff.objects.get(id=staff_id)
     
     # Get logo and stamp paths from your organization model
     institution = staff.institution
-    logo_path = institution.logo.path if institution.logo else None
-    stamp_path = institution.stamp.path if institution.stamp else None
+    logo_path = local_path(institution.logo)
+    stamp_path = local_path(institution.stamp)
     
     generator = StaffIDCardGenerator(staff, logo_path, stamp_path)
     return generator.get_id_card_response()
@@ -119,11 +122,7 @@ class StaffListView( StaffManagementRequiredMixin, ListView):
                 queryset = queryset.filter(employment_type=employment_type)
                 
             if search:
-                queryset = queryset.filter(
-                    Q(user__first_name__icontains=search) |
-                    Q(user__last_name__icontains=search) |
-                    Q(employee_id__icontains=search)
-                )
+                queryset = search_index.filter_queryset(queryset, search, institution)
         
         return queryset.order_by('user__last_name', 'user__first_name')
     
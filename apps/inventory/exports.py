@@ -1,6 +1,6 @@
 from io import StringIO, BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.views.generic import ListView,DetailView
@@ -11,6 +11,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from apps.core.mixins import StaffManagementRequiredMixin
 from .models import StockTransaction
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class StockTransactionExportView(StaffManagementRequiredMixin, ListView):
     model = StockTransaction
@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime, timedelta,date
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse,JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q, Sum, Case, When, IntegerField
@@ -19,6 +19,8 @@ from .forms import (ItemCategoryForm, ItemForm, PurchaseOrderForm, StockTransact
                     PurchaseOrderItemForm,PurchaseOrderStatusForm, InventoryFilterForm,PurchaseOrderItemFormSet)
 from apps.core.utils import get_user_institution
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # Dashboard View
 class InventoryDashboardView(StaffManagementRequiredMixin, TemplateView):
     template_name = 'inventory/dashboard.html'
@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime, timedelta, date
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q, Sum, Case, When, IntegerField
@@ -15,9 +15,12 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView, D
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from apps.core.mixins import LibraryManagerRequiredMixin
 from apps.core.utils import get_user_institution
+from apps.core import search as search_index
 from .models import Book, Author, Category
 from .forms import BookForm, BookFilterForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # Dashboard View
 class BookDashboardView(LibraryManagerRequiredMixin, TemplateView):
     template_name = 'library/books/dashboard.html'
@@ -115,11 +118,7 @@ class BookListView(LibraryManagerRequiredMixin, ListView):
             isbn = form.cleaned_data.get('isbn')
 
             if search:
-                queryset = queryset.filter(
-                    Q(title__icontains=search) | 
-                    Q(publisher__icontains=search) |
-                    Q(description__icontains=search)
-                )
+                queryset = search_index.filter_queryset(queryset, search, institution)
             if author:
                 queryset = queryset.filter(author=author)
             if category:
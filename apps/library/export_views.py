@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.views.generic import ListView
@@ -9,6 +9,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from apps.core.utils import get_user_institution
 from .models import Book, Author, Category
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # Export Views
 class BookExportView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = Book
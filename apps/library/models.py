@@ -1,6 +1,4 @@
 import uuid
-import random
-import string
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -8,6 +6,8 @@ from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.sequences import NumberFormat
+
 # Get the User model
 User = get_user_model()
 
@@ -207,6 +207,9 @@ class Reservation(models.Model):
         ('cancelled', 'Cancelled'),
         ('expired', 'Expired'),
     ]
+    # RSV00000001: one global sequence, the 12-character unique number has
+    # no room for the institution code
+    RESERVATION_NUMBER = NumberFormat('reservation_number', lambda reservation: 'RSV', width=8, institution=None)
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     reservation_number = models.CharField(
@@ -234,16 +237,7 @@ class Reservation(models.Model):
     def get_absolute_url(self):
         return reverse('library:reservation-detail', kwargs={'pk': self.id})
     
-    @staticmethod
-    def generate_unique_reservation_number(length=8):
-        """Generate a unique alphanumeric reservation number"""
-        while True:
-            number = ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
-            if not Reservation.objects.filter(reservation_number=number).exists():
-                return number
-            
-
     def save(self, *args, **kwargs):
         if not self.reservation_number:
-            self.reservation_number = self.generate_unique_reservation_number()
+            self.RESERVATION_NUMBER.assign([self])
         super().save(*args, **kwargs)
\ No newline at end of file
@@ -1,7 +1,7 @@
 import csv
-from io import StringIO, BytesIO
+from io import BytesIO
 from datetime import datetime, timedelta
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -14,9 +14,13 @@ from django.views.generic import ListView, CreateView, UpdateView, DeleteView, D
 from django.contrib.auth.mixins import  PermissionRequiredMixin
 from apps.core.mixins import LibraryManagerRequiredMixin
 from apps.core.utils import get_user_institution
+from apps.core.exports import Column, QuerysetExport
+from apps.reports.jobs import export_response
 from .models import Reservation, Book
 from .forms import ReservationForm, ReservationFilterForm
 from django.utils.timezone import localtime
+xlsxwriter = lazy_import('xlsxwriter')
+
 # Reservation List View
 class ReservationListView(LibraryManagerRequiredMixin, ListView):
     model = Reservation
@@ -202,23 +206,43 @@ class ReservationCancelView(LibraryManagerRequiredMixin, PermissionRequiredMixin
         return redirect('library:reservation_detail', pk=reservation.pk)
 
 # Export Views
-class ReservationExportView(LibraryManagerRequiredMixin, PermissionRequiredMixin, ListView):
-    model = Reservation
-    context_object_name = "reservations"
-    permission_required = 'library.view_reservation'
-
-    def get_queryset(self):
-        institution = get_user_institution(self.request.user)
-        queryset = Reservation.objects.select_related('book', 'user', 'institution').filter(institution=institution)
-        
-        # Apply filters from request
-        form = ReservationFilterForm(self.request.GET, institution=institution)
+def _days_remaining(reservation):
+    if reservation.status != 'pending':
+        return 'N/A'
+    return max(0, (reservation.expiry_date - timezone.now()).days)
+
+
+class ReservationExport(QuerysetExport):
+    sheet_name = 'Reservations'
+    total_label = 'Total Reservations:'
+    count_by = 'Status'
+    header_format = dict(QuerysetExport.header_format, bg_color='#2c3e50')
+    columns = [
+        Column('Reservation ID', lambda reservation: str(reservation.id), width=38),
+        Column('Book Title', 'book.title', width=30),
+        Column('Author', 'book.author.name', width=20),
+        Column('ISBN', 'book.isbn'),
+        Column('User Name', lambda reservation: reservation.user.get_full_name() or reservation.user.email, width=25),
+        Column('User Email', 'user.email', width=25),
+        Column('Reservation Date', 'reservation_date', width=18),
+        Column('Expiry Date', 'expiry_date', width=18),
+        Column('Status', 'get_status_display'),
+        Column('Days Remaining', _days_remaining),
+        Column('Notes', 'notes', width=30),
+        Column('Institution', 'institution.name', width=25),
+    ]
+
+    @classmethod
+    def filter_queryset(cls, filters, organization):
+        queryset = Reservation.objects.select_related('book', 'book__author', 'user', 'institution').filter(institution=organization)
+
+        form = ReservationFilterForm(filters, institution=organization)
         if form.is_valid():
             search = form.cleaned_data.get('search')
             status = form.cleaned_data.get('status')
             date_from = form.cleaned_data.get('date_from')
             date_to = form.cleaned_data.get('date_to')
-            
+
             if search:
                 queryset = queryset.filter(
                     Q(book__title__icontains=search) | 
@@ -233,9 +257,19 @@ class ReservationExportView(LibraryManagerRequiredMixin, PermissionRequiredMixin
                 queryset = queryset.filter(reservation_date__date__gte=date_from)
             if date_to:
                 queryset = queryset.filter(reservation_date__date__lte=date_to)
-        
+
         return queryset.order_by('-reservation_date')
 
+
+class ReservationExportView(LibraryManagerRequiredMixin, PermissionRequiredMixin, ListView):
+    model = Reservation
+    context_object_name = "reservations"
+    permission_required = 'library.view_reservation'
+
+    def get_queryset(self):
+        # Filters applied from request
+        return ReservationExport.filter_queryset(self.request.GET, get_user_institution(self.request.user))
+
     def get(self, request, *args, **kwargs):
         format_type = request.GET.get("format", "csv").lower()
         queryset = self.get_queryset()
@@ -243,127 +277,13 @@ class ReservationExportView(LibraryManagerRequiredMixin, PermissionRequiredMixin
         filename = f"reservations_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}"
         organization = get_user_institution(request.user)
 
-        if format_type == "csv":
-            return self.export_csv(queryset, filename, organization)
-        elif format_type == "excel":
-            return self.export_excel(queryset, filename, organization)
+        # CSV / Excel stream from the queryset (large exports run in the background)
+        if format_type in ("csv", "excel"):
+            return export_response(request, ReservationExport(queryset, filename, organization), format_type, 'Reservations export')
         elif format_type == "pdf":
             return self.export_pdf(queryset, filename, organization)
         return HttpResponse("Invalid format specified", status=400)
 
-    def export_csv(self, queryset, filename, organization):
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-
-        # Write headers
-        writer.writerow([
-            'Reservation ID', 'Book Title', 'Author', 'ISBN', 'User Name', 
-            'User Email', 'Reservation Date', 'Expiry Date', 'Status', 
-            'Days Remaining', 'Notes', 'Institution'
-        ])
-
-        # Write data
-        for reservation in queryset:
-            days_remaining = max(0, (reservation.expiry_date - timezone.now()).days) if reservation.status == 'pending' else 0
-            
-            writer.writerow([
-                str(reservation.id),
-                reservation.book.title,
-                reservation.book.author.name if reservation.book.author else '',
-                reservation.book.isbn or '',
-                f"{reservation.user.get_full_name() or reservation.user.username}",
-                reservation.user.email or '',
-                reservation.reservation_date.strftime('%Y-%m-%d %H:%M'),
-                reservation.expiry_date.strftime('%Y-%m-%d %H:%M'),
-                reservation.get_status_display(),
-                days_remaining if reservation.status == 'pending' else 'N/A',
-                reservation.notes or '',
-                organization.name
-            ])
-
-        response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
-        return response
-
-    def export_excel(self, queryset, filename, organization):
-        buffer = BytesIO()
-        
-        with xlsxwriter.Workbook(buffer) as workbook:
-            worksheet = workbook.add_worksheet("Reservations")
-
-            # Define formats
-            header_format = workbook.add_format({
-                "bold": True, 
-                "bg_color": "#2c3e50", 
-                "font_color": "white",
-                "border": 1, 
-                "align": "center", 
-                "valign": "vcenter"
-            })
-            
-            date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'})
-            center_format = workbook.add_format({'align': 'center'})
-
-            # Write headers
-            headers = [
-                'Reservation ID', 'Book Title', 'Author', 'ISBN', 'User Name', 
-                'User Email', 'Reservation Date', 'Expiry Date', 'Status', 
-                'Days Remaining', 'Notes'
-            ]
-            
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-
-            # Write data
-            for row_idx, reservation in enumerate(queryset, start=1):
-                days_remaining = max(0, (reservation.expiry_date - timezone.now()).days) if reservation.status == 'pending' else 0
-                
-                worksheet.write(row_idx, 0, str(reservation.id))
-                worksheet.write(row_idx, 1, reservation.book.title)
-                worksheet.write(row_idx, 2, reservation.book.author.name if reservation.book.author else '')
-                worksheet.write(row_idx, 3, reservation.book.isbn or '')
-                worksheet.write(row_idx, 4, f"{reservation.user.get_full_name() or ''}")
-                worksheet.write(row_idx, 5, reservation.user.email or '')
-              
-                
-                worksheet.write(row_idx, 6, reservation.get_status_display())
-                worksheet.write(row_idx, 7, days_remaining if reservation.status == 'pending' else 'N/A', center_format)
-                worksheet.write(row_idx, 8, reservation.notes or '')
-
-            # Set column widths
-            worksheet.set_column('A:A', 36)  # Reservation ID
-            worksheet.set_column('B:B', 30)  # Book Title
-            worksheet.set_column('C:C', 25)  # Author
-            worksheet.set_column('D:D', 15)  # ISBN
-            worksheet.set_column('E:E', 25)  # User Name
-            worksheet.set_column('F:F', 25)  # User Email
-            worksheet.set_column('G:H', 18)  # Dates
-            worksheet.set_column('I:I', 15)  # Status
-            worksheet.set_column('J:J', 12)  # Days Remaining
-            worksheet.set_column('K:K', 40)  # Notes
-
-            # Add summary statistics
-            stats_row = len(queryset) + 2
-            worksheet.write(stats_row, 0, "Export Summary", header_format)
-            worksheet.write(stats_row + 1, 0, "Total Reservations:")
-            worksheet.write(stats_row + 1, 1, len(queryset))
-            worksheet.write(stats_row + 2, 0, "Pending:")
-            worksheet.write(stats_row + 2, 1, queryset.filter(status='pending').count())
-            worksheet.write(stats_row + 3, 0, "Fulfilled:")
-            worksheet.write(stats_row + 3, 1, queryset.filter(status='fulfilled').count())
-            worksheet.write(stats_row + 4, 0, "Cancelled:")
-            worksheet.write(stats_row + 4, 1, queryset.filter(status='cancelled').count())
-            worksheet.write(stats_row + 5, 0, "Expired:")
-            worksheet.write(stats_row + 5, 1, queryset.filter(status='expired').count())
-
-        buffer.seek(0)
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = f'attachment; filename="{filename}.xlsx"'
-        return response
-
     def export_pdf(self, queryset, filename, organization):
         from utils.utils import render_to_pdf, export_pdf_response
         
@@ -9,7 +9,7 @@ from django.db.models import Q
 from django.http import HttpResponse
 from io import BytesIO
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from datetime import datetime
 
 from .models import Book, Author, BorrowRecord, Reservation, Category
@@ -17,6 +17,8 @@ from .forms import BookForm, AuthorForm, BorrowBookForm, ReturnBookForm, Categor
 from apps.core.utils import get_user_institution
 from apps.core.mixins import LibraryManagerRequiredMixin, StaffManagementRequiredMixin
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class LibraryDashboardView( LibraryManagerRequiredMixin, ListView):
     template_name = 'library/dashboard.html'
@@ -9,10 +9,12 @@ from .models import Accreditation
 from .forms import AccreditationForm
 import csv
 from io import BytesIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from datetime import datetime
 from apps.core.utils import get_user_institution
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ------------------ Accreditation CRUD ------------------ #
 class AccreditationListView( StaffManagementRequiredMixin, ListView):
     model = Accreditation
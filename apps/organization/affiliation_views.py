@@ -9,10 +9,12 @@ from .models import Affiliation
 from .forms import AffiliationForm
 import csv
 from io import BytesIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from apps.core.utils import get_user_institution
 
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ------------------ Affiliation CRUD ------------------ #
 
 class AffiliationListView( StaffManagementRequiredMixin, ListView):
@@ -8,10 +8,12 @@ from .models import InstitutionCompliance
 from .forms import InstitutionComplianceForm
 import csv
 from io import BytesIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from datetime import datetime
 from apps.core.utils import get_user_institution
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ------------------ Compliance CRUD ------------------ #
 
 class InstitutionComplianceListView( StaffManagementRequiredMixin, ListView):
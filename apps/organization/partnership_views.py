@@ -8,10 +8,12 @@ from .models import Partnership
 from .forms import PartnershipForm
 import csv
 from io import BytesIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from datetime import datetime, timedelta
 from apps.core.utils import get_user_institution
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ------------------ Partnership CRUD ------------------ #
 
 class PartnershipListView( StaffManagementRequiredMixin, ListView):
@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -18,6 +18,8 @@ from .forms import (InstitutionForm, DepartmentForm, BranchForm,
 from apps.core.utils import get_user_institution
 import json
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class OrganizationDashboardView( StaffManagementRequiredMixin, TemplateView):
     template_name = 'organization/dashboard.html'
@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -17,6 +17,8 @@ from apps.core.utils import get_user_institution
 from ..models import PaymentGateway
 from ..forms import PaymentGatewayForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class PaymentGatewayListView(LoginRequiredMixin, StaffManagementRequiredMixin, ListView):
     model = PaymentGateway
     template_name = 'payments/gateway/gateway_list.html'
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentwebhooklog',
+            index=models.Index(fields=['institution', 'created_at'], name='payments_we_institu_c24d6e_idx'),
+        ),
+    ]
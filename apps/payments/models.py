@@ -82,6 +82,9 @@ class PaymentWebhookLog(models.Model):
     
     class Meta:
         db_table = 'payments_webhook_log'
+        indexes = [
+            models.Index(fields=['institution', 'created_at']),
+        ]
     
     def __str__(self):
         return f"Webhook {self.event_type} - {self.gateway}"
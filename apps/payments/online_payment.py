@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -13,6 +13,8 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from apps.core.utils import get_user_institution
 from ..models import OnlinePayment
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class OnlinePaymentListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = OnlinePayment
     template_name = 'payments/online_payment/online_payment_list.html'
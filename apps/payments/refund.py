@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -14,6 +14,8 @@ from apps.core.utils import get_user_institution
 from ..models import Refund, OnlinePayment
 from ..forms import RefundForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class RefundListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = Refund
     template_name = 'payments/refund/refund_list.html'
@@ -1,7 +1,9 @@
-import razorpay
+from utils.lazy import lazy_import
 from django.conf import settings
 from .models import PaymentGateway, OnlinePayment
 
+razorpay = lazy_import('razorpay')
+
 class PaymentService:
     def __init__(self, school, gateway_name='razorpay'):
         self.school = school
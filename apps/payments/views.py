@@ -8,12 +8,14 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
 import json
-import razorpay
+from utils.lazy import lazy_import
 from decimal import Decimal
 
 from .models import PaymentGateway, OnlinePayment, PaymentWebhookLog, Refund
 from apps.finance.models import Payment
 
+razorpay = lazy_import('razorpay')
+
 class PaymentGatewayListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = PaymentGateway
     template_name = 'payments/gateway_list.html'
@@ -1,17 +1,21 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from django.views.generic import ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from apps.core import search as search_index
+from apps.core.pagination import KeysetPaginationMixin
 from apps.core.utils import get_user_institution
 from ..models import PaymentWebhookLog
 
-class PaymentWebhookLogListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+xlsxwriter = lazy_import('xlsxwriter')
+
+class PaymentWebhookLogListView(KeysetPaginationMixin, LoginRequiredMixin, PermissionRequiredMixin, ListView):
     model = PaymentWebhookLog
     template_name = 'payments/webhook/webhook_list.html'
     context_object_name = 'webhook_logs'
@@ -32,11 +36,7 @@ class PaymentWebhookLogListView(LoginRequiredMixin, PermissionRequiredMixin, Lis
         date_to = self.request.GET.get('date_to')
         
         if search:
-            queryset = queryset.filter(
-                Q(webhook_id__icontains=search) |
-                Q(event_type__icontains=search) |
-                Q(processing_notes__icontains=search)
-            )
+            queryset = search_index.filter_queryset(queryset, search, institution)
         if event_type:
             queryset = queryset.filter(event_type=event_type)
         if processed:
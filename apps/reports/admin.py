@@ -21,8 +21,8 @@ class ReportTypeAdmin(admin.ModelAdmin):
 
 @admin.register(GeneratedReport)
 class GeneratedReportAdmin(admin.ModelAdmin):
-    list_display = ("report_name", "institution", "report_type", "format", "generated_by", "generated_at", "file_link")
-    list_filter = ("institution", "format", "generated_at")
+    list_display = ("report_name", "institution", "report_type", "format", "status", "progress", "generated_by", "generated_at", "file_link")
+    list_filter = ("institution", "format", "status", "generated_at")
     search_fields = ("report_name", "report_type__name", "generated_by__username")
     ordering = ("-generated_at",)
 
@@ -0,0 +1,188 @@
+# reports/jobs.py
+"""
+Background CSV / Excel export jobs.
+
+Views hand a QuerysetExport to export_response(). Small result sets are
+streamed in the request as before; anything above EXPORT_ASYNC_THRESHOLD rows
+is recorded as a pending GeneratedReport and run by the run_export_job Celery
+task, which writes the file to default storage under reports/exports/ and
+keeps status/progress on the GeneratedReport row for the status page to poll.
+
+The job stores the export class path and the request's filters in
+GeneratedReport.parameters; the worker rebuilds the queryset with the export's
+filter_queryset(), the same filter logic the view ran. Nothing executable is
+stored, so editing a report row cannot run code in the worker, and jobs
+survive model changes between enqueue and run.
+"""
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.exports import QuerysetExport
+
+from .models import GeneratedReport, ReportType
+
+logger = logging.getLogger(__name__)
+
+ASYNC_FORMATS = ('csv', 'excel')
+EXTENSIONS = {'csv': '.csv', 'excel': '.xlsx'}
+EXPORT_REPORT_CODE = 'data-export'
+EXPORT_DIRECTORY = 'reports/exports'
+
+
+def _dotted_path(cls):
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def get_export_report_type(institution):
+    report_type, _ = ReportType.objects.get_or_create(
+        institution=institution,
+        code=EXPORT_REPORT_CODE,
+        defaults={'name': 'Data Export', 'template_path': ''},
+    )
+    return report_type
+
+
+def is_large_export(export, threshold=None):
+    """True when the export has more rows than the inline threshold."""
+    if threshold is None:
+        threshold = getattr(settings, 'EXPORT_ASYNC_THRESHOLD', 5000)
+    return export.get_queryset()[threshold:threshold + 1].exists()
+
+
+def queue_export(export, format_type, user, institution, report_name=None, filters=None):
+    """Record a pending GeneratedReport for `export` and enqueue the task."""
+    report = GeneratedReport.objects.create(
+        institution=institution,
+        report_type=get_export_report_type(institution),
+        report_name=report_name or f'{export.sheet_name} export',
+        format=format_type,
+        parameters={
+            'filters': filters or {},
+            'filename': export.filename,
+            'export': _dotted_path(type(export)),
+        },
+        generated_by=user,
+        status=GeneratedReport.STATUS_PENDING,
+    )
+
+    from .tasks import run_export_job
+
+    def enqueue():
+        try:
+            result = run_export_job.delay(str(report.pk))
+        except Exception as e:
+            logger.exception(f"Could not queue export job {report.pk}")
+            _update(report, status=GeneratedReport.STATUS_FAILED, error=f'Could not queue export: {e}')
+            return
+        GeneratedReport.objects.filter(pk=report.pk, task_id='').update(task_id=result.id or '')
+
+    transaction.on_commit(enqueue)
+    return report
+
+
+def export_response(request, export, format_type, report_name=None):
+    """
+    Response for an export view: CSV/Excel are streamed inline when small,
+    otherwise queued and redirected to the job status page.
+    Returns None for formats the export engine does not handle.
+    """
+    institution = export.organization
+    if (
+        format_type not in ASYNC_FORMATS
+        or institution is None
+        or not request.user.is_authenticated
+        or not is_large_export(export)
+    ):
+        return export.response(format_type)
+
+    filters = {key: value for key, value in request.GET.items() if key != 'format'}
+    report = queue_export(export, format_type, request.user, institution, report_name, filters)
+    messages.info(request, 'This export is large and is being generated in the background.')
+    return redirect('export_job_status', pk=report.pk)
+
+
+# ---- worker side ----------------------------------------------------------
+
+def build_export(report):
+    """Rebuild the QuerysetExport recorded on a GeneratedReport."""
+    params = report.parameters
+    export_class = import_string(params['export'])
+    if not (isinstance(export_class, type) and issubclass(export_class, QuerysetExport)):
+        raise ValueError(f"{params['export']} is not a QuerysetExport")
+
+    return export_class.from_filters(
+        params.get('filters') or {}, params.get('filename') or str(report.pk), report.institution,
+    )
+
+
+def _update(report, **fields):
+    for name, value in fields.items():
+        setattr(report, name, value)
+    GeneratedReport.objects.filter(pk=report.pk).update(**fields)
+
+
+def run_export(report_id):
+    """Generate the file for a pending export job. Returns the GeneratedReport."""
+    report = GeneratedReport.objects.select_related('institution').get(pk=report_id)
+    if report.status != GeneratedReport.STATUS_PENDING:
+        logger.info(f"Export job {report_id} is {report.status}, skipping")
+        return report
+
+    _update(report, status=GeneratedReport.STATUS_RUNNING, progress=0, error='')
+    path = None
+    try:
+        export = build_export(report)
+        total = export.get_queryset().count()
+        _update(report, total_rows=total)
+
+        def on_progress(row_count):
+            progress = min(99, row_count * 100 // total) if total else 99
+            _update(report, row_count=row_count, progress=progress)
+
+        export.on_progress = on_progress
+
+        suffix = EXTENSIONS[report.format]
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        if report.format == 'csv':
+            export.write_csv(path)
+        else:
+            export.write_excel(path)
+
+        name = f'{EXPORT_DIRECTORY}/{report.institution_id}/{export.filename}{suffix}'
+        with open(path, 'rb') as handle:
+            saved_name = default_storage.save(name, File(handle))
+
+        _update(
+            report,
+            status=GeneratedReport.STATUS_COMPLETED,
+            file_path=saved_name,
+            row_count=export.row_count,
+            progress=100,
+            completed_at=timezone.now(),
+        )
+    except Exception as e:
+        logger.exception(f"Export job {report_id} failed")
+        _update(
+            report,
+            status=GeneratedReport.STATUS_FAILED,
+            error=str(e),
+            completed_at=timezone.now(),
+        )
+    finally:
+        if path:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    return report
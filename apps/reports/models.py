@@ -27,6 +27,17 @@ class GeneratedReport(models.Model):
         ('csv', 'CSV'),
         ('html', 'HTML'),
     )
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    )
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     institution = models.ForeignKey('organization.Institution', on_delete=models.CASCADE)
@@ -37,13 +48,31 @@ class GeneratedReport(models.Model):
     file_path = models.CharField(max_length=500, blank=True)
     generated_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     generated_at = models.DateTimeField(auto_now_add=True)
+
+    # Background job state (reports generated inline are created completed)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_COMPLETED)
+    task_id = models.CharField(max_length=255, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         db_table = 'reports_generated_report'
+        ordering = ['-generated_at']
     
     def __str__(self):
         return self.report_name
 
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    @property
+    def is_downloadable(self):
+        return self.status == self.STATUS_COMPLETED and bool(self.file_path)
+
 class DashboardWidget(models.Model):
     WIDGET_TYPES = (
         ('chart', 'Chart'),
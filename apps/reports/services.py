@@ -1,10 +1,12 @@
 import uuid
-import pandas as pd
+from utils.lazy import lazy_import
 from io import BytesIO
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-from xhtml2pdf import pisa
-import xlsxwriter
+
+pd = lazy_import('pandas')
+pisa = lazy_import('xhtml2pdf.pisa')
+xlsxwriter = lazy_import('xlsxwriter')
 
 
 class ReportService:
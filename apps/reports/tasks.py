@@ -0,0 +1,10 @@
+# reports/tasks.py
+from celery import shared_task
+
+from .jobs import run_export
+
+
+@shared_task(ignore_result=True)
+def run_export_job(report_id):
+    """Write a queued CSV / Excel export to media (see reports.jobs)."""
+    run_export(report_id)
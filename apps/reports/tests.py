@@ -1,3 +1,110 @@
-from django.test import TestCase
+# reports/tests.py
+import csv
+import datetime
+import io
+import shutil
+import tempfile
 
-# Create your tests here.
+import openpyxl
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.files.storage import default_storage
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from apps.communications.models import Notice
+from apps.communications.views import NoticeExport
+from apps.organization.models import Institution
+from apps.users.models import User
+
+from .jobs import export_response, queue_export
+from .models import GeneratedReport
+
+
+class ExportJobTests(TestCase):
+    """queue_export -> run_export_job (eager in tests) and the inline fast path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.institution = Institution.objects.create(
+            name='Export Test School', slug='export-test', code='EXPTEST', address='1 Test Road',
+            contact_email='office@export.test', contact_phone='000', fiscal_year_start=datetime.date(2025, 4, 1),
+        )
+        cls.user, _ = User.objects.create_user(
+            email='admin@export.test', password='x', first_name='Export', last_name='Admin',
+        )
+        Notice.objects.bulk_create([
+            Notice(institution=cls.institution, title=f'Notice {n}', content='Body', is_published=n != 2,
+                   created_by=cls.user)
+            for n in range(3)
+        ])
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def queue(self, format_type, filters):
+        export = NoticeExport(NoticeExport.filter_queryset(filters, self.institution), 'notices', self.institution)
+        with self.captureOnCommitCallbacks(execute=True):
+            report = queue_export(export, format_type, self.user, self.institution, filters=filters)
+        report.refresh_from_db()
+        return report
+
+    def assertCompleted(self, report, rows):
+        self.assertEqual(report.status, GeneratedReport.STATUS_COMPLETED, report.error)
+        self.assertEqual(report.progress, 100)
+        self.assertEqual(report.row_count, rows)
+        self.assertTrue(report.file_path.startswith(f'reports/exports/{self.institution.pk}/notices'))
+        self.assertTrue(default_storage.exists(report.file_path))
+
+    def test_csv_job_writes_filtered_file(self):
+        report = self.queue('csv', {'status': 'published'})
+
+        self.assertEqual(report.parameters['export'], 'apps.communications.views.NoticeExport')
+        self.assertEqual(report.parameters['filters'], {'status': 'published'})
+        self.assertTrue(report.file_path.endswith('.csv'))
+        self.assertCompleted(report, 2)
+        with default_storage.open(report.file_path) as handle:
+            titles = [row[0] for row in csv.reader(io.StringIO(handle.read().decode('utf-8-sig'))) if row]
+        self.assertIn('Notice 0', titles)
+        self.assertIn('Notice 1', titles)
+        self.assertNotIn('Notice 2', titles)
+
+    def test_excel_job_writes_workbook(self):
+        report = self.queue('excel', {})
+
+        self.assertTrue(report.file_path.endswith('.xlsx'))
+        self.assertCompleted(report, 3)
+        with default_storage.open(report.file_path) as handle:
+            workbook = openpyxl.load_workbook(handle, read_only=True)
+            titles = {row[0] for row in workbook.active.iter_rows(values_only=True)}
+            workbook.close()
+        self.assertTrue({'Notice 0', 'Notice 1', 'Notice 2'} <= titles)
+
+    def export_request(self, format_type):
+        request = RequestFactory().get('/notices/export/', {'format': format_type})
+        request.user = self.user
+        request._messages = CookieStorage(request)
+        export = NoticeExport(NoticeExport.filter_queryset({}, self.institution), 'notices', self.institution)
+        with self.captureOnCommitCallbacks(execute=True):
+            return export_response(request, export, format_type)
+
+    @override_settings(EXPORT_ASYNC_THRESHOLD=5)
+    def test_small_export_is_streamed_inline(self):
+        response = self.export_request('csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Notice 1', b''.join(response).decode('utf-8-sig'))
+        self.assertFalse(GeneratedReport.objects.exists())
+
+    @override_settings(EXPORT_ASYNC_THRESHOLD=2)
+    def test_large_export_is_queued(self):
+        response = self.export_request('csv')
+
+        report = GeneratedReport.objects.get()
+        self.assertRedirects(
+            response, reverse('export_job_status', args=[report.pk]), fetch_redirect_response=False,
+        )
+        self.assertCompleted(report, 3)
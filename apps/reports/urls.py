@@ -8,5 +8,8 @@ urlpatterns = [
     path('attendance/', views.AttendanceReportView.as_view(), name='attendance_report'),
     path('financial/', views.FinancialReportView.as_view(), name='financial_report'),
     path('academic/', views.AcademicReportView.as_view(), name='academic_report'),
+    path('exports/<uuid:pk>/', views.ExportJobStatusView.as_view(), name='export_job_status'),
+    path('exports/<uuid:pk>/status/', views.ExportJobStatusJSONView.as_view(), name='export_job_status_json'),
+    path('exports/<uuid:pk>/download/', views.ExportJobDownloadView.as_view(), name='export_job_download'),
     # path('custom/', views.CustomReportView.as_view(), name='custom_report'),
 ]
\ No newline at end of file
@@ -1,15 +1,15 @@
 from django.shortcuts import render
-from django.urls import reverse_lazy
-from django.views.generic import ListView, TemplateView
+from django.urls import reverse, reverse_lazy
+from django.views.generic import DetailView, ListView, TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db.models import Count, Sum, Q ,Avg , Max ,Min,ExpressionWrapper
 from django.db import  models
-from django.http import HttpResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.utils import timezone
 from datetime import timedelta
 import csv
 from io import StringIO, BytesIO
-import xlsxwriter
+from utils.lazy import lazy_import
 from utils.utils import render_to_pdf, export_pdf_response
 from apps.core.utils import get_user_institution
 from apps.students.models import Student
@@ -19,10 +19,14 @@ from apps.teachers.models import Teacher
 from apps.attendance.models import Attendance
 from apps.finance.models import Payment, FeeInvoice,FeeStructure
 from apps.examination.models import ExamResult
+from django.core.files.storage import default_storage
+from .models import GeneratedReport, ReportType
 from .forms import (AttendanceFilterForm, AttendanceExportForm,FinancialExportForm,
                     AcademicExportForm,AcademicFilterForm,
                     FinancialFilterForm)
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'reports/dashboard.html'
@@ -1003,4 +1007,61 @@ class CustomReportView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['report_types'] = ReportType.objects.filter(institution=get_user_institution(self.request.user), is_active=True)
-        return context
\ No newline at end of file
+        return context
+
+
+# ---------------------------------------------------------------------------
+# Background export jobs
+# ---------------------------------------------------------------------------
+
+class ExportJobMixin(LoginRequiredMixin):
+    """Export jobs are visible to the user who queued them (and superusers)."""
+
+    def get_queryset(self):
+        queryset = GeneratedReport.objects.select_related('institution')
+        if self.request.user.is_superuser:
+            return queryset
+        return queryset.filter(generated_by=self.request.user)
+
+
+def export_job_payload(report):
+    return {
+        'id': str(report.pk),
+        'name': report.report_name,
+        'format': report.format,
+        'status': report.status,
+        'progress': report.progress,
+        'row_count': report.row_count,
+        'total_rows': report.total_rows,
+        'error': report.error,
+        'download_url': (
+            reverse('export_job_download', kwargs={'pk': report.pk})
+            if report.is_downloadable else None
+        ),
+    }
+
+
+class ExportJobStatusView(ExportJobMixin, DetailView):
+    model = GeneratedReport
+    context_object_name = 'report'
+    template_name = 'reports/export_job_status.html'
+
+
+class ExportJobStatusJSONView(ExportJobMixin, View):
+    def get(self, request, pk):
+        report = self.get_queryset().filter(pk=pk).first()
+        if report is None:
+            raise Http404
+        return JsonResponse(export_job_payload(report))
+
+
+class ExportJobDownloadView(ExportJobMixin, View):
+    def get(self, request, pk):
+        report = self.get_queryset().filter(pk=pk).first()
+        if report is None or not report.is_downloadable or not default_storage.exists(report.file_path):
+            raise Http404
+        return FileResponse(
+            default_storage.open(report.file_path, 'rb'),
+            as_attachment=True,
+            filename=report.file_path.rsplit('/', 1)[-1],
+        )
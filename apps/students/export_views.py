@@ -8,6 +8,7 @@ from django.contrib import messages
 from django.utils import timezone
 from .models import Student
 from apps.organization.models import Institution
+from apps.core.utils import get_user_institution
 from .services.csv_export import StudentCSVExporter
 from .services.pdf_export import StudentPDFExporter
 from .services.filter_service import StudentFilterService
@@ -37,8 +38,9 @@ class ExportStudentsView(LoginRequiredMixin, PermissionRequiredMixin, View):
             ]
 
         # Apply filters and get students
-        students = StudentFilterService.filter_students(request.GET)
-        filter_info = StudentFilterService.get_filter_info(request.GET)
+        institution = get_user_institution(request.user)
+        students = StudentFilterService.filter_students(request.GET, institution)
+        filter_info = StudentFilterService.get_filter_info(request.GET, institution)
         organization = Institution.objects.first()
 
         # Handle CSV export
@@ -1,7 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, View
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import OuterRef, Q, Subquery
 from django.http import HttpResponse
 from django.utils import timezone
 from django.contrib import messages
@@ -11,10 +11,27 @@ import csv
 from apps.core.mixins import DirectorRequiredMixin,StaffManagementRequiredMixin
 from .models import Student
 from apps.academics.models import Class,Section
+from apps.finance.models import Payment
 from apps.core.utils import get_user_institution
 
 from utils.utils import render_to_pdf, export_pdf_response, qr_generate
 
+EXPORT_COLUMNS = [
+    ("admission_number", "Admission Number"), ("full_name", "Full Name"), ("email", "Email"),
+    ("mobile", "Mobile"), ("date_of_birth", "Date of Birth"), ("gender", "Gender"),
+    ("blood_group", "Blood Group"), ("category", "Category"), ("religion", "Religion"),
+    ("roll_number", "Roll Number"), ("enrollment_date", "Enrollment Date"),
+    ("admission_type", "Admission Type"), ("academic_year", "Academic Year"),
+    ("current_class", "Class"), ("section", "Section"), ("age", "Age"), ("status", "Status"),
+    ("fee_status", "Fee Status"),
+]
+# Added with ?profile=1; read from Student.objects.with_profile_bundle()
+PROFILE_COLUMNS = [
+    ("father", "Father"), ("mother", "Mother"), ("guardian_phone", "Guardian Phone"),
+    ("permanent_address", "Permanent Address"), ("current_address", "Current Address"),
+    ("photo", "Photo"),
+]
+
 class StudentExportDetailView(StaffManagementRequiredMixin, View):
     """
     Export detailed student data for a specific student (id wise).
@@ -26,7 +43,9 @@ class StudentExportDetailView(StaffManagementRequiredMixin, View):
         
         # Get student record
         student = get_object_or_404(
-            Student.objects.select_related('institution', 'current_class', 'section', 'academic_year'),
+            Student.objects.select_related(
+                'institution', 'current_class', 'section', 'academic_year', 'medical_info'
+            ).with_profile_bundle(),
             id=pk,
             institution=get_user_institution(request.user)
         )
@@ -173,12 +192,17 @@ class StudentExportView(StaffManagementRequiredMixin, View):
         religion = request.GET.get("religion")
         admission_type = request.GET.get("admission_type")
         search_query = request.GET.get("search")
+        profile = request.GET.get("profile") in ("1", "true", "on")
 
         # Base queryset filtered by institution
         student_qs = Student.objects.select_related(
-            'institution', 'current_class', 'section', 'academic_year'
+            'institution', 'current_class', 'section__class_name', 'academic_year'
         ).filter(
             institution=get_user_institution(request.user)
+        ).annotate(
+            latest_payment_status=Subquery(
+                Payment.objects.filter(student=OuterRef('pk')).order_by('-created_at').values('status')[:1]
+            )
         )
 
         # Apply filters
@@ -216,6 +240,9 @@ class StudentExportView(StaffManagementRequiredMixin, View):
             )
 
         student_qs = student_qs.filter(filters).distinct().order_by('first_name', 'last_name')
+        if profile:
+            # Guardians, addresses and documents: three queries for the whole export
+            student_qs = student_qs.with_profile_bundle()
 
         # Summary info
         total_count = student_qs.count()
@@ -270,6 +297,18 @@ class StudentExportView(StaffManagementRequiredMixin, View):
                 "status": student.get_status_display(),
                 "fee_status": student.fee_status,
             })
+            if profile:
+                father, mother, primary = student.father, student.mother, student.primary_guardian
+                photo = student.get_photo()
+                rows[-1].update({
+                    "father": father.name if father else "N/A",
+                    "mother": mother.name if mother else "N/A",
+                    "guardian_phone": (primary.phone if primary else "") or "N/A",
+                    "permanent_address": student.permanent_address or "N/A",
+                    "current_address": student.current_address or "N/A",
+                    "photo": request.build_absolute_uri(photo.file.url) if photo and photo.file else "N/A",
+                })
+        columns = EXPORT_COLUMNS + (PROFILE_COLUMNS if profile else [])
 
         # CSV Export
         if fmt == "csv":
@@ -278,20 +317,9 @@ class StudentExportView(StaffManagementRequiredMixin, View):
             # Add summary at top
             writer.writerow([f"Total Students: {total_count}", f"Active Students: {active_count}", f"Report Generated: {export_date}"])
             writer.writerow([])  # Empty row
-            writer.writerow([
-                "Admission Number", "Full Name", "Email", "Mobile", "Date of Birth",
-                "Gender", "Blood Group", "Category", "Religion", "Roll Number",
-                "Enrollment Date", "Admission Type", "Academic Year", "Class",
-                "Section", "Age", "Status", "Fee Status"
-            ])
+            writer.writerow([label for _, label in columns])
             for r in rows:
-                writer.writerow([
-                    r["admission_number"], r["full_name"], r["email"], r["mobile"],
-                    r["date_of_birth"], r["gender"], r["blood_group"], r["category"],
-                    r["religion"], r["roll_number"], r["enrollment_date"],
-                    r["admission_type"], r["academic_year"], r["current_class"],
-                    r["section"], r["age"], r["status"], r["fee_status"]
-                ])
+                writer.writerow([r[key] for key, _ in columns])
             resp = HttpResponse(buffer.getvalue(), content_type="text/csv")
             resp["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
             return resp
@@ -329,20 +357,9 @@ class StudentExportView(StaffManagementRequiredMixin, View):
             # Add summary at top
             writer.writerow([f"Total Students: {total_count}", f"Active Students: {active_count}", f"Report Generated: {export_date}"])
             writer.writerow([])  # Empty row
-            writer.writerow([
-                "Admission Number", "Full Name", "Email", "Mobile", "Date of Birth",
-                "Gender", "Blood Group", "Category", "Religion", "Roll Number",
-                "Enrollment Date", "Admission Type", "Academic Year", "Class",
-                "Section", "Age", "Status", "Fee Status"
-            ])
+            writer.writerow([label for _, label in columns])
             for r in rows:
-                writer.writerow([
-                    r["admission_number"], r["full_name"], r["email"], r["mobile"],
-                    r["date_of_birth"], r["gender"], r["blood_group"], r["category"],
-                    r["religion"], r["roll_number"], r["enrollment_date"],
-                    r["admission_type"], r["academic_year"], r["current_class"],
-                    r["section"], r["age"], r["status"], r["fee_status"]
-                ])
+                writer.writerow([r[key] for key, _ in columns])
             resp = HttpResponse(buffer.getvalue(), content_type="application/vnd.ms-excel")
             resp["Content-Disposition"] = f'attachment; filename="{filename}.xls"'
             return resp
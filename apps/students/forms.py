@@ -10,8 +10,10 @@ from .models import (
 )
 from apps.core.forms import BaseForm,BaseSearchForm
 from apps.academics.models import Class, Section, AcademicYear
+from apps.examination.models import Exam
 from django.db.models import Q
 from .models import Student
+from .promotion import DEFAULT_MIN_PERCENTAGE, suggest_class_map
 phone_regex = RegexValidator(
     regex=r"^\+?1?\d{9,15}$",
     message=_("Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."),
@@ -512,25 +514,143 @@ class GuardianSearchForm(BaseSearchForm):
 # -------------------- Bulk Upload Form --------------------
 class StudentBulkUploadForm(BaseSearchForm):
     file = forms.FileField(
-        label=_('CSV File'),
-        help_text=_('Upload a CSV file containing student data.'),
-        widget=forms.FileInput(attrs={'accept': '.csv'})
+        label=_('CSV or Excel File'),
+        help_text=_('Upload a .csv or .xlsx file with one student per row.'),
+        widget=forms.FileInput(attrs={'accept': '.csv,.xlsx'})
     )
-    
+    academic_year = forms.ModelChoiceField(
+        queryset=AcademicYear.objects.none(),
+        required=False,
+        label=_('Academic Year'),
+        help_text=_('Used for rows without an academic_year column.'),
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        label=_('Dry run (validate only, save nothing)'),
+    )
+    skip_invalid = forms.BooleanField(
+        required=False,
+        label=_('Import valid rows even if some rows have errors'),
+    )
+
+    def __init__(self, *args, institution=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if institution is not None:
+            self.fields['academic_year'].queryset = AcademicYear.objects.filter(
+                institution=institution
+            ).order_by('-start_date')
+            self.fields['academic_year'].initial = self.fields['academic_year'].queryset.filter(
+                is_current=True
+            ).first()
+
     def clean_file(self):
         file = self.cleaned_data.get('file')
         if file:
             # Check file extension
-            if not file.name.endswith('.csv'):
-                raise ValidationError(_('File must be a CSV file.'))
+            if not file.name.lower().endswith(('.csv', '.xlsx')):
+                raise ValidationError(_('File must be a CSV or Excel (.xlsx) file.'))
                 
-            # Check file size (max 5MB)
-            if file.size > 5 * 1024 * 1024:
-                raise ValidationError(_('File size must be less than 5MB.'))
+            # Check file size (max 20MB, ~50k rows)
+            if file.size > 20 * 1024 * 1024:
+                raise ValidationError(_('File size must be less than 20MB.'))
                 
         return file
 
 
+class StudentPromotionForm(BaseSearchForm):
+    """Year-end promotion settings plus one target field per class (see students/promotion.py)."""
+    GRADUATE = 'graduate'
+
+    from_year = forms.ModelChoiceField(
+        queryset=AcademicYear.objects.none(),
+        label=_('Promote from'),
+    )
+    to_year = forms.ModelChoiceField(
+        queryset=AcademicYear.objects.none(),
+        label=_('Promote into'),
+    )
+    exams = forms.ModelMultipleChoiceField(
+        queryset=Exam.objects.none(),
+        required=False,
+        label=_('Exams'),
+        help_text=_('Results counted for the decision. Default: every published exam of the year promoted from.'),
+    )
+    min_percentage = forms.DecimalField(
+        initial=DEFAULT_MIN_PERCENTAGE,
+        min_value=0,
+        max_value=100,
+        decimal_places=2,
+        label=_('Minimum percentage'),
+        help_text=_('Needed for promotion. The recorded result is Pass from 33% whatever this is.'),
+    )
+    max_failed_subjects = forms.IntegerField(
+        initial=0,
+        min_value=0,
+        label=_('Failed subjects allowed'),
+    )
+    promote_without_results = forms.BooleanField(
+        required=False,
+        label=_('Promote students without exam results'),
+    )
+    preview = forms.BooleanField(
+        required=False,
+        initial=True,
+        label=_('Preview (show the decisions, save nothing)'),
+    )
+
+    def __init__(self, *args, institution=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.classes = []
+        if institution is None:
+            return
+        years = AcademicYear.objects.filter(institution=institution).order_by('-start_date')
+        self.fields['from_year'].queryset = years
+        self.fields['to_year'].queryset = years
+        self.fields['exams'].queryset = Exam.objects.filter(institution=institution).select_related('academic_year')
+
+        current = next((year for year in years if year.is_current), None)
+        if current is not None:
+            self.fields['from_year'].initial = current
+            self.fields['to_year'].initial = next(
+                (year for year in years if year.start_date > current.start_date), None
+            )
+
+        suggested = suggest_class_map(Class.objects.filter(institution=institution))
+        self.classes = list(suggested)
+        choices = [('', _('Not promoted in this run')), (self.GRADUATE, _('Graduate (alumni)'))]
+        choices += [(str(klass.pk), klass.name) for klass in self.classes]
+        for klass, target in suggested.items():
+            self.fields[f'class_{klass.pk}'] = forms.ChoiceField(
+                choices=choices,
+                required=False,
+                initial=str(target.pk) if target else self.GRADUATE,
+                label=klass.name,
+                widget=forms.Select(attrs={'class': 'form-select form-select-sm'}),
+            )
+
+    def mapping_fields(self):
+        return [self[f'class_{klass.pk}'] for klass in self.classes]
+
+    def class_map(self):
+        """{source class id: target class id, or None to graduate} of the mapped classes."""
+        mapping = {}
+        for klass in self.classes:
+            target = self.cleaned_data.get(f'class_{klass.pk}')
+            if target:
+                mapping[klass.pk] = None if target == self.GRADUATE else target
+        return mapping
+
+    def clean(self):
+        cleaned_data = super().clean()
+        from_year, to_year = cleaned_data.get('from_year'), cleaned_data.get('to_year')
+        if from_year and to_year and from_year == to_year:
+            self.add_error('to_year', _('Choose a different academic year to promote into.'))
+        if self.classes and not self.class_map():
+            raise ValidationError(_('Map at least one class.'))
+        return cleaned_data
+
+
 # -------------------- Quick Action Forms --------------------
 class StudentStatusForm(BaseForm):
     class Meta:
@@ -618,6 +738,16 @@ class StudentFilterForm(BaseSearchForm):
         required=False,
         label='Gender'
     )
+    blood_group = forms.ChoiceField(
+        choices=[('', 'All Blood Groups')] + list(Student.BLOOD_GROUP_CHOICES),
+        required=False,
+        label='Blood Group'
+    )
+    admission_type = forms.ChoiceField(
+        choices=[('', 'All Admission Types')] + list(Student.ADMISSION_TYPE_CHOICES),
+        required=False,
+        label='Admission Type'
+    )
     has_hostel = forms.ChoiceField(
         choices=[('', 'All Students'), ('yes', 'Yes'), ('no', 'No')],
         required=False,
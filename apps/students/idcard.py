@@ -1,12 +1,17 @@
 import os
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
-import qrcode
+from utils.lazy import lazy_import
 import random
 from django.http import HttpResponse
 import textwrap
 from django.utils.encoding import force_str
 from django.conf import settings
+from utils.assets import local_path
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+qrcode = lazy_import('qrcode')
 
 class StudentIDCardGenerator:
     """
@@ -254,10 +259,10 @@ class StudentIDCardGenerator:
         # Get the photo document
         photo_doc = self.student.documents.filter(doc_type="PHOTO").first()
 
-        if photo_doc and hasattr(photo_doc.file, 'path'):
+        if photo_doc and photo_doc.file:
             try:
-                # Ensure the path is a string
-                photo_path = self._ensure_string_path(photo_doc.file.path)
+                # Ensure the path is a string (remote files come from the asset cache)
+                photo_path = self._ensure_string_path(local_path(photo_doc.file))
                 
                 if photo_path and os.path.exists(photo_path):
                     photo_img = Image.open(photo_path).convert("RGBA")
@@ -0,0 +1,411 @@
+# students/imports.py
+"""
+Bulk admission import: one CSV/XLSX row per student, optionally with a primary
+guardian and a permanent address.
+
+Saving students one by one runs Student.save (full_clean, admission number),
+the core/signals User and UserProfile receivers, the search and audit signals:
+a dozen queries per student. The importer instead
+
+    1. reads and validates every row first, in chunks (model field validation,
+       Student.clean, class/section/year lookups from one preload, duplicate
+       emails and admission numbers inside the file and against the database
+       with one query per chunk),
+    2. then writes chunk by chunk, one transaction each: a block of admission
+       numbers from core.sequences, and bulk_create of User, UserProfile,
+       Student, Guardian and StudentAddress, followed by the search documents
+       and audit events the skipped signals would have written. A chunk that
+       fails to write stops the import; the chunks before it stay imported
+       and the report says how far it got (ImportReport.failure).
+
+Imported users get an unusable password; they sign in after a password reset.
+
+    importer = StudentImporter(institution, academic_year=year)
+    report = importer.run(read_rows(upload), dry_run=True)
+    report.errors  # [RowError(line=14, field='email', message='...')]
+
+Also available as `manage.py import_students admissions.xlsx --institution CODE`.
+"""
+import csv
+import datetime
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.academics.models import AcademicYear, Class, Section
+from apps.core import audit, search
+from apps.core.cache import bump_namespace
+from apps.users.models import User, UserProfile
+from utils.lazy import lazy_import
+
+from .models import Guardian, Student, StudentAddress
+from .services.facets import STUDENT_FACETS_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+openpyxl = lazy_import('openpyxl')
+
+CHUNK_SIZE = 1000
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y')
+
+STUDENT_COLUMNS = (
+    'first_name', 'last_name', 'email', 'mobile', 'date_of_birth', 'gender',
+    'admission_number', 'roll_number', 'enrollment_date', 'admission_type',
+    'category', 'religion', 'blood_group', 'status',
+)
+RELATION_COLUMNS = ('academic_year', 'class', 'section')
+GUARDIAN_COLUMNS = {
+    'guardian_name': 'name', 'guardian_relation': 'relation', 'guardian_phone': 'phone',
+    'guardian_email': 'email', 'guardian_occupation': 'occupation',
+}
+ADDRESS_COLUMNS = ('address_line1', 'address_line2', 'city', 'state', 'pincode', 'country')
+COLUMNS = STUDENT_COLUMNS + RELATION_COLUMNS + tuple(GUARDIAN_COLUMNS) + ADDRESS_COLUMNS
+REQUIRED_COLUMNS = ('first_name', 'last_name', 'email', 'mobile', 'date_of_birth', 'gender')
+ALIASES = {'current_class': 'class', 'dob': 'date_of_birth', 'phone': 'mobile', 'address': 'address_line1'}
+
+# Resolved by the importer itself; full_clean would check each with a query
+RELATION_FIELDS = ['user', 'institution', 'academic_year', 'current_class', 'section']
+
+
+@dataclass
+class RowError:
+    line: int
+    field: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    valid: int = 0
+    created: int = 0
+    guardians: int = 0
+    addresses: int = 0
+    chunks: int = 0
+    dry_run: bool = False
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+    # Set when a chunk failed to write: its lines and the error; `unwritten`
+    # valid rows (that chunk and the ones after it) were not imported
+    failure: str = ''
+    unwritten: int = 0
+
+    @property
+    def invalid_lines(self):
+        return len({error.line for error in self.errors})
+
+    def summary(self):
+        if self.dry_run:
+            outcome = f"{self.valid} of {self.rows} row(s) valid, nothing saved (dry run)"
+        else:
+            outcome = f"{self.created} of {self.rows} student(s) imported"
+        if self.failure:
+            outcome += (
+                f" in {self.chunks} chunk(s), then stopped at {self.failure}; "
+                f"{self.unwritten} valid row(s) not imported"
+            )
+        return f"{outcome}; {self.invalid_lines} row(s) with errors; {self.elapsed:.1f}s"
+
+
+def _header(name):
+    name = str(name or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return ALIASES.get(name, name)
+
+
+def read_rows(upload):
+    """Rows of an uploaded .csv or .xlsx file as dicts keyed by normalised column name."""
+    name = getattr(upload, 'name', '') or ''
+    if name.lower().endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(upload, read_only=True, data_only=True)
+        try:
+            values = workbook.active.iter_rows(values_only=True)
+            header = [_header(cell) for cell in next(values, ())]
+            for row in values:
+                if any(cell not in (None, '') for cell in row):
+                    yield dict(zip(header, row))
+        finally:
+            workbook.close()
+        return
+
+    content = upload.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    reader = csv.reader(io.StringIO(content))
+    header = [_header(cell) for cell in next(reader, [])]
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield dict(zip(header, row))
+
+
+def template_csv():
+    """Header row (and nothing else) of an import file."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(COLUMNS)
+    return buffer.getvalue()
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # XLSX numbers: 9876543210.0
+    return str(value).strip()
+
+
+def _date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    value = _text(value)
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValidationError(f"Unrecognised date '{value}' (use YYYY-MM-DD or DD/MM/YYYY)")
+
+
+def _choice(value, choices):
+    """Accept a choice by its code or its label, case-insensitively."""
+    value = _text(value)
+    if not value:
+        return ''
+    for code, label in choices:
+        if value.lower() in (str(code).lower(), str(label).lower()):
+            return code
+    return value  # left for clean_fields to reject
+
+
+class StudentImporter:
+    """Validates and imports admission rows for one institution."""
+
+    def __init__(self, institution, academic_year=None, chunk_size=CHUNK_SIZE):
+        self.institution = institution
+        self.academic_year = academic_year
+        self.chunk_size = chunk_size
+
+        self.years = {
+            year.name.lower(): year for year in AcademicYear.objects.filter(institution=institution)
+        }
+        self.classes = {}
+        for class_obj in Class.objects.filter(institution=institution):
+            self.classes.setdefault(class_obj.name.lower(), class_obj)
+            self.classes.setdefault(class_obj.code.lower(), class_obj)
+        self.sections = {
+            (section.class_name_id, section.name.lower()): section
+            for section in Section.objects.filter(institution=institution).select_related('class_name')
+        }
+
+    # ---- validation -----------------------------------------------------
+
+    def build(self, row):
+        """Unsaved (student, guardian, address) for one row; raises ValidationError."""
+        errors = {}
+        values = {}
+        for name in STUDENT_COLUMNS:
+            raw = row.get(name)
+            try:
+                if name in ('date_of_birth', 'enrollment_date'):
+                    values[name] = _date(raw)
+                else:
+                    model_field = Student._meta.get_field(name)
+                    values[name] = _choice(raw, model_field.choices) if model_field.choices else _text(raw)
+            except ValidationError as e:
+                errors[name] = e.messages
+
+        values['email'] = BaseUserManager.normalize_email(values.get('email', ''))
+        values['enrollment_date'] = values.get('enrollment_date') or timezone.now().date()
+        values['admission_type'] = values.get('admission_type') or 'REGULAR'
+        values['status'] = values.get('status') or 'ACTIVE'
+
+        academic_year = self.academic_year
+        if _text(row.get('academic_year')):
+            academic_year = self.years.get(_text(row['academic_year']).lower())
+            if academic_year is None:
+                errors['academic_year'] = [f"Unknown academic year '{_text(row['academic_year'])}'"]
+        elif academic_year is None:
+            errors['academic_year'] = ["No academic year: choose a default or fill the academic_year column"]
+        current_class = section = None
+        if _text(row.get('class')):
+            current_class = self.classes.get(_text(row['class']).lower())
+            if current_class is None:
+                errors['class'] = [f"Unknown class '{_text(row['class'])}'"]
+        if _text(row.get('section')):
+            if current_class is None:
+                errors.setdefault('section', ["A section needs a valid class"])
+            else:
+                section = self.sections.get((current_class.pk, _text(row['section']).lower()))
+                if section is None:
+                    errors['section'] = [f"Unknown section '{_text(row['section'])}' of {current_class.name}"]
+
+        student = Student(
+            institution=self.institution, academic_year=academic_year,
+            current_class=current_class, section=section,
+            **{name: value for name, value in values.items() if name not in errors},
+        )
+        self._clean(student, errors, exclude=RELATION_FIELDS + list(errors))
+
+        guardian = None
+        if any(_text(row.get(column)) for column in GUARDIAN_COLUMNS):
+            guardian = Guardian(student=student, is_primary=True, **{
+                name: (_choice(row.get(column), Guardian._meta.get_field(name).choices)
+                       if name in ('relation', 'occupation') else _text(row.get(column)))
+                for column, name in GUARDIAN_COLUMNS.items()
+            })
+            guardian.relation = guardian.relation or 'GUARDIAN'
+            # Guardian.clean looks up other primary guardians; a new student has none
+            self._clean(guardian, errors, exclude=['student'], prefix='guardian_', model_clean=False)
+
+        address = None
+        if any(_text(row.get(column)) for column in ADDRESS_COLUMNS if column != 'country'):
+            address = StudentAddress(student=student, address_type='PERMANENT', **{
+                column: _text(row.get(column)) for column in ADDRESS_COLUMNS if _text(row.get(column))
+            })
+            self._clean(address, errors, exclude=['student'])
+
+        if errors:
+            raise ValidationError(errors)
+        return student, guardian, address
+
+    def _clean(self, obj, errors, exclude, prefix='', model_clean=True):
+        try:
+            obj.clean_fields(exclude=exclude)
+            if model_clean:
+                obj.clean()
+        except ValidationError as e:
+            for name, messages in e.message_dict.items():
+                key = 'row' if name == NON_FIELD_ERRORS else f'{prefix}{name}'
+                errors.setdefault(key, []).extend(messages)
+
+    def validate(self, rows, report):
+        """Yield chunks of [(line, student, guardian, address)] for the valid rows."""
+        seen_emails = {}
+        seen_numbers = {}
+        chunk = []
+
+        def checked(chunk):
+            emails = {student.email.lower() for _, student, _, _ in chunk}
+            numbers = {student.admission_number for _, student, _, _ in chunk if student.admission_number}
+            taken_emails = {
+                email.lower() for email in User.objects.filter(email__in=[s.email for _, s, _, _ in chunk])
+                .values_list('email', flat=True)
+            } if emails else set()
+            taken_numbers = set(
+                Student.objects.filter(admission_number__in=numbers).values_list('admission_number', flat=True)
+            ) if numbers else set()
+            valid = []
+            for entry in chunk:
+                line, student = entry[0], entry[1]
+                if student.email.lower() in taken_emails:
+                    report.errors.append(RowError(line, 'email', f"A user with email {student.email} already exists"))
+                elif student.admission_number in taken_numbers:
+                    report.errors.append(RowError(
+                        line, 'admission_number', f"Admission number {student.admission_number} already exists"))
+                else:
+                    valid.append(entry)
+            report.valid += len(valid)
+            return valid
+
+        for line, row in enumerate(rows, start=2):  # line 1 is the header
+            if line == 2:
+                missing = [column for column in REQUIRED_COLUMNS if column not in row]
+                if missing:
+                    report.errors.append(RowError(1, 'header', f"Missing column(s): {', '.join(missing)}"))
+                    return
+            report.rows += 1
+            try:
+                student, guardian, address = self.build(row)
+            except ValidationError as e:
+                report.errors.extend(
+                    RowError(line, name, message) for name, messages in e.message_dict.items() for message in messages
+                )
+                continue
+
+            email = student.email.lower()
+            if email in seen_emails:
+                report.errors.append(RowError(line, 'email', f"Duplicate of line {seen_emails[email]}"))
+                continue
+            seen_emails[email] = line
+            if student.admission_number:
+                if student.admission_number in seen_numbers:
+                    report.errors.append(RowError(
+                        line, 'admission_number', f"Duplicate of line {seen_numbers[student.admission_number]}"))
+                    continue
+                seen_numbers[student.admission_number] = line
+
+            chunk.append((line, student, guardian, address))
+            if len(chunk) >= self.chunk_size:
+                yield checked(chunk)
+                chunk = []
+        if chunk:
+            yield checked(chunk)
+
+    # ---- import ---------------------------------------------------------
+
+    def run(self, rows, dry_run=False, skip_invalid=False):
+        """
+        Validate all rows, then import them unless `dry_run`. With errors
+        nothing is imported, unless `skip_invalid` (the valid rows are). A
+        chunk that fails to write is rolled back and ends the import; the
+        report keeps the chunks committed before it.
+        """
+        start = time.perf_counter()
+        report = ImportReport(dry_run=dry_run)
+        chunks = [chunk for chunk in self.validate(rows, report) if chunk]
+        report.errors.sort(key=lambda error: error.line)
+
+        if not dry_run and (skip_invalid or not report.errors):
+            for index, chunk in enumerate(chunks):
+                try:
+                    self.write(chunk, report)
+                except Exception as e:
+                    logger.exception(f"Student import stopped at chunk {index + 1} of {len(chunks)}")
+                    report.failure = f"lines {chunk[0][0]}-{chunk[-1][0]}: {e}"
+                    report.unwritten = sum(len(rest) for rest in chunks[index:])
+                    break
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def write(self, chunk, report):
+        students = [student for _, student, _, _ in chunk]
+        guardians = [guardian for _, _, guardian, _ in chunk if guardian]
+        addresses = [address for _, _, _, address in chunk if address]
+
+        with transaction.atomic():
+            Student.ADMISSION_NUMBER.assign(students)
+            users = []
+            for student in students:
+                user = User(
+                    email=student.email, first_name=student.first_name, last_name=student.last_name,
+                    role=User.Role.STUDENT,
+                )
+                user.set_unusable_password()
+                users.append(user)
+                student.user = user
+
+            User.objects.bulk_create(users)
+            UserProfile.objects.bulk_create(
+                [UserProfile(user=user, institution=self.institution) for user in users]
+            )
+            Student.objects.bulk_create(students)
+            Guardian.objects.bulk_create(guardians)
+            StudentAddress.objects.bulk_create(addresses)
+
+            # What the skipped post_save signals would have done
+            search.index_new(students)
+            audit.record_created(Student, students)
+            transaction.on_commit(lambda: bump_namespace(self.institution, STUDENT_FACETS_NAMESPACE))
+
+        report.created += len(students)
+        report.guardians += len(guardians)
+        report.addresses += len(addresses)
+        report.chunks += 1
@@ -0,0 +1,59 @@
+# apps/students/management/commands/import_students.py
+"""
+Bulk admission import from a CSV or XLSX file (see apps/students/imports.py):
+
+    python manage.py import_students admissions.xlsx --institution SCALE001 --dry-run
+    python manage.py import_students admissions.csv --institution SCALE001 --academic-year 2025-26
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.academics.models import AcademicYear
+from apps.organization.models import Institution
+from apps.students.imports import CHUNK_SIZE, StudentImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import students (with guardian and address) from a CSV/XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='.csv or .xlsx file, one student per row')
+        parser.add_argument('--institution', required=True, help='Institution code')
+        parser.add_argument('--academic-year', help='Academic year name for rows without one (default: current)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per validation/insert chunk')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report, save nothing')
+        parser.add_argument('--skip-invalid', action='store_true', help='Import the valid rows despite errors')
+        parser.add_argument('--max-errors', type=int, default=50, help='Errors to print')
+
+    def handle(self, *args, **options):
+        institution = Institution.objects.filter(code=options['institution']).first()
+        if institution is None:
+            raise CommandError(f"Institution {options['institution']} not found")
+
+        years = AcademicYear.objects.filter(institution=institution)
+        if options['academic_year']:
+            academic_year = years.filter(name=options['academic_year']).first()
+            if academic_year is None:
+                raise CommandError(f"Academic year {options['academic_year']} not found")
+        else:
+            academic_year = years.filter(is_current=True).first()
+
+        importer = StudentImporter(institution, academic_year, chunk_size=options['chunk_size'])
+        try:
+            with open(options['file'], 'rb') as upload:
+                report = importer.run(
+                    read_rows(upload), dry_run=options['dry_run'], skip_invalid=options['skip_invalid'],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in report.errors[:options['max_errors']]:
+            self.stdout.write(self.style.ERROR(f'  line {error.line}: {error.field}: {error.message}'))
+        if len(report.errors) > options['max_errors']:
+            self.stdout.write(f'  ... {len(report.errors) - options["max_errors"]} more error(s)')
+
+        if report.failure:
+            raise CommandError(report.summary())
+        style = self.style.SUCCESS if report.created or (report.dry_run and not report.errors) else self.style.WARNING
+        self.stdout.write(style(report.summary()))
+        if report.errors and not report.dry_run and not options['skip_invalid']:
+            self.stdout.write('Nothing imported; fix the rows above or pass --skip-invalid')
@@ -0,0 +1,86 @@
+# apps/students/management/commands/promote_students.py
+"""
+Year-end promotion of whole classes (see apps/students/promotion.py):
+
+    python manage.py promote_students --institution SCALE001 --from-year 2024-25 --to-year 2025-26 --auto --preview
+    python manage.py promote_students --institution SCALE001 --from-year 2024-25 --to-year 2025-26 \\
+        --map C9:C10 --map C12: --exam "Annual 2024-25" --min-percentage 40
+
+--map takes class codes; an empty target graduates the class.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.academics.models import AcademicYear, Class
+from apps.examination.models import Exam
+from apps.organization.models import Institution
+from apps.students.promotion import DEFAULT_MIN_PERCENTAGE, PromotionEngine, suggest_class_map
+
+
+class Command(BaseCommand):
+    help = 'Promote the students of one academic year into the next'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--institution', required=True, help='Institution code')
+        parser.add_argument('--from-year', required=True, help='Academic year name promoted from')
+        parser.add_argument('--to-year', required=True, help='Academic year name promoted into')
+        parser.add_argument('--map', action='append', default=[], metavar='FROM:TO',
+                            help='Class code mapping; repeat per class, empty TO graduates')
+        parser.add_argument('--auto', action='store_true',
+                            help='Map every class to the next one by name, the last one graduates')
+        parser.add_argument('--exam', action='append', default=[],
+                            help='Exam name to count (repeatable; default: published exams of --from-year)')
+        parser.add_argument('--min-percentage', default=str(DEFAULT_MIN_PERCENTAGE), help='Pass percentage')
+        parser.add_argument('--max-failed-subjects', type=int, default=0, help='Failed subjects allowed')
+        parser.add_argument('--promote-without-results', action='store_true',
+                            help='Promote students without exam results instead of retaining them')
+        parser.add_argument('--preview', action='store_true', help='Report the decisions, save nothing')
+
+    def handle(self, *args, **options):
+        institution = Institution.objects.filter(code=options['institution']).first()
+        if institution is None:
+            raise CommandError(f"Institution {options['institution']} not found")
+
+        years = AcademicYear.objects.filter(institution=institution)
+        from_year = years.filter(name=options['from_year']).first()
+        to_year = years.filter(name=options['to_year']).first()
+        for name, year in ((options['from_year'], from_year), (options['to_year'], to_year)):
+            if year is None:
+                raise CommandError(f"Academic year {name} not found")
+
+        classes = {klass.code: klass for klass in Class.objects.filter(institution=institution)}
+        class_map = suggest_class_map(classes.values()) if options['auto'] else {}
+        for mapping in options['map']:
+            source, _, target = mapping.partition(':')
+            if source not in classes or (target and target not in classes):
+                raise CommandError(f"Unknown class code in --map {mapping}")
+            class_map[classes[source]] = classes[target] if target else None
+        if not class_map:
+            raise CommandError('Pass --auto or at least one --map FROM:TO')
+
+        exams = None
+        if options['exam']:
+            exams = list(Exam.objects.filter(institution=institution, name__in=options['exam']))
+            missing = set(options['exam']) - {exam.name for exam in exams}
+            if missing:
+                raise CommandError(f"Exams not found: {', '.join(sorted(missing))}")
+
+        try:
+            engine = PromotionEngine(
+                institution, from_year, to_year, class_map, exams=exams,
+                min_percentage=options['min_percentage'],
+                max_failed_subjects=options['max_failed_subjects'],
+                promote_without_results=options['promote_without_results'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        report = engine.run(dry_run=options['preview'])
+
+        for row in report.classes():
+            target = row['target'].name if row['target'] else 'alumni'
+            self.stdout.write(
+                f"  {row['class'].name} -> {target}: {row['students']} student(s), "
+                f"{row['promoted']} promoted, {row['graduated']} graduated, {row['retained']} retained"
+            )
+        self.stdout.write(self.style.SUCCESS(report.summary()))
+        if not report.dry_run:
+            self.stdout.write(f"{report.histories} history row(s), {report.updates} UPDATE statement(s)")
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.urls import reverse
+from apps.core.sequences import NumberFormat
 
 # Phone regex for validation
 phone_regex = RegexValidator(
@@ -16,6 +17,21 @@ phone_regex = RegexValidator(
 )
 
 # -------------------- Student Core --------------------
+class StudentQuerySet(models.QuerySet):
+    def with_profile_bundle(self):
+        """
+        Prefetch documents, guardians and addresses (one query each for the
+        whole queryset). get_photo/get_document, father, mother,
+        primary_guardian and the *_address properties then read them from
+        memory instead of querying per student.
+        """
+        return self.prefetch_related(
+            models.Prefetch('documents', queryset=StudentDocument.objects.order_by('pk')),
+            models.Prefetch('guardians', queryset=Guardian.objects.order_by('pk')),
+            models.Prefetch('addresses', queryset=StudentAddress.objects.order_by('pk')),
+        )
+
+
 class Student(models.Model):
     STATUS_CHOICES = (
         ("ACTIVE", _("Active")),
@@ -61,6 +77,10 @@ class Student(models.Model):
         ("JAIN", _("Jain")),
         ("OTHER", _("Other")),
     )
+    # ADM-<institution code>-<year>-0001, per-institution sequence (core.sequences)
+    ADMISSION_NUMBER = NumberFormat(
+        'admission_number', lambda student: f"ADM-{student.institution.code}-{timezone.now().year}-"
+    )
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(
@@ -146,19 +166,41 @@ class Student(models.Model):
             models.Index(fields=['status']),
         ]
 
+    objects = StudentQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.admission_number} - {self.first_name} {self.last_name}"
 
     def get_absolute_url(self):
         return reverse('students:student_detail', kwargs={'pk': self.pk})
-    
+
+    def _profile_map(self, relation, field):
+        """
+        {value of `field`: first row} over `relation` when it was prefetched
+        (with_profile_bundle), else None and the caller queries.
+        """
+        rows = getattr(self, '_prefetched_objects_cache', {}).get(relation)
+        if rows is None:
+            return None
+        maps = self.__dict__.setdefault('_profile_maps', {})
+        cached = maps.get((relation, field))
+        if cached is None or cached[0] is not rows:
+            mapping = {}
+            for row in rows:
+                mapping.setdefault(getattr(row, field), row)
+            cached = maps[(relation, field)] = (rows, mapping)
+        return cached[1]
+
     def get_document(self, doc_type):
         """Return the first document of the given type, or None."""
+        documents = self._profile_map('documents', 'doc_type')
+        if documents is not None:
+            return documents.get(doc_type)
         return self.documents.filter(doc_type=doc_type).first()    
     
     def get_photo(self):
         """Return student's photo document or None"""
-        return self.documents.filter(doc_type="PHOTO").first()
+        return self.get_document("PHOTO")
 
     def get_birth_certificate(self):
         return self.get_document("BIRTH_CERTIFICATE")
@@ -221,18 +263,8 @@ class Student(models.Model):
     def save(self, *args, **kwargs):
         """Custom save method with automatic admission number generation"""
         if not self.admission_number:
-            # Generate admission number if not provided
-            prefix = f"ADM-{timezone.now().year}-"
-            last_student = Student.objects.filter(
-                admission_number__startswith=prefix
-            ).order_by('admission_number').last()
-            
-            if last_student:
-                last_number = int(last_student.admission_number.split('-')[-1])
-                self.admission_number = f"{prefix}{last_number + 1:04d}"
-            else:
-                self.admission_number = f"{prefix}0001"
-                
+            self.ADMISSION_NUMBER.assign([self])
+
         self.full_clean()
         super().save(*args, **kwargs)
 
@@ -250,23 +282,38 @@ class Student(models.Model):
     @property
     def fee_status(self):
         """Check latest fee payment status from finance app"""
+        if hasattr(self, "latest_payment_status"):
+            # Annotated by list/export querysets to avoid a query per student
+            return self.latest_payment_status or _("No Payment Record")
         latest_payment = self.payments.order_by("-created_at").first()
         if not latest_payment:
             return _("No Payment Record")
         return latest_payment.status
     
+    def _guardian(self, field, value):
+        guardians = self._profile_map('guardians', field)
+        if guardians is not None:
+            return guardians.get(value)
+        return self.guardians.filter(**{field: value}).first()
+
     @property
     def father(self):
-        return self.guardians.filter(relation="FATHER").first()
+        return self._guardian("relation", "FATHER")
 
     @property
     def mother(self):
-        return self.guardians.filter(relation="MOTHER").first()
-    
+        return self._guardian("relation", "MOTHER")
+
     @property
-    def permanent_address(self):
-        """Returns the formatted permanent address of the student"""
-        address = self.addresses.filter(address_type="PERMANENT").first()
+    def primary_guardian(self):
+        return self._guardian("is_primary", True)
+
+    def _address(self, field, value):
+        addresses = self._profile_map('addresses', field)
+        if addresses is not None:
+            address = addresses.get(value)
+        else:
+            address = self.addresses.filter(**{field: value}).first()
         if not address:
             return ""
         lines = [address.address_line1]
@@ -276,18 +323,15 @@ class Student(models.Model):
         lines.append(address.country)
         return ", ".join(lines)
 
+    @property
+    def permanent_address(self):
+        """Returns the formatted permanent address of the student"""
+        return self._address("address_type", "PERMANENT")
+
     @property
     def current_address(self):
         """Returns the formatted current/correspondence address of the student"""
-        address = self.addresses.filter(is_current=True).first()
-        if not address:
-            return ""
-        lines = [address.address_line1]
-        if address.address_line2:
-            lines.append(address.address_line2)
-        lines.append(f"{address.city}, {address.state} - {address.pincode}")
-        lines.append(address.country)
-        return ", ".join(lines)
+        return self._address("is_current", True)
         
 # -------------------- Guardian --------------------
 class Guardian(models.Model):
@@ -653,6 +697,8 @@ class StudentHistory(models.Model):
         ("COMPARTMENT", _("Compartment")),
         ("APPEARING", _("Appearing")),
     )
+    # Lowest percentage recorded as PASS (see clean())
+    PASS_PERCENTAGE = 33
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     student = models.ForeignKey(
@@ -745,9 +791,9 @@ class StudentHistory(models.Model):
         errors = {}
         
         if self.percentage is not None:
-            if self.result == "PASS" and self.percentage < 33:
+            if self.result == "PASS" and self.percentage < self.PASS_PERCENTAGE:
                 errors['percentage'] = _('Percentage should be at least 33 for PASS result')
-            elif self.result == "FAIL" and self.percentage >= 33:
+            elif self.result == "FAIL" and self.percentage >= self.PASS_PERCENTAGE:
                 errors['result'] = _('Result should be PASS if percentage is 33 or above')
 
         # Check for unique roll number within the same class and academic year
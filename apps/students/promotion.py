@@ -0,0 +1,297 @@
+# students/promotion.py
+"""
+Year-end promotion: move a year's students to their next class in one go.
+
+Editing students one by one runs Student.save and its signals for every
+student, and StudentHistory is written by hand afterwards. The engine instead
+
+    1. selects the active students of the mapped classes in the old academic
+       year (one query) and their exam totals (one grouped query over
+       ExamResult: marks obtained, maximum marks, subjects below pass marks),
+    2. decides per student: promoted when the percentage reaches
+       `min_percentage` with at most `max_failed_subjects` failed subjects,
+       retained otherwise; passing students of a class mapped to None graduate
+       (status ALUMNI). The result recorded in the history follows
+       StudentHistory's own rule whatever `min_percentage` is: FAIL below
+       PASS_PERCENTAGE (33), COMPARTMENT with too many failed subjects, PASS
+       otherwise,
+    3. writes, in one transaction, a StudentHistory row per student for the
+       old year (bulk_create; rows entered by hand are updated) and moves the
+       students with one UPDATE per (class, section, year, status) target,
+       followed by the audit events and the facet cache bump the skipped
+       signals would have done.
+
+Sections carry over by name ("Class 5 - B" -> "Class 6 - B"); without a
+section of that name the student is promoted without one. Only published exams
+of the old year count unless `exams` is given. Students without results are
+retained unless `promote_without_results` is set.
+
+    engine = PromotionEngine(institution, year_2024, year_2025, {class_5: class_6, class_12: None})
+    report = engine.run(dry_run=True)   # the preview: every decision, nothing saved
+    report = engine.run()
+
+Also available as `manage.py promote_students --institution CODE --from-year 2024-25
+--to-year 2025-26 --auto` (see suggest_class_map) or with explicit `--map C5:C6`.
+"""
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from apps.academics.models import Class, Section
+from apps.core import audit
+from apps.core.cache import bump_namespace
+from apps.examination.models import Exam, ExamResult
+
+from .models import Student, StudentHistory
+from .services.facets import STUDENT_FACETS_NAMESPACE
+
+DEFAULT_MIN_PERCENTAGE = Decimal(StudentHistory.PASS_PERCENTAGE)
+UPDATE_CHUNK_SIZE = 1000
+
+PROMOTED = 'promoted'
+RETAINED = 'retained'
+GRADUATED = 'graduated'
+
+_NUMBER = re.compile(r'(\d+)')
+
+
+def _natural_key(klass):
+    return [int(part) if part.isdigit() else part.lower() for part in _NUMBER.split(klass.name)]
+
+
+def suggest_class_map(classes):
+    """Each class to the next one in natural name order ("Class 9" -> "Class 10"); the last graduates."""
+    ordered = sorted((klass for klass in classes if klass.is_active), key=_natural_key)
+    return {klass: (ordered[index + 1] if index + 1 < len(ordered) else None) for index, klass in enumerate(ordered)}
+
+
+def history_result(percentage, failed_subjects, max_failed_subjects=0):
+    """StudentHistory.result for a percentage, consistent with StudentHistory.clean()."""
+    if percentage < StudentHistory.PASS_PERCENTAGE:
+        return 'FAIL'
+    return 'COMPARTMENT' if failed_subjects > max_failed_subjects else 'PASS'
+
+
+@dataclass
+class Decision:
+    student: Student
+    outcome: str
+    result: str
+    percentage: Decimal = None
+    failed_subjects: int = 0
+    to_class: Class = None
+    to_section: Section = None
+
+    @property
+    def promoted(self):
+        return self.outcome != RETAINED
+
+
+@dataclass
+class PromotionReport:
+    students: int = 0
+    promoted: int = 0
+    retained: int = 0
+    graduated: int = 0
+    without_results: int = 0
+    histories: int = 0
+    updates: int = 0
+    dry_run: bool = False
+    class_map: dict = field(default_factory=dict)
+    decisions: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def add(self, decision):
+        self.decisions.append(decision)
+        self.students += 1
+        setattr(self, decision.outcome, getattr(self, decision.outcome) + 1)
+        if decision.percentage is None:
+            self.without_results += 1
+
+    def classes(self):
+        """Per source class: target and promoted/retained/graduated counts, in class order."""
+        rows = {}
+        for decision in self.decisions:
+            klass = decision.student.current_class
+            row = rows.setdefault(klass.pk, {
+                'class': klass, 'target': self.class_map.get(klass.pk),
+                'students': 0, PROMOTED: 0, RETAINED: 0, GRADUATED: 0,
+            })
+            row['students'] += 1
+            row[decision.outcome] += 1
+        return sorted(rows.values(), key=lambda row: _natural_key(row['class']))
+
+    def summary(self):
+        outcome = (
+            f"{self.promoted} promoted, {self.graduated} graduated, {self.retained} retained "
+            f"of {self.students} student(s)"
+        )
+        if self.dry_run:
+            outcome += ", nothing saved (preview)"
+        if self.without_results:
+            outcome += f"; {self.without_results} without exam results"
+        return f"{outcome}; {self.elapsed:.1f}s"
+
+
+class PromotionEngine:
+    """
+    Promote the students of `from_year` into `to_year`. `class_map` maps
+    classes (or their ids) to the class they move to, None to graduate.
+    """
+
+    def __init__(self, institution, from_year, to_year, class_map, exams=None,
+                 min_percentage=DEFAULT_MIN_PERCENTAGE, max_failed_subjects=0, promote_without_results=False):
+        if from_year == to_year:
+            raise ValueError("The academic year to promote into must differ from the current one")
+        self.institution = institution
+        self.from_year = from_year
+        self.to_year = to_year
+        self.exams = exams
+        self.min_percentage = Decimal(str(min_percentage))
+        self.max_failed_subjects = max_failed_subjects
+        self.promote_without_results = promote_without_results
+
+        class_ids = {
+            str(getattr(source, 'pk', source)): str(getattr(target, 'pk', target)) if target else None
+            for source, target in class_map.items()
+        }
+        classes = {
+            str(pk): klass for pk, klass in Class.objects.filter(institution=institution).in_bulk(
+                set(class_ids) | {target for target in class_ids.values() if target}
+            ).items()
+        }
+        unknown = sorted(pk for pk in set(class_ids) | set(class_ids.values()) if pk and pk not in classes)
+        if unknown:
+            raise ValueError(f"Classes not found in {institution}: {', '.join(unknown)}")
+        self.class_map = {classes[source].pk: classes.get(target) for source, target in class_ids.items()}
+
+    def students(self, lock=False):
+        students = Student.objects.filter(
+            institution=self.institution,
+            academic_year=self.from_year,
+            status='ACTIVE',
+            current_class_id__in=list(self.class_map),
+        ).select_related('current_class', 'section').order_by('current_class__name', 'section__name', 'roll_number')
+        return students.select_for_update(of=('self',)) if lock else students
+
+    def totals(self, students):
+        """Exam totals per student id, from one grouped query."""
+        exams = self.exams
+        if exams is None:
+            exams = Exam.objects.filter(institution=self.institution, academic_year=self.from_year, is_published=True)
+        rows = (
+            ExamResult.objects.filter(student__in=students.values('pk'), exam_subject__exam__in=exams)
+            .values('student')
+            .annotate(
+                obtained=Sum('marks_obtained'),
+                maximum=Sum('exam_subject__max_marks'),
+                failed=Count('pk', filter=Q(marks_obtained__lt=F('exam_subject__pass_marks'))),
+            )
+            .order_by()
+        )
+        return {row['student']: row for row in rows}
+
+    def target_sections(self):
+        """{(class id, section name): section} of every target class, from one query."""
+        targets = [klass.pk for klass in self.class_map.values() if klass]
+        return {
+            (section.class_name_id, section.name): section
+            for section in Section.objects.filter(institution=self.institution, class_name_id__in=targets)
+        }
+
+    def decide(self, students):
+        totals = self.totals(self.students().order_by())
+        sections = self.target_sections()
+
+        for student in students:
+            row = totals.get(student.pk)
+            if row is None or not row['maximum']:
+                percentage, failed = None, 0
+                passed = self.promote_without_results
+                result = 'APPEARING'
+            else:
+                percentage = min(row['obtained'] * 100 / row['maximum'], Decimal('100')).quantize(Decimal('0.01'))
+                failed = row['failed']
+                passed = percentage >= self.min_percentage and failed <= self.max_failed_subjects
+                result = history_result(percentage, failed, self.max_failed_subjects)
+
+            target = self.class_map[student.current_class_id]
+            if not passed:
+                yield Decision(student, RETAINED, result, percentage, failed, student.current_class, student.section)
+            elif target is None:
+                yield Decision(student, GRADUATED, result, percentage, failed)
+            else:
+                section = sections.get((target.pk, student.section.name)) if student.section else None
+                yield Decision(student, PROMOTED, result, percentage, failed, target, section)
+
+    def run(self, dry_run=False):
+        start = time.perf_counter()
+        report = PromotionReport(dry_run=dry_run, class_map=self.class_map)
+        with transaction.atomic():
+            for decision in self.decide(self.students(lock=not dry_run)):
+                report.add(decision)
+            if not dry_run:
+                self.write(report)
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def write(self, report):
+        now = timezone.now()
+        histories = [
+            StudentHistory(
+                student=decision.student,
+                academic_year=self.from_year,
+                class_name=decision.student.current_class,
+                section=decision.student.section,
+                roll_number=decision.student.roll_number or '',
+                percentage=decision.percentage,
+                result=decision.result,
+                promoted=decision.promoted,
+            )
+            # StudentHistory.section is required; students without one get no row
+            for decision in report.decisions if decision.student.section_id
+        ]
+        StudentHistory.objects.bulk_create(
+            histories,
+            batch_size=UPDATE_CHUNK_SIZE,
+            update_conflicts=True,
+            unique_fields=['student', 'academic_year'],
+            update_fields=['class_name', 'section', 'roll_number', 'percentage', 'result', 'promoted', 'updated_at'],
+        )
+        report.histories = len(histories)
+
+        targets = defaultdict(list)
+        changes = []
+        for decision in report.decisions:
+            student = decision.student
+            if decision.outcome == GRADUATED:
+                after = {
+                    'current_class_id': student.current_class_id, 'section_id': student.section_id,
+                    'academic_year_id': student.academic_year_id, 'status': 'ALUMNI',
+                }
+            else:
+                after = {
+                    'current_class_id': decision.to_class.pk,
+                    'section_id': decision.to_section.pk if decision.to_section else None,
+                    'academic_year_id': self.to_year.pk,
+                    'status': student.status,
+                }
+            targets[tuple(after.items())].append(student.pk)
+            changes.append((student, {name: (getattr(student, name), value) for name, value in after.items()}))
+
+        for target, pks in targets.items():
+            for index in range(0, len(pks), UPDATE_CHUNK_SIZE):
+                Student.objects.filter(pk__in=pks[index:index + UPDATE_CHUNK_SIZE]).update(
+                    updated_at=now, **dict(target)
+                )
+                report.updates += 1
+
+        # What the skipped post_save signals would have done
+        audit.record_updated(Student, changes)
+        transaction.on_commit(lambda: bump_namespace(self.institution, STUDENT_FACETS_NAMESPACE))
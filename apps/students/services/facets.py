@@ -0,0 +1,242 @@
+# students/services/facets.py
+"""
+Faceted filtering for the student directory.
+
+The directory narrows students by facets (class, section, status, gender,
+blood group, admission type and the hostel/transport/disability flags) and
+shows next to every facet value how many students it would list with that
+value picked. All counts come from one aggregate over the institution's
+students, narrowed by the plain filters (admission number, name, academic
+year, category, religion): one conditional Count per facet value, filtered on
+that value and on the *other* selected facets, so picking a class still shows
+the counts of its sibling classes. The query grows with the number of facet
+values (the institution's classes and sections, the choices), not with the
+combinations of them present among the students.
+
+The counts are cached per (institution, filter and selection signature) under
+STUDENT_FACETS_NAMESPACE. Saving or deleting a student, class, section,
+hostel, transport or medical record bumps the namespace (see core/signals.py);
+bulk imports bump it themselves.
+"""
+import hashlib
+import json
+import operator
+from functools import reduce
+
+from django.db.models import Count, Q
+
+from apps.academics.models import Class, Section
+from apps.core import cache as tenant_cache
+from apps.core import search as search_index
+from apps.students.models import Student, StudentHostel, StudentMedicalInfo, StudentTransport
+
+STUDENT_FACETS_NAMESPACE = "student-facets"
+STUDENT_FACETS_TIMEOUT = 60 * 15
+
+FILTER_FIELDS = ('admission_number', 'name', 'academic_year', 'category', 'religion')
+YES_NO_CHOICES = (('yes', 'Yes'), ('no', 'No'))
+
+
+class Facet:
+    """
+    One facet of the directory, on the student `column`. `flag` (a queryset
+    of rows with a `student`) turns it into a yes/no facet on whether the
+    student has such a row. Facets without `choices` take their values from
+    `options`, a callable returning (value, label) pairs for an institution.
+    """
+
+    def __init__(self, name, label, column=None, choices=None, options=None, flag=None):
+        self.name = name
+        self.label = label
+        self.column = column
+        self.choices = YES_NO_CHOICES if flag is not None else choices
+        self.options = options
+        self.flag = flag
+
+    def filter(self, value):
+        if self.flag is not None:
+            # Uncorrelated IN: evaluated once per query, not once per student
+            condition = Q(pk__in=self.flag.values('student'))
+            return condition if value == 'yes' else ~condition
+        return Q(**{self.column: value})
+
+    def values(self, institution):
+        if self.choices is not None:
+            return [(str(value), str(label)) for value, label in self.choices]
+        return [(str(value), label) for value, label in self.options(institution)]
+
+
+def _scoped(queryset, institution):
+    return queryset if institution is None else queryset.filter(institution=institution)
+
+
+def class_options(institution):
+    return _scoped(Class.objects.all(), institution).order_by().values_list('pk', 'name')
+
+
+def section_options(institution):
+    sections = _scoped(Section.objects.all(), institution).order_by().values_list('pk', 'class_name__name', 'name')
+    return [(pk, f'{class_name} - {name}') for pk, class_name, name in sections]
+
+
+FACETS = (
+    Facet('student_class', 'Class', 'current_class', options=class_options),
+    Facet('section', 'Section', 'section', options=section_options),
+    Facet('status', 'Status', 'status', choices=Student.STATUS_CHOICES),
+    Facet('gender', 'Gender', 'gender', choices=Student.GENDER_CHOICES),
+    Facet('blood_group', 'Blood Group', 'blood_group', choices=Student.BLOOD_GROUP_CHOICES),
+    Facet('admission_type', 'Admission Type', 'admission_type', choices=Student.ADMISSION_TYPE_CHOICES),
+    Facet('has_hostel', 'Hostel', flag=StudentHostel.objects.all()),
+    Facet('has_transport', 'Transport', flag=StudentTransport.objects.all()),
+    Facet('has_disability', 'Disability', flag=StudentMedicalInfo.objects.filter(disability=True)),
+)
+FACETS_BY_NAME = {facet.name: facet for facet in FACETS}
+
+
+def _param(value):
+    """Form values (model instances included) as the strings they arrive as in GET."""
+    if value in (None, ''):
+        return ''
+    return str(getattr(value, 'pk', value))
+
+
+def split_filters(cleaned_data):
+    """Split StudentFilterForm data into (plain filters, facet selection)."""
+    filters = {
+        'admission_number': cleaned_data.get('admission_number') or '',
+        'name': ' '.join(filter(None, [cleaned_data.get('first_name'), cleaned_data.get('last_name')])),
+        'academic_year': _param(cleaned_data.get('academic_year')),
+        'category': cleaned_data.get('category') or '',
+        'religion': cleaned_data.get('religion') or '',
+    }
+    selected = {facet.name: _param(cleaned_data.get(facet.name)) for facet in FACETS}
+    return (
+        {key: value for key, value in filters.items() if value},
+        {key: value for key, value in selected.items() if value},
+    )
+
+
+def apply_filters(queryset, filters, institution=None):
+    """Narrow `queryset` by the plain (non-facet) filters."""
+    if filters.get('admission_number'):
+        queryset = queryset.filter(admission_number__icontains=filters['admission_number'])
+    if filters.get('name'):
+        queryset = search_index.filter_queryset(queryset, filters['name'], institution)
+    if filters.get('academic_year'):
+        queryset = queryset.filter(academic_year_id=filters['academic_year'])
+    if filters.get('category'):
+        queryset = queryset.filter(category__iexact=filters['category'])
+    if filters.get('religion'):
+        queryset = queryset.filter(religion__iexact=filters['religion'])
+    return queryset
+
+
+def apply_selection(queryset, selected):
+    """Narrow `queryset` by the selected facet values."""
+    for name, value in selected.items():
+        facet = FACETS_BY_NAME.get(name)
+        if facet and value and (facet.flag is None or value in ('yes', 'no')):
+            queryset = queryset.filter(facet.filter(value))
+    return queryset
+
+
+def _count(conditions):
+    return Count('pk', filter=reduce(operator.and_, conditions)) if conditions else Count('pk')
+
+
+def build_counts(institution, filters, selected):
+    """
+    {'total': matching students, 'values': {facet: [(value, label)]},
+    'counts': {facet: {value: count}}} from one aggregate query, each facet
+    counted with every selection but its own.
+    """
+    students = Student.objects.all()
+    if institution is not None:
+        students = students.filter(institution=institution)
+    students = apply_filters(students, filters, institution)
+    conditions = {name: FACETS_BY_NAME[name].filter(value) for name, value in selected.items()}
+
+    values = {facet.name: facet.values(institution) for facet in FACETS}
+    aggregates = {'total': _count(list(conditions.values()))}
+    for facet in FACETS:
+        others = [condition for name, condition in conditions.items() if name != facet.name]
+        for index, (value, label) in enumerate(values[facet.name]):
+            aggregates[f'{facet.name}_{index}'] = _count(others + [facet.filter(value)])
+    row = students.aggregate(**aggregates)
+
+    return {
+        'total': row['total'],
+        'values': values,
+        'counts': {
+            facet.name: {value: row[f'{facet.name}_{index}'] for index, (value, label) in enumerate(values[facet.name])}
+            for facet in FACETS
+        },
+    }
+
+
+def get_counts(institution, filters, selected):
+    """Cached build_counts() keyed by the institution and the filter/selection signature."""
+    if institution is None:
+        return build_counts(None, filters, selected)
+    signature = hashlib.sha1(json.dumps([filters, selected], sort_keys=True).encode()).hexdigest()
+    return tenant_cache.get_or_set(
+        institution,
+        STUDENT_FACETS_NAMESPACE,
+        ('counts', signature),
+        lambda: build_counts(institution, filters, selected),
+        timeout=STUDENT_FACETS_TIMEOUT,
+    )
+
+
+def student_facets(institution, filters=None, selected=None):
+    """
+    Facet counts for the directory: {'total': matching students, 'facets': [
+    {'name', 'label', 'selected', 'values': [{'value', 'label', 'count',
+    'selected'}]}]}. Each facet is counted with every selection but its own.
+    """
+    selected = {
+        name: value for name, value in (selected or {}).items()
+        if name in FACETS_BY_NAME and value
+        and (FACETS_BY_NAME[name].flag is None or value in ('yes', 'no'))
+    }
+    counts = get_counts(institution, filters or {}, selected)
+
+    facets = []
+    for facet in FACETS:
+        options = [
+            {
+                'value': value,
+                'label': label,
+                'count': counts['counts'][facet.name][value],
+                'selected': selected.get(facet.name) == value,
+            }
+            for value, label in counts['values'][facet.name]
+        ]
+        if facet.choices is None:
+            # Classes and sections without a matching student are left out
+            options = sorted(
+                (option for option in options if option['count'] or option['selected']),
+                key=lambda option: option['label'],
+            )
+        facets.append({
+            'name': facet.name,
+            'label': facet.label,
+            'selected': selected.get(facet.name, ''),
+            'values': options,
+        })
+    return {'total': counts['total'], 'facets': facets}
+
+
+def add_links(facets, query_dict, cursor_kwarg='cursor'):
+    """Give every facet value a `url` that toggles it in the current query string."""
+    for facet in facets['facets']:
+        for option in facet['values']:
+            params = query_dict.copy()
+            params.pop(cursor_kwarg, None)
+            params.pop('page', None)
+            if option['selected']:
+                params.pop(facet['name'], None)
+            else:
+                params[facet['name']] = option['value']
+            option['url'] = f'?{params.urlencode()}'
+    return facets
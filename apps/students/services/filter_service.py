@@ -1,80 +1,55 @@
 # students/services/filter_service.py
-from django.db.models import Q
 from apps.students.models import Student
+from apps.students.services import facets
 
 
 class StudentFilterService:
+    # Export parameters -> facet names (students/services/facets.py)
+    FACET_PARAMS = {
+        "class_id": "student_class",
+        "section_id": "section",
+        "status": "status",
+        "gender": "gender",
+        "blood_group": "blood_group",
+        "admission_type": "admission_type",
+        "has_hostel": "has_hostel",
+        "has_disability": "has_disability",
+        "has_transport": "has_transport",
+    }
+
     @staticmethod
-    def filter_students(request_get_params):
-        """Apply filters to student queryset based on request parameters"""
+    def filter_students(request_get_params, institution=None):
+        """Apply filters to the institution's students based on request parameters"""
         queryset = Student.objects.select_related(
             "current_class", "section", "academic_year"
         ).prefetch_related('medical_info', 'transport', 'hostel').all()
-
-        # Apply filters
-        class_id = request_get_params.get("class_id")
-        if class_id:
-            queryset = queryset.filter(current_class_id=class_id)
-
-        section_id = request_get_params.get("section_id")
-        if section_id:
-            queryset = queryset.filter(section_id=section_id)
-
-        status = request_get_params.get("status")
-        if status:
-            queryset = queryset.filter(status=status)
-
-        gender = request_get_params.get("gender")
-        if gender:
-            queryset = queryset.filter(gender=gender)
-
-        blood_group = request_get_params.get("blood_group")
-        if blood_group:
-            queryset = queryset.filter(blood_group=blood_group)
-
-        admission_type = request_get_params.get("admission_type")
-        if admission_type:
-            queryset = queryset.filter(admission_type=admission_type)
-
-        # Additional filters
-        has_hostel = request_get_params.get("has_hostel")
-        if has_hostel:
-            if has_hostel == "yes":
-                queryset = queryset.filter(hostel__isnull=False)
-            elif has_hostel == "no":
-                queryset = queryset.filter(hostel__isnull=True)
-
-        has_disability = request_get_params.get("has_disability")
-        if has_disability:
-            if has_disability == "yes":
-                queryset = queryset.filter(medical_info__disability=True)
-            elif has_disability == "no":
-                queryset = queryset.filter(medical_info__disability=False)
-
-        caste = request_get_params.get("caste")
-        if caste:
-            queryset = queryset.filter(caste__iexact=caste)
-
-        religion = request_get_params.get("religion")
-        if religion:
-            queryset = queryset.filter(religion__iexact=religion)
-
-        has_transport = request_get_params.get("has_transport")
-        if has_transport:
-            if has_transport == "yes":
-                queryset = queryset.filter(transport__isnull=False)
-            elif has_transport == "no":
-                queryset = queryset.filter(transport__isnull=True)
+        if institution is not None:
+            queryset = queryset.filter(institution=institution)
+
+        selected = {
+            facet: request_get_params.get(param)
+            for param, facet in StudentFilterService.FACET_PARAMS.items()
+            if request_get_params.get(param)
+        }
+        queryset = facets.apply_selection(queryset, selected)
+        queryset = facets.apply_filters(queryset, {
+            # "caste" is the parameter's old name
+            "category": request_get_params.get("category") or request_get_params.get("caste"),
+            "religion": request_get_params.get("religion"),
+        }, institution)
 
         # Order the results
         return queryset.order_by("first_name", "last_name")
 
     @staticmethod
-    def get_filter_info(request_get_params):
+    def get_filter_info(request_get_params, institution=None):
         """Get information about applied filters for display"""
         from apps.academics.models import Class, Section
-        from apps.students.models import Student
-        
+
+        classes, sections = Class.objects.all(), Section.objects.all()
+        if institution is not None:
+            classes, sections = classes.filter(institution=institution), sections.filter(institution=institution)
+
         class_id = request_get_params.get("class_id")
         section_id = request_get_params.get("section_id")
         status = request_get_params.get("status")
@@ -83,13 +58,13 @@ class StudentFilterService:
         admission_type = request_get_params.get("admission_type")
         has_hostel = request_get_params.get("has_hostel")
         has_disability = request_get_params.get("has_disability")
-        caste = request_get_params.get("caste")
+        caste = request_get_params.get("category") or request_get_params.get("caste")
         religion = request_get_params.get("religion")
         has_transport = request_get_params.get("has_transport")
 
         return {
-            "class_filter": Class.objects.filter(id=class_id).first() if class_id else None,
-            "section_filter": Section.objects.filter(id=section_id).first() if section_id else None,
+            "class_filter": classes.filter(id=class_id).first() if class_id else None,
+            "section_filter": sections.filter(id=section_id).first() if section_id else None,
             "status_filter": dict(Student.STATUS_CHOICES).get(status) if status else None,
             "gender_filter": dict(Student.GENDER_CHOICES).get(gender) if gender else None,
             "blood_group_filter": dict(Student.BLOOD_GROUP_CHOICES).get(blood_group) if blood_group else None,
@@ -99,4 +74,4 @@ class StudentFilterService:
             "caste_filter": caste if caste else None,
             "religion_filter": religion if religion else None,
             "transport_filter": "Yes" if has_transport == "yes" else "No" if has_transport == "no" else None,
-        }
\ No newline at end of file
+        }
@@ -41,7 +41,7 @@ class StudentPDFExporter:
         qr_code_img = qr_generate(qr_data, size=2, version=2, border=0)
 
         # Get student photo document (if any)
-        photo_doc = student.documents.filter(doc_type="PHOTO").first()
+        photo_doc = student.get_photo()
         photo_url = photo_doc.file.url if photo_doc and photo_doc.file else None
 
         context = {
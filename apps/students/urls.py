@@ -7,6 +7,8 @@ app_name = 'students'
 urlpatterns = [
     path('', views.StudentListView.as_view(), name='student_list'),
     path('create/', views.StudentCreateView.as_view(), name='student_create'),
+    path('import/', views.StudentImportView.as_view(), name='student_import'),
+    path('promote/', views.StudentPromotionView.as_view(), name='student_promotion'),
     path('<uuid:pk>/', views.StudentDetailView.as_view(), name='student_detail'),
     path('<uuid:pk>/update/', views.StudentUpdateView.as_view(), name='student_update'),
     path('<uuid:pk>/delete/', views.StudentDeleteView.as_view(), name='student_delete'),
@@ -2,11 +2,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse, reverse_lazy
 from django.contrib.auth.mixins import PermissionRequiredMixin
 from django.contrib.auth.decorators import login_required, permission_required
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, TemplateView
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, TemplateView, FormView
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q
-from django.http import JsonResponse
+from django.db.models import Exists, OuterRef
+from django.http import HttpResponse, JsonResponse
 
 from .models import (Student, Guardian, StudentMedicalInfo, StudentAddress,
                      StudentDocument, StudentHistory, StudentTransport, 
@@ -15,13 +15,19 @@ from .forms import (
     StudentForm, GuardianForm, StudentMedicalInfoForm, 
     StudentAddressForm, StudentDocumentForm, StudentFilterForm,
     StudentStatusForm, StudentClassForm, StudentHistoryForm, 
-    StudentTransportForm, StudentHostelForm, StudentIdentificationForm
+    StudentTransportForm, StudentHostelForm, StudentIdentificationForm,
+    StudentBulkUploadForm, StudentPromotionForm
 )
-from apps.academics.models import Section, Class
+from apps.academics.models import AcademicYear, Section, Class
 from apps.organization.models import Institution
 from .idcard import StudentIDCardGenerator  
+from .imports import StudentImporter, read_rows, template_csv
+from .promotion import PromotionEngine
+from utils.assets import local_path
 from apps.core.utils import get_user_institution  
 from apps.core.mixins import DirectorRequiredMixin,TeacherRequiredMixin,StudentManagementRequiredMixin
+from apps.core.pagination import KeysetPaginationMixin
+from .services import facets as student_facets
 import logging
 logger = logging.getLogger(__name__)
 
@@ -42,7 +48,7 @@ def load_sections(request):
 
 
 
-class StudentListView(StudentManagementRequiredMixin, ListView):
+class StudentListView(KeysetPaginationMixin, StudentManagementRequiredMixin, ListView):
     model = Student
     template_name = 'students/student_list.html'
     context_object_name = 'students'
@@ -50,27 +56,28 @@ class StudentListView(StudentManagementRequiredMixin, ListView):
     
     def get_queryset(self):
         queryset = super().get_queryset().select_related(
-            'current_class', 'section', 'academic_year', 'institution'
+            'current_class', 'section', 'academic_year', 'institution',
+            'medical_info', 'identification',
+        ).annotate(
+            # get_completion_status() reads these instead of querying per student
+            has_guardians=Exists(Guardian.objects.filter(student=OuterRef('pk'))),
+            has_addresses=Exists(StudentAddress.objects.filter(student=OuterRef('pk'))),
+            has_documents=Exists(StudentDocument.objects.filter(student=OuterRef('pk'))),
         ).order_by('roll_number')
         
         self.search_form = StudentFilterForm(self.request.GET)
+        institution = get_user_institution(self.request.user)
+        if institution:
+            self.search_form.fields['student_class'].queryset = Class.objects.filter(institution=institution)
+            self.search_form.fields['section'].queryset = Section.objects.filter(
+                institution=institution
+            ).select_related('class_name')
+            self.search_form.fields['academic_year'].queryset = AcademicYear.objects.filter(institution=institution)
+        self.filters, self.selected = {}, {}
         if self.search_form.is_valid():
-            cd = self.search_form.cleaned_data
-
-            if cd.get('admission_number'):
-                queryset = queryset.filter(admission_number__icontains=cd['admission_number'])
-            if cd.get('first_name'):
-                queryset = queryset.filter(first_name__icontains=cd['first_name'])
-            if cd.get('last_name'):
-                queryset = queryset.filter(last_name__icontains=cd['last_name'])
-            if cd.get('student_class'):
-                queryset = queryset.filter(current_class_id=cd['student_class'])
-            if cd.get('section'):
-                queryset = queryset.filter(section_id=cd['section'])
-            if cd.get('academic_year'):
-                queryset = queryset.filter(academic_year_id=cd['academic_year'])
-            if cd.get('status'):
-                queryset = queryset.filter(status=cd['status'])
+            self.filters, self.selected = student_facets.split_filters(self.search_form.cleaned_data)
+            queryset = student_facets.apply_filters(queryset, self.filters, institution)
+            queryset = student_facets.apply_selection(queryset, self.selected)
 
         return queryset
     
@@ -78,29 +85,23 @@ class StudentListView(StudentManagementRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['search_form'] = self.search_form
 
-        # Get user's institution for filtering
+        # Stats and facet counts come from the cached grouped counts
+        # (students/services/facets.py); unfiltered ones are the stats cards.
         user_institution = get_user_institution(self.request.user)
-        
-        # Stats - filter by user's institution if available
-        if user_institution:
-            context['total_students'] = Student.objects.filter(institution=user_institution).count()
-            context['active_students'] = Student.objects.filter(status='ACTIVE', institution=user_institution).count()
-            context['inactive_students'] = Student.objects.exclude(status='ACTIVE').filter(institution=user_institution).count()
-            context['male_students'] = Student.objects.filter(gender='M', institution=user_institution).count()
-            context['female_students'] = Student.objects.filter(gender='F', institution=user_institution).count()
-            context['unspecified_gender'] = Student.objects.filter(
-                Q(gender__isnull=True) | Q(gender=''), institution=user_institution
-            ).count()
-        else:
-            # If no institution found, show all students
-            context['total_students'] = Student.objects.count()
-            context['active_students'] = Student.objects.filter(status='ACTIVE').count()
-            context['inactive_students'] = Student.objects.exclude(status='ACTIVE').count()
-            context['male_students'] = Student.objects.filter(gender='M').count()
-            context['female_students'] = Student.objects.filter(gender='F').count()
-            context['unspecified_gender'] = Student.objects.filter(
-                Q(gender__isnull=True) | Q(gender='')
-            ).count()
+        overall = student_facets.student_facets(user_institution)
+        by_name = {facet['name']: {v['value']: v['count'] for v in facet['values']} for facet in overall['facets']}
+        context['total_students'] = overall['total']
+        context['active_students'] = by_name['status']['ACTIVE']
+        context['inactive_students'] = overall['total'] - by_name['status']['ACTIVE']
+        context['male_students'] = by_name['gender']['M']
+        context['female_students'] = by_name['gender']['F']
+        context['unspecified_gender'] = overall['total'] - sum(by_name['gender'].values())
+
+        context['facets'] = student_facets.add_links(
+            student_facets.student_facets(user_institution, self.filters, self.selected),
+            self.request.GET,
+            self.cursor_kwarg,
+        )
 
         # Check completion status for each student
         for student in context['students']:
@@ -182,9 +183,14 @@ class StudentListView(StudentManagementRequiredMixin, ListView):
         """Calculate completion percentage for student data"""
         total_steps = 5  # Basic info, guardian, medical, address, documents
         completed_steps = 1  # Basic info is always completed
+
+        def has(related):
+            # Annotated by get_queryset(); falls back to a query for other callers
+            flag = getattr(student, f'has_{related}', None)
+            return getattr(student, related).exists() if flag is None else flag
         
         # Check guardian
-        if student.guardians.exists():
+        if has('guardians'):
             completed_steps += 1
             
         # Check medical info
@@ -192,11 +198,11 @@ class StudentListView(StudentManagementRequiredMixin, ListView):
             completed_steps += 1
             
         # Check address
-        if student.addresses.exists():
+        if has('addresses'):
             completed_steps += 1
             
         # Check documents
-        if student.documents.exists():
+        if has('documents'):
             completed_steps += 1
             
         return {
@@ -291,6 +297,12 @@ class StudentDetailView(StudentManagementRequiredMixin, DetailView):
     model = Student
     template_name = 'students/student_detail.html'
     context_object_name = 'student'
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'institution', 'academic_year', 'current_class', 'section',
+            'medical_info', 'transport', 'hostel', 'identification',
+        ).with_profile_bundle()
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -307,9 +319,9 @@ class StudentDetailView(StudentManagementRequiredMixin, DetailView):
         context['identification'] = getattr(student, 'identification', None)
 
         # Specific guardians
-        context['primary_parent'] = student.guardians.filter(is_primary=True).first()
-        context['father'] = student.guardians.filter(relation="FATHER").first()
-        context['mother'] = student.guardians.filter(relation="MOTHER").first()
+        context['primary_parent'] = student.primary_guardian
+        context['father'] = student.father
+        context['mother'] = student.mother
 
         # Emergency contact (from medical info if available)
         medical_info = getattr(student, 'medical_info', None)
@@ -327,6 +339,7 @@ class StudentDetailView(StudentManagementRequiredMixin, DetailView):
         total_steps = 6  # Added identification step
         completed_steps = 1  # Basic info
 
+        # Prefetched by get_queryset: exists() reads the prefetch cache
         if student.guardians.exists():
             completed_steps += 1
         if hasattr(student, 'medical_info'):
@@ -710,6 +723,103 @@ class StudentDeleteView(DirectorRequiredMixin,PermissionRequiredMixin, DeleteVie
         messages.success(request, _('Student deleted successfully!'))
         return response
     
+
+
+class StudentImportView(StudentManagementRequiredMixin, PermissionRequiredMixin, FormView):
+    """Bulk admission from a CSV/XLSX file, with a dry-run report first."""
+    form_class = StudentBulkUploadForm
+    template_name = 'students/student_import.html'
+    permission_required = "students.add_student"
+    max_errors = 200
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('template'):
+            response = HttpResponse(template_csv(), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="student_import_template.csv"'
+            return response
+        return super().get(request, *args, **kwargs)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['institution'] = get_user_institution(self.request.user)
+        return kwargs
+
+    def form_valid(self, form):
+        institution = get_user_institution(self.request.user)
+        if institution is None:
+            messages.error(self.request, _('No institution is linked to your account.'))
+            return self.form_invalid(form)
+
+        importer = StudentImporter(institution, form.cleaned_data['academic_year'])
+        try:
+            report = importer.run(
+                read_rows(form.cleaned_data['file']),
+                dry_run=form.cleaned_data['dry_run'],
+                skip_invalid=form.cleaned_data['skip_invalid'],
+            )
+        except Exception as e:
+            logger.error(f"Student import failed: {e}")
+            messages.error(self.request, _('The import failed. Please check the file and try again.'))
+            return self.form_invalid(form)
+
+        logger.info(f"Student import by {self.request.user}: {report.summary()}")
+        if report.failure:
+            messages.error(self.request, report.summary())
+        elif report.created:
+            messages.success(self.request, report.summary())
+        elif report.errors:
+            messages.warning(self.request, report.summary())
+        else:
+            messages.info(self.request, report.summary())
+        return self.render_to_response(self.get_context_data(
+            form=form, report=report, errors=report.errors[:self.max_errors],
+        ))
+
+
+class StudentPromotionView(StudentManagementRequiredMixin, PermissionRequiredMixin, FormView):
+    """Year-end promotion of whole classes, previewed before it is applied."""
+    form_class = StudentPromotionForm
+    template_name = 'students/student_promotion.html'
+    permission_required = "students.change_student"
+    max_decisions = 500
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['institution'] = get_user_institution(self.request.user)
+        return kwargs
+
+    def form_valid(self, form):
+        institution = get_user_institution(self.request.user)
+        if institution is None:
+            messages.error(self.request, _('No institution is linked to your account.'))
+            return self.form_invalid(form)
+
+        cd = form.cleaned_data
+        try:
+            engine = PromotionEngine(
+                institution, cd['from_year'], cd['to_year'], form.class_map(),
+                exams=cd['exams'] or None,
+                min_percentage=cd['min_percentage'],
+                max_failed_subjects=cd['max_failed_subjects'],
+                promote_without_results=cd['promote_without_results'],
+            )
+            report = engine.run(dry_run=cd['preview'])
+        except Exception as e:
+            logger.error(f"Student promotion failed: {e}")
+            messages.error(self.request, _('The promotion failed. Nothing was changed.'))
+            return self.form_invalid(form)
+
+        logger.info(f"Student promotion by {self.request.user}: {report.summary()}")
+        if report.dry_run:
+            messages.info(self.request, report.summary())
+        else:
+            messages.success(self.request, report.summary())
+        decisions = [decision for decision in report.decisions if not decision.promoted]
+        decisions += [decision for decision in report.decisions if decision.promoted]
+        return self.render_to_response(self.get_context_data(
+            form=form, report=report, decisions=decisions[:self.max_decisions],
+        ))
+
     
 # -------------------- Transport Views --------------------
 class TransportCreateView(StudentManagementRequiredMixin,CreateView):
@@ -852,7 +962,7 @@ def student_id_card_png(request, pk):
     student = get_object_or_404(Student, pk=pk)
     organization = Institution.objects.filter(is_active=True).first()
 
-    logo = organization.logo.path if organization and organization.logo else None
+    logo = local_path(organization.logo) if organization else None
 
     generator = StudentIDCardGenerator(
         student=student,
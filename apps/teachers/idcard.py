@@ -1,10 +1,16 @@
 import os
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageColor
-import qrcode
+from utils.lazy import lazy_import
 from django.conf import settings
 from django.http import HttpResponse
 from django.utils.encoding import force_str
+from utils.assets import local_path
+
+Image = lazy_import('PIL.Image')
+ImageDraw = lazy_import('PIL.ImageDraw')
+ImageFont = lazy_import('PIL.ImageFont')
+ImageColor = lazy_import('PIL.ImageColor')
+qrcode = lazy_import('qrcode')
 
 # It's good practice to handle potential missing modules gracefully
 try:
@@ -124,8 +130,9 @@ class TeacherIDCardGenerator:
         draw.ellipse((x - 5, y_pos - 5, x + size + 5, y_pos + size + 5), fill=self.colors['primary'])
         draw.ellipse((x - 2, y_pos - 2, x + size + 2, y_pos + size + 2), fill=self.colors['background'])
 
-        if self.teacher.photo and hasattr(self.teacher.photo, 'path') and os.path.exists(self.teacher.photo.path):
-            photo_img = Image.open(self.teacher.photo.path).convert("RGBA").resize((size, size), Image.LANCZOS)
+        photo_path = local_path(self.teacher.photo)
+        if photo_path and os.path.exists(photo_path):
+            photo_img = Image.open(photo_path).convert("RGBA").resize((size, size), Image.LANCZOS)
             mask = Image.new('L', (size, size), 0)
             ImageDraw.Draw(mask).ellipse((0, 0, size, size), fill=255)
             base_img.paste(photo_img, (x, y_pos), mask)
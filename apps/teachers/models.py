@@ -9,16 +9,8 @@ import os
 import csv
 from io import BytesIO
 from django.utils import timezone
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
 import base64
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.lib.utils import ImageReader
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
 from django.conf import settings
-import qrcode
 from io import BytesIO
 import base64
 import random
@@ -15,6 +15,7 @@ from .models import Teacher
 from .forms import TeacherForm
 from apps.organization.models import Institution
 from utils.utils import export_pdf_response, render_to_pdf, qr_generate
+from utils.assets import local_path
 import csv
 from io import StringIO
 
@@ -26,8 +27,8 @@ def teacher_id_card_png(request, pk):
     teacher = get_object_or_404(Teacher, pk=pk)
     organization = Institution.objects.filter(is_active=True).first()
 
-    logo = organization.logo.path if organization and organization.logo else None
-    stamp = organization.stamp.path if organization and organization.stamp else None
+    logo = local_path(organization.logo) if organization else None
+    stamp = local_path(organization.stamp) if organization else None
 
     generator = TeacherIDCardGenerator(
         teacher=teacher,
@@ -1,7 +1,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
@@ -16,6 +16,8 @@ from .forms import DriverForm, DriverFilterForm
 from apps.core.utils import get_user_institution
 from utils.utils import render_to_pdf, export_pdf_response
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # ----------------- DRIVER CRUD -----------------
 
 class DriverListView( StaffManagementRequiredMixin, ListView):
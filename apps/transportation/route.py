@@ -2,7 +2,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.db.models import Count, Q, Sum
@@ -18,6 +18,8 @@ from apps.core.utils import get_user_institution
 from .models import Route
 from .forms import RouteForm, RouteFilterForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class RouteListView( StaffManagementRequiredMixin, ListView):
     model = Route
     template_name = 'transport/route/route_list.html'
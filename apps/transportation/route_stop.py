@@ -2,7 +2,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse,JsonResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -18,6 +18,8 @@ from apps.core.utils import get_user_institution
 from .models import RouteStop,Route
 from .forms import RouteStopForm, RouteStopFilterForm
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 class RouteStopListView( StaffManagementRequiredMixin, ListView):
     model = RouteStop
     template_name = 'transport/route_stop/route_stop_list.html'
@@ -4,7 +4,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -24,6 +24,8 @@ from apps.core.utils import get_user_institution
 
 
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 # List View
 
 class StudentTransportListView( StaffManagementRequiredMixin, ListView):
@@ -3,7 +3,7 @@
 import csv
 from io import StringIO, BytesIO
 from datetime import datetime
-import xlsxwriter
+from utils.lazy import lazy_import
 from django.http import HttpResponse
 from django.utils import timezone
 from django.db.models import Count, Q
@@ -22,6 +22,8 @@ from .models import TransportAssignment
 from .forms import TransportAssignmentForm,TransportAssignmentFilterForm
 from apps.core.utils import get_user_institution
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class TransportAssignmentListView( StaffManagementRequiredMixin, ListView):
     model = TransportAssignment
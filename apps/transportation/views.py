@@ -1,5 +1,5 @@
 import csv
-import xlsxwriter
+from utils.lazy import lazy_import
 from io import BytesIO, StringIO
 from django.contrib import messages
 from datetime import datetime, timedelta
@@ -24,6 +24,8 @@ from django.db.models import Sum
 from .models import Vehicle, Route, StudentTransport, TransportAttendance, MaintenanceRecord
 from datetime import date
 
+xlsxwriter = lazy_import('xlsxwriter')
+
 
 class TransportDashboardView(StaffManagementRequiredMixin,TemplateView):
     template_name = "transport/dashboard.html"
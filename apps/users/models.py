@@ -11,6 +11,13 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
 
+from apps.users.permissions import (
+    filter_permitted,
+    role_accessible_apps,
+    role_has_permission,
+    role_permitted_actions,
+)
+
 
 class CustomUserManager(BaseUserManager):
     use_in_migrations = True
@@ -170,110 +177,42 @@ class User(AbstractUser):
         # Superadmins have all permissions
         if self.is_superadmin:
             return True
-            
-        # Get user's institution for object-level permissions
-        user_institution = None
-        if hasattr(self, 'profile') and self.profile.institution:
-            user_institution = self.profile.institution
-
-        # Define role permission matrix
-        PERMISSION_MATRIX = {
-            self.Role.SUPERADMIN: {
-                'academics': ['view', 'add', 'change', 'delete', 'export'],
-                'students': ['view', 'add', 'change', 'delete', 'export'],
-                'teachers': ['view', 'add', 'change', 'delete', 'export'],
-                'attendance': ['view', 'add', 'change', 'delete', 'export'],
-                'hr': ['view', 'add', 'change', 'delete', 'export'],
-                'finance': ['view', 'add', 'change', 'delete', 'export'],
-                'library': ['view', 'add', 'change', 'delete', 'export'],
-                'transport': ['view', 'add', 'change', 'delete', 'export'],
-            },
-            self.Role.INSTITUTION_ADMIN: {
-                'academics': ['view', 'add', 'change', 'delete', 'export'],
-                'students': ['view', 'add', 'change', 'delete', 'export'],
-                'teachers': ['view', 'add', 'change', 'delete', 'export'],
-                'attendance': ['view', 'add', 'change', 'delete', 'export'],
-                'hr': ['view', 'add', 'change', 'delete', 'export'],
-                'finance': ['view', 'add', 'change', 'delete', 'export'],
-                'library': ['view', 'add', 'change', 'delete', 'export'],
-                'transport': ['view', 'add', 'change', 'delete', 'export'],
-            },
-            self.Role.PRINCIPAL: {
-                'academics': ['view', 'add', 'change', 'export'],
-                'students': ['view', 'add', 'change', 'export'],
-                'teachers': ['view', 'add', 'change', 'export'],
-                'attendance': ['view', 'add', 'change', 'export'],
-                'hr': ['view', 'export'],
-                'finance': ['view', 'export'],
-                'library': ['view', 'export'],
-                'transport': ['view', 'export'],
-            },
-            self.Role.TEACHER: {
-                'academics': ['view'],
-                'students': ['view'],
-                'attendance': ['view', 'add', 'change'],
-                'library': ['view'],
-            },
-            self.Role.ACCOUNTANT: {
-                'finance': ['view', 'add', 'change', 'export'],
-                'students': ['view'],
-                'attendance': ['view'],
-            },
-            self.Role.HR: {
-                'hr': ['view', 'add', 'change', 'export'],
-                'attendance': ['view', 'add', 'change', 'export'],
-                'students': ['view'],
-                'teachers': ['view', 'add', 'change', 'export'],
-            },
-            self.Role.STUDENT: {
-                'academics': ['view'],
-                'attendance': ['view'],  # Can view own attendance
-                'library': ['view'],
-            },
-            self.Role.PARENT: {
-                'students': ['view'],  # Can view own children
-                'attendance': ['view'],  # Can view children's attendance
-                'academics': ['view'],  # Can view academic info
-            },
-            self.Role.LIBRARIAN: {
-                'library': ['view', 'add', 'change', 'export'],
-                'students': ['view'],
-            },
-            self.Role.TRANSPORT_MANAGER: {
-                'transport': ['view', 'add', 'change', 'export'],
-                'students': ['view'],
-            },
-            self.Role.SUPPORT_STAFF: {
-                # Limited access based on specific assignments
-            }
-        }
 
-        # Check basic permission from matrix
-        role_perms = PERMISSION_MATRIX.get(self.role, {})
-        app_perms = role_perms.get(app_label, [])
-        
-        if action not in app_perms:
+        # Check basic permission from the compiled matrix
+        if not role_has_permission(self.role, app_label, action):
             return False
-            
+
+        if obj is None:
+            return True
+
         # Object-level permission checks
-        if obj and user_institution:
-            # Check if object belongs to user's institution
-            if hasattr(obj, 'institution') and obj.institution != user_institution:
-                return False
-                
-            # Special object-level checks
-            if app_label == 'students' and self.role == self.Role.TEACHER:
-                # Teachers can only view students in their classes
-                from academics.models import Class  # Import here to avoid circular imports
-                if hasattr(obj, 'student_classes'):
-                    return obj.student_classes.filter(teacher__user=self).exists()
-                    
-            elif app_label == 'students' and self.role == self.Role.PARENT:
-                # Parents can only view their own children
+        from apps.core.utils import get_user_institution
+        user_institution = get_user_institution(self)
+        if user_institution is None:
+            return True
+
+        # Check if object belongs to user's institution (by id, no extra query)
+        institution_id = getattr(obj, 'institution_id', None)
+        if institution_id is not None and institution_id != user_institution.pk:
+            return False
+
+        # Special object-level checks
+        if app_label == 'students' and self.role == self.Role.TEACHER:
+            # Teachers can only view students in their classes
+            if hasattr(obj, 'student_classes'):
+                return obj.student_classes.filter(teacher__user=self).exists()
+
+        elif app_label == 'students' and self.role == self.Role.PARENT:
+            # Parents can only view their own children
+            if hasattr(obj, 'parents'):
                 return obj.parents.filter(user=self).exists()
-                
+
         return True
 
+    def filter_permitted(self, queryset, app_label, action='view'):
+        """Batched has_permission: restrict a queryset to permitted objects."""
+        return filter_permitted(self, queryset, app_label, action)
+
     def can_view(self, app_label, obj=None):
         """Check if user can view objects in app"""
         return self.has_permission(app_label, 'view', obj)
@@ -329,33 +268,11 @@ class User(AbstractUser):
 
     def get_accessible_apps(self):
         """Get list of apps user can access"""
-        PERMISSION_MATRIX = {
-            self.Role.SUPERADMIN: ['academics', 'students', 'teachers', 'attendance', 'hr', 'finance', 'library', 'transport'],
-            self.Role.INSTITUTION_ADMIN: ['academics', 'students', 'teachers', 'attendance', 'hr', 'finance', 'library', 'transport'],
-            self.Role.PRINCIPAL: ['academics', 'students', 'teachers', 'attendance', 'hr', 'finance', 'library', 'transport'],
-            self.Role.TEACHER: ['academics', 'students', 'attendance', 'library'],
-            self.Role.ACCOUNTANT: ['finance', 'students', 'attendance'],
-            self.Role.HR: ['hr', 'attendance', 'students', 'teachers'],
-            self.Role.STUDENT: ['academics', 'attendance', 'library'],
-            self.Role.PARENT: ['students', 'attendance', 'academics'],
-            self.Role.LIBRARIAN: ['library', 'students'],
-            self.Role.TRANSPORT_MANAGER: ['transport', 'students'],
-            self.Role.SUPPORT_STAFF: [],
-        }
-        return PERMISSION_MATRIX.get(self.role, [])
+        return role_accessible_apps(self.role)
 
     def get_permitted_actions(self, app_label):
         """Get list of actions user can perform in an app"""
-        PERMISSION_MATRIX = {
-            self.Role.SUPERADMIN: {
-                'academics': ['view', 'add', 'change', 'delete', 'export'],
-                'students': ['view', 'add', 'change', 'delete', 'export'],
-                # ... other apps
-            },
-            # ... other roles
-        }
-        role_perms = PERMISSION_MATRIX.get(self.role, {})
-        return role_perms.get(app_label, [])
+        return role_permitted_actions(self.role, app_label)
 
     def send_welcome_email(self, password):
         """Send welcome email with login credentials"""
@@ -0,0 +1,152 @@
+# users/permissions.py
+"""
+Single source of truth for role -> app -> action permissions.
+
+PERMISSION_MATRIX is the human-readable table. At import time it is compiled
+into ROLE_PERMISSIONS, a frozenset of (app_label, action) pairs per role, so a
+permission check is one set lookup instead of rebuilding nested dicts.
+Roles are plain strings (User.Role values) to keep this module free of model
+imports.
+"""
+ACTIONS = ('view', 'add', 'change', 'delete', 'export')
+
+FULL_ACCESS = list(ACTIONS)
+
+PERMISSION_MATRIX = {
+    'superadmin': {
+        'academics': FULL_ACCESS,
+        'students': FULL_ACCESS,
+        'teachers': FULL_ACCESS,
+        'attendance': FULL_ACCESS,
+        'hr': FULL_ACCESS,
+        'finance': FULL_ACCESS,
+        'library': FULL_ACCESS,
+        'transport': FULL_ACCESS,
+    },
+    'institution_admin': {
+        'academics': FULL_ACCESS,
+        'students': FULL_ACCESS,
+        'teachers': FULL_ACCESS,
+        'attendance': FULL_ACCESS,
+        'hr': FULL_ACCESS,
+        'finance': FULL_ACCESS,
+        'library': FULL_ACCESS,
+        'transport': FULL_ACCESS,
+    },
+    'principal': {
+        'academics': ['view', 'add', 'change', 'export'],
+        'students': ['view', 'add', 'change', 'export'],
+        'teachers': ['view', 'add', 'change', 'export'],
+        'attendance': ['view', 'add', 'change', 'export'],
+        'hr': ['view', 'export'],
+        'finance': ['view', 'export'],
+        'library': ['view', 'export'],
+        'transport': ['view', 'export'],
+    },
+    'teacher': {
+        'academics': ['view'],
+        'students': ['view'],
+        'attendance': ['view', 'add', 'change'],
+        'library': ['view'],
+    },
+    'accountant': {
+        'finance': ['view', 'add', 'change', 'export'],
+        'students': ['view'],
+        'attendance': ['view'],
+    },
+    'hr': {
+        'hr': ['view', 'add', 'change', 'export'],
+        'attendance': ['view', 'add', 'change', 'export'],
+        'students': ['view'],
+        'teachers': ['view', 'add', 'change', 'export'],
+    },
+    'student': {
+        'academics': ['view'],
+        'attendance': ['view'],  # Can view own attendance
+        'library': ['view'],
+    },
+    'parent': {
+        'students': ['view'],  # Can view own children
+        'attendance': ['view'],  # Can view children's attendance
+        'academics': ['view'],  # Can view academic info
+    },
+    'librarian': {
+        'library': ['view', 'add', 'change', 'export'],
+        'students': ['view'],
+    },
+    'transport_manager': {
+        'transport': ['view', 'add', 'change', 'export'],
+        'students': ['view'],
+    },
+    'support_staff': {
+        # Limited access based on specific assignments
+    },
+}
+
+NO_PERMISSIONS = frozenset()
+
+
+def _compile(matrix):
+    return {
+        role: frozenset(
+            (app_label, action)
+            for app_label, actions in apps.items()
+            for action in actions
+        )
+        for role, apps in matrix.items()
+    }
+
+
+ROLE_PERMISSIONS = _compile(PERMISSION_MATRIX)
+
+ROLE_APPS = {
+    role: tuple(app_label for app_label, actions in apps.items() if actions)
+    for role, apps in PERMISSION_MATRIX.items()
+}
+
+
+def role_has_permission(role, app_label, action):
+    """O(1) check against the compiled table."""
+    return (app_label, action) in ROLE_PERMISSIONS.get(role, NO_PERMISSIONS)
+
+
+def role_accessible_apps(role):
+    return list(ROLE_APPS.get(role, ()))
+
+
+def role_permitted_actions(role, app_label):
+    permissions = ROLE_PERMISSIONS.get(role, NO_PERMISSIONS)
+    return [action for action in ACTIONS if (app_label, action) in permissions]
+
+
+def _model_has_field(model, name):
+    try:
+        model._meta.get_field(name)
+        return True
+    except Exception:
+        return False
+
+
+def filter_permitted(user, queryset, app_label, action='view'):
+    """
+    Batched object-level check: narrow `queryset` to the rows `user` may
+    perform `action` on, as one filtered query instead of a per-object loop.
+    """
+    if user.is_superuser or user.role == 'superadmin':
+        return queryset
+    if not role_has_permission(user.role, app_label, action):
+        return queryset.none()
+
+    from apps.core.utils import get_user_institution
+
+    model = queryset.model
+    institution = get_user_institution(user)
+    if institution is not None and _model_has_field(model, 'institution'):
+        queryset = queryset.filter(institution_id=institution.pk)
+
+    if app_label == 'students' and user.role == 'teacher' and _model_has_field(model, 'student_classes'):
+        queryset = queryset.filter(student_classes__teacher__user=user).distinct()
+    elif app_label == 'students' and user.role == 'parent' and _model_has_field(model, 'parents'):
+        queryset = queryset.filter(parents__user=user).distinct()
+
+    return queryset
@@ -0,0 +1,18 @@
+# config/celery.py
+"""Celery application. Start a worker with: celery -A config worker -l info"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
+
+
+@app.on_after_configure.connect
+def setup_metrics(sender, **kwargs):
+    # Task durations for /metrics (core.metrics); needs Django settings loaded
+    from apps.core.metrics import instrument_celery
+    instrument_celery()
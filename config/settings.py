@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from decouple import config, Csv
 import dj_database_url
@@ -67,8 +68,10 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.core.middleware.QueryProfilingMiddleware',  # no-op unless PROFILING_ENABLED
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,10 +80,11 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'apps.core.middleware.InstitutionMiddleware',
+    'apps.core.middleware.AuditLogMiddleware',
     
     # Custom middleware (commented out as they might not exist yet)
-    # 'apps.core.middleware.TenantMiddleware',
-    # 'apps.core.middleware.AuditLogMiddleware',
+    # 'apps.core.middleware.TenantMiddleware',  # place before InstitutionMiddleware
     # 'apps.teachers.middleware.InstitutionMiddleware',
 ]
 
@@ -127,6 +131,47 @@ else:
         }
     }
 
+# Cache configuration
+# CACHE_URL examples:
+#   redis://localhost:6379/1   (production, same Redis server Celery uses)
+#   file:///var/tmp/eduerp_cache
+#   locmem://                  (default, per-process, fine for dev/tests)
+CACHE_URL = config('CACHE_URL', default='locmem://')
+CACHE_DEFAULT_TIMEOUT = config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int)
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'eduerp',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+elif CACHE_URL.startswith('file://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_URL[len('file://'):],
+            'KEY_PREFIX': 'eduerp',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'eduerp-default',
+            'KEY_PREFIX': 'eduerp',
+            'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+
+# SQL profiling (QueryProfilingMiddleware, report at /profiling/)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_MAX_SAMPLES = config('PROFILING_MAX_SAMPLES', default=500, cast=int)
+PROFILING_DUPLICATE_THRESHOLD = config('PROFILING_DUPLICATE_THRESHOLD', default=3, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -217,6 +262,43 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Run tasks inline (no broker needed) under `manage.py test`, or when forced
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=TESTING, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = CELERY_TASK_ALWAYS_EAGER
+
+# Prometheus metrics (core.metrics) at /metrics, for superadmins or a scraper
+# sending "Authorization: Bearer <METRICS_TOKEN>". With several gunicorn
+# workers set METRICS_DIR to a directory they share (emptied on restart).
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5.0, cast=float)
+
+# Audit trail (core.audit): model changes are buffered per process and written
+# in batches of AUDIT_BATCH_SIZE, at least every AUDIT_FLUSH_INTERVAL seconds,
+# by a background thread ('thread') or the write_audit_events Celery task
+# ('celery'); 'sync' writes each change on commit
+AUDIT_LOG_BACKEND = config('AUDIT_LOG_BACKEND', default='sync' if TESTING else 'thread')
+AUDIT_BATCH_SIZE = config('AUDIT_BATCH_SIZE', default=200, cast=int)
+AUDIT_FLUSH_INTERVAL = config('AUDIT_FLUSH_INTERVAL', default=2.0, cast=float)
+# Reverse proxies in front of the app that append to X-Forwarded-For. The
+# audited IP is the address the outermost trusted proxy saw; with 0 the header
+# is ignored (any client can set it) and REMOTE_ADDR is recorded
+AUDIT_TRUSTED_PROXIES = config('AUDIT_TRUSTED_PROXIES', default=0, cast=int)
+
+# Background exports: CSV/Excel exports above this many rows are queued as a
+# Celery task and written to MEDIA_ROOT instead of streamed in the request
+EXPORT_ASYNC_THRESHOLD = config('EXPORT_ASYNC_THRESHOLD', default=5000, cast=int)
+
+# PDF rendering (utils.pdf): xhtml2pdf runs in a pool of PDF_RENDER_WORKERS
+# processes (0 = inline); remote images are cached on disk in ASSET_CACHE_DIR
+# (content-addressed, LRU-evicted past ASSET_CACHE_MAX_MB, see utils.assets)
+PDF_RENDER_WORKERS = config('PDF_RENDER_WORKERS', default=0 if TESTING else 2, cast=int)
+PDF_RENDER_TIMEOUT = config('PDF_RENDER_TIMEOUT', default=60, cast=int)
+PDF_ASSET_FETCH_THREADS = config('PDF_ASSET_FETCH_THREADS', default=4, cast=int)
+ASSET_CACHE_DIR = config('ASSET_CACHE_DIR', default=str(BASE_DIR / 'cache' / 'assets'))
+ASSET_CACHE_MAX_BYTES = config('ASSET_CACHE_MAX_MB', default=512, cast=int) * 1024 * 1024
+ASSET_CACHE_TTL = config('ASSET_CACHE_TTL', default=86400, cast=int)  # seconds before revalidation
 
 # Email configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
@@ -245,7 +327,12 @@ CORS_ALLOW_CREDENTIALS = True
 
 # Security settings
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
+# Sliding expiry: the cookie is refreshed on every response, but core.sessions
+# only writes django_session when the data changed or the stored expiry is more
+# than SESSION_REFRESH_INTERVAL seconds behind; reads come from the cache
+SESSION_ENGINE = 'apps.core.sessions'
 SESSION_SAVE_EVERY_REQUEST = True
+SESSION_REFRESH_INTERVAL = config('SESSION_REFRESH_INTERVAL', default=15 * 60, cast=int)
 
 # Security settings for production
 # if not DEBUG:
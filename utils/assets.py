@@ -0,0 +1,261 @@
+"""
+Content-addressed on-disk cache for remote assets (logos, stamps, photos).
+
+PDF rendering, ID cards and download_temp_image() all resolve remote URLs
+through fetch(), so each file is downloaded once per node instead of once per
+page. Layout under ASSET_CACHE_DIR:
+
+    objects/ab/<sha256 of content><ext>   file bodies; identical content from
+                                          different URLs is stored once
+    index/<sha256 of URL>.json            url, object, ETag, Last-Modified,
+                                          fetched_at
+
+Entries older than ASSET_CACHE_TTL are revalidated with a conditional GET
+(If-None-Match / If-Modified-Since); a 304 or a network error keeps serving
+the cached copy. Object mtimes are bumped on every hit and, once the cache
+grows past ASSET_CACHE_MAX_BYTES, the least recently used objects are evicted
+(also available as `manage.py prune_asset_cache`).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_TIMEOUT = 10
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTL = 24 * 60 * 60
+
+_evict_lock = threading.Lock()
+
+
+def cache_dir():
+    path = Path(getattr(settings, 'ASSET_CACHE_DIR', Path(tempfile.gettempdir()) / 'eduerp-assets'))
+    (path / 'objects').mkdir(parents=True, exist_ok=True)
+    (path / 'index').mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _index_path(url):
+    return cache_dir() / 'index' / f'{_sha256(url.encode("utf-8"))}.json'
+
+
+def _read_entry(url):
+    try:
+        with open(_index_path(url), encoding='utf-8') as handle:
+            entry = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not (cache_dir() / entry.get('object', '')).is_file():
+        return None
+    return entry
+
+
+def _atomic_write(path, data):
+    """Write via a temp file + rename so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_entry(url, entry):
+    _atomic_write(_index_path(url), json.dumps(entry).encode('utf-8'))
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _store(url, content, response):
+    suffix = Path(urlparse(url).path).suffix[:10].lower()
+    digest = _sha256(content)
+    relative = f'objects/{digest[:2]}/{digest}{suffix}'
+    path = cache_dir() / relative
+    if path.exists():
+        _touch(path)
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, content)
+
+    entry = {
+        'url': url,
+        'object': relative,
+        'size': len(content),
+        'etag': response.headers.get('ETag', ''),
+        'last_modified': response.headers.get('Last-Modified', ''),
+        'fetched_at': time.time(),
+    }
+    _write_entry(url, entry)
+    evict()
+    return entry
+
+
+def fetch(url):
+    """Return a local path for a remote URL, downloading or revalidating as needed."""
+    entry = _read_entry(url)
+    ttl = getattr(settings, 'ASSET_CACHE_TTL', DEFAULT_TTL)
+    if entry and time.time() - entry['fetched_at'] < ttl:
+        path = cache_dir() / entry['object']
+        _touch(path)
+        return str(path)
+
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    try:
+        response = requests.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+    except requests.RequestException as e:
+        logger.warning(f"Asset download failed for {url}: {e}")
+        response = None
+
+    if response is not None and response.status_code == 200:
+        entry = _store(url, response.content, response)
+    elif entry:
+        # 304 Not Modified (or the origin is unreachable): keep the cached copy
+        if response is not None and response.status_code == 304:
+            entry['fetched_at'] = time.time()
+            _write_entry(url, entry)
+        elif response is not None:
+            logger.warning(f"Asset revalidation failed for {url}: HTTP {response.status_code}")
+    else:
+        if response is not None:
+            logger.warning(f"Asset download failed for {url}: HTTP {response.status_code}")
+        return None
+
+    path = cache_dir() / entry['object']
+    _touch(path)
+    return str(path)
+
+
+def _objects():
+    """(path, size, last_used) for every cached object."""
+    found = []
+    for path in (cache_dir() / 'objects').glob('*/*'):
+        if path.suffix == '.part':
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        found.append((path, stat.st_size, stat.st_mtime))
+    return found
+
+
+def usage():
+    """(object count, total bytes) currently in the cache."""
+    objects = _objects()
+    return len(objects), sum(size for _, size, _ in objects)
+
+
+def evict(max_bytes=None, older_than=None):
+    """
+    Delete least recently used objects until the cache fits in max_bytes
+    (default ASSET_CACHE_MAX_BYTES), plus any unused for `older_than` seconds.
+    Index entries whose object is gone are dropped. Returns (files, bytes) removed.
+    """
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'ASSET_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    with _evict_lock:
+        objects = sorted(_objects(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in objects)
+        cutoff = time.time() - older_than if older_than is not None else None
+        removed_files = removed_bytes = 0
+
+        for path, size, last_used in objects:
+            if total <= max_bytes and (cutoff is None or last_used >= cutoff):
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed_files += 1
+            removed_bytes += size
+
+        if removed_files:
+            root = cache_dir()
+            for index_path in (root / 'index').glob('*.json'):
+                try:
+                    with open(index_path, encoding='utf-8') as handle:
+                        relative = json.load(handle).get('object', '')
+                except (OSError, ValueError):
+                    relative = ''
+                if not relative or not (root / relative).is_file():
+                    try:
+                        index_path.unlink()
+                    except OSError:
+                        pass
+
+    return removed_files, removed_bytes
+
+
+def clear():
+    """Remove every cached object and index entry."""
+    return evict(max_bytes=-1)
+
+
+def resolve_uri(uri):
+    """Local filesystem path for a media, static or remote URI (or None)."""
+    if not uri:
+        return None
+    if uri.startswith(settings.MEDIA_URL):
+        return os.path.join(settings.MEDIA_ROOT, uri[len(settings.MEDIA_URL):])
+    if uri.startswith(settings.STATIC_URL):
+        from django.contrib.staticfiles import finders
+
+        relative = uri[len(settings.STATIC_URL):]
+        found = finders.find(relative)
+        if found:
+            return found
+        path = os.path.join(settings.STATIC_ROOT, relative)
+        return path if os.path.exists(path) else None
+    if uri.startswith(('http://', 'https://')):
+        return fetch(uri)
+    return None
+
+
+def local_path(field_file):
+    """
+    Local path for a FileField/ImageField value on any storage: the file
+    itself for filesystem storage, otherwise the cached copy of its URL.
+    """
+    if not field_file:
+        return None
+    try:
+        return field_file.path
+    except (NotImplementedError, AttributeError, ValueError):
+        pass
+    try:
+        url = field_file.url
+    except Exception:
+        return None
+    return resolve_uri(url)
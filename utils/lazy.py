@@ -0,0 +1,52 @@
+"""
+Deferred imports for heavy optional libraries.
+
+xhtml2pdf, reportlab, xlsxwriter, PIL, qrcode and razorpay take hundreds of
+milliseconds and tens of megabytes to import, but only export, PDF, ID card
+and payment requests use them. Views modules bind them with
+
+    xlsxwriter = lazy_import('xlsxwriter')
+    pisa = lazy_import('xhtml2pdf.pisa')
+
+instead of a module-level import, so a worker only pays for a library on the
+first request that touches it. `manage.py benchmark_startup` reports which of
+them a fresh worker still loads at boot.
+"""
+import importlib
+import threading
+import types
+
+_lock = threading.Lock()
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """`import name`, deferred until the module is first used."""
+    return LazyModule(name)
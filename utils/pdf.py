@@ -0,0 +1,214 @@
+"""
+PDF rendering service used by utils.render_to_pdf.
+
+A render has three phases:
+  1. the Django template is rendered to HTML in the calling process,
+  2. every image/stylesheet URI in the HTML is resolved to a local file through
+     utils.assets (remote logos, stamps and photos are downloaded once per node,
+     several in parallel),
+  3. xhtml2pdf converts the HTML in a bounded process pool, so CPU-heavy report
+     cards and payslips do not hold the GIL of the worker serving pages.
+
+Set PDF_RENDER_WORKERS = 0 to convert inline (development, tests). Timings of
+every phase are logged and aggregated per template in `stats`.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from apps.core import metrics
+from utils import assets
+
+logger = logging.getLogger(__name__)
+
+_URI_RE = re.compile(
+    r"""(?:\bsrc|\bhref)\s*=\s*["']([^"']+)["']|url\(\s*["']?([^"')]+?)["']?\s*\)""",
+    re.IGNORECASE,
+)
+
+
+def collect_uris(html):
+    """URIs referenced by src=, href= and CSS url() in the HTML."""
+    uris = set()
+    for match in _URI_RE.finditer(html):
+        uri = (match.group(1) or match.group(2) or '').strip()
+        if uri and not uri.startswith(('data:', '#', 'mailto:', 'javascript:')):
+            uris.add(uri)
+    return uris
+
+
+def prefetch_assets(html):
+    """Resolve every URI in the HTML to a local path: {uri: path}."""
+    uris = collect_uris(html)
+    if not uris:
+        return {}
+    threads = getattr(settings, 'PDF_ASSET_FETCH_THREADS', 4)
+    with ThreadPoolExecutor(max_workers=max(1, min(threads, len(uris)))) as executor:
+        paths = executor.map(assets.resolve_uri, uris)
+        resources = {}
+        for uri, path in zip(uris, paths):
+            if path:
+                resources[uri] = path
+            elif uri.startswith(('http://', 'https://')):
+                # Already failed here; don't let xhtml2pdf retry it in the pool
+                resources[uri] = os.devnull
+        return resources
+
+
+def convert(html, resources):
+    """
+    Convert HTML to PDF bytes with xhtml2pdf. Runs in the pool workers, so it
+    must not touch Django settings or the database.
+    Returns (pdf bytes or None, seconds).
+    """
+    from xhtml2pdf import pisa
+
+    start = time.perf_counter()
+    result = io.BytesIO()
+    pdf = pisa.pisaDocument(
+        io.BytesIO(html.encode('UTF-8')),
+        result,
+        link_callback=lambda uri, rel: resources.get(uri),
+    )
+    content = None if pdf.err else result.getvalue()
+    return content, time.perf_counter() - start
+
+
+# ---- process pool -----------------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _workers():
+    return getattr(settings, 'PDF_RENDER_WORKERS', 2)
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the web worker may be multi-threaded
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers(),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _convert_in_pool(html, resources):
+    timeout = getattr(settings, 'PDF_RENDER_TIMEOUT', 60)
+    try:
+        return get_pool().submit(convert, html, resources).result(timeout=timeout)
+    except BrokenProcessPool:
+        logger.exception("PDF render pool broke, restarting it and rendering inline")
+        shutdown_pool()
+        return convert(html, resources)
+
+
+# ---- timings ----------------------------------------------------------------
+
+class RenderStats:
+    """Process-local per-template render timings."""
+
+    PHASES = ('template', 'assets', 'convert', 'total')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.templates = {}
+
+    def record(self, template, timings, size, ok):
+        with self._lock:
+            entry = self.templates.setdefault(template, {
+                'renders': 0,
+                'errors': 0,
+                'bytes': 0,
+                **{f'{phase}_s': 0.0 for phase in self.PHASES},
+                'max_total_s': 0.0,
+            })
+            entry['renders'] += 1
+            entry['errors'] += 0 if ok else 1
+            entry['bytes'] += size
+            for phase in self.PHASES:
+                entry[f'{phase}_s'] += timings[phase]
+            entry['max_total_s'] = max(entry['max_total_s'], timings['total'])
+
+    def report(self):
+        with self._lock:
+            items = list(self.templates.items())
+        rows = []
+        for template, entry in items:
+            n = entry['renders'] or 1
+            row = {
+                'template': template,
+                'renders': entry['renders'],
+                'errors': entry['errors'],
+                'avg_kb': round(entry['bytes'] / n / 1024, 1),
+                'max_total_ms': round(entry['max_total_s'] * 1000, 1),
+            }
+            for phase in self.PHASES:
+                row[f'avg_{phase}_ms'] = round(entry[f'{phase}_s'] / n * 1000, 1)
+            rows.append(row)
+        rows.sort(key=lambda row: row['avg_total_ms'], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self.templates.clear()
+
+
+stats = RenderStats()
+
+
+# ---- entry point ------------------------------------------------------------
+
+def render_pdf(template_src, context=None):
+    """Render a Django template to PDF bytes, or None when xhtml2pdf fails."""
+    start = time.perf_counter()
+    html = render_to_string(template_src, context or {})
+    template_done = time.perf_counter()
+
+    resources = prefetch_assets(html)
+    assets_done = time.perf_counter()
+
+    try:
+        if _workers() > 0:
+            content, convert_time = _convert_in_pool(html, resources)
+        else:
+            content, convert_time = convert(html, resources)
+    except FutureTimeoutError:
+        logger.error(f"PDF render of {template_src} timed out")
+        content, convert_time = None, time.perf_counter() - assets_done
+
+    timings = {
+        'template': template_done - start,
+        'assets': assets_done - template_done,
+        'convert': convert_time,
+        'total': time.perf_counter() - start,
+    }
+    stats.record(template_src, timings, len(content or b''), content is not None)
+    metrics.PDF_RENDER.observe(timings['total'], template=template_src, status='ok' if content is not None else 'error')
+    logger.info(
+        f"PDF {template_src}: template {timings['template'] * 1000:.0f}ms, "
+        f"assets {timings['assets'] * 1000:.0f}ms ({len(resources)}), "
+        f"convert {timings['convert'] * 1000:.0f}ms, total {timings['total'] * 1000:.0f}ms"
+    )
+    return content
@@ -1,31 +1,24 @@
 
 
 import io
-import os
 import re
-import qrcode
-import requests 
+from utils.lazy import lazy_import
 import tempfile
 import base64
 from pathlib import Path
 from django.http import HttpResponse
 from django.template.loader import render_to_string
-from xhtml2pdf import pisa
 from django.utils import timezone
-from django.conf import settings
 from email.mime.image import MIMEImage
 from django.core.mail import EmailMultiAlternatives
 from django.utils.html import strip_tags
+from utils import assets, pdf
+
+qrcode = lazy_import('qrcode')
     
 def download_temp_image(image_url):
-    response = requests.get(image_url, stream=True)
-    if response.status_code == 200:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        for chunk in response.iter_content(1024):
-            temp_file.write(chunk)
-        temp_file.close()
-        return temp_file.name
-    return None
+    """Local path of a remote image from the shared asset cache (do not delete it)."""
+    return assets.fetch(image_url)
 
 
 def qr_generate(data, size=2, version=2, border=0):
@@ -47,37 +40,14 @@ def qr_generate(data, size=2, version=2, border=0):
 def fetch_resources(uri, rel):
     """
     Fetch resources for xhtml2pdf.
-    Supports both local and remote media files.
+    Supports both local and remote media files (remote ones via the asset cache).
     """
-    if uri.startswith(settings.MEDIA_URL):  # Local media
-        path = os.path.join(settings.MEDIA_ROOT, uri.replace(settings.MEDIA_URL, ""))
-        return path
-    elif uri.startswith("http"):  # Remote media (e.g., Cloudinary)
-        response = requests.get(uri, stream=True)
-        if response.status_code == 200:
-            temp_file = tempfile.NamedTemporaryFile(delete=False)
-            for chunk in response.iter_content(1024):
-                temp_file.write(chunk)
-            temp_file.close()
-            return temp_file.name
-    return None
+    return assets.resolve_uri(uri)
 
 
 def render_to_pdf(template_src, context_dict={}):
-    """Utility function to render HTML to PDF using xhtml2pdf"""
-    html = render_to_string(template_src, context_dict)
-    result = io.BytesIO()
-
-    # Important: pass fetch_resources so images load properly
-    pdf = pisa.pisaDocument(
-        io.BytesIO(html.encode("UTF-8")),
-        result,
-        link_callback=fetch_resources 
-    )
-
-    if not pdf.err:
-        return result.getvalue()   # return bytes, not HttpResponse
-    return None
+    """Utility function to render HTML to PDF using xhtml2pdf (see utils.pdf)"""
+    return pdf.render_pdf(template_src, context_dict)   # bytes, not HttpResponse
 
 
 def export_pdf_response(pdf_content, filename):